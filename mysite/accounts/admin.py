@@ -15,15 +15,47 @@ class UserProfileInline(admin.StackedInline):
 class UserAdmin(BaseUserAdmin):
     inlines = (UserProfileInline,)
 
+    def get_inlines(self, request, obj):
+        # Профиль нового пользователя создаёт сигнал (accounts.models)
+        return self.inlines if obj else ()
+
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ["user", "subject", "status", "created_at"]
-    list_filter = ["status", "created_at"]
+    # Колонки активности - поля тикета (TicketResponse.save), поэтому
+    # сортировка и фильтры не требуют подзапросов к ответам
+    list_display = [
+        "user",
+        "subject",
+        "status",
+        "responses_count",
+        "last_response_at",
+        "has_unread_admin_reply",
+        "updated_at",
+        "created_at",
+    ]
+    list_filter = ["status", "has_unread_admin_reply", "last_response_at", "created_at"]
     list_editable = ["status"]
-    readonly_fields = ["created_at", "updated_at"]
+    list_select_related = ["user"]
+    readonly_fields = [
+        "created_at",
+        "updated_at",
+        "responses_count",
+        "last_response_at",
+        "has_unread_admin_reply",
+    ]
     fieldsets = (
         ("Информация о тикете", {"fields": ("user", "subject", "message", "status")}),
+        (
+            "Активность",
+            {
+                "fields": (
+                    "responses_count",
+                    "last_response_at",
+                    "has_unread_admin_reply",
+                )
+            },
+        ),
         ("Даты", {"fields": ("created_at", "updated_at")}),
     )
 
@@ -0,0 +1,24 @@
+# accounts/backends.py
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    """``ModelBackend``, загружающий пользователя вместе с профилем.
+
+    ``AuthenticationMiddleware`` получает ``request.user`` через
+    ``get_user()``. Профиль выбирается тем же запросом (``select_related``)
+    и запоминается в объекте пользователя, поэтому ``user.userprofile`` в
+    представлениях и шаблонах не обращается к базе.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related("userprofile").get(
+                pk=user_id
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_alter_userprofile_avatar"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["user", "-created_at"], name="ticket_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:16
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from main.utils import make_excerpt
+
+
+def fill_ticket_activity(apps, schema_editor):
+    """Заполняет анонсы и поля ответов существующих тикетов."""
+    Ticket = apps.get_model("accounts", "Ticket")
+    TicketResponse = apps.get_model("accounts", "TicketResponse")
+
+    batch = []
+    for ticket in Ticket.objects.only("pk", "message").iterator(chunk_size=500):
+        ticket.excerpt = make_excerpt(ticket.message, 30)
+        batch.append(ticket)
+        if len(batch) == 500:
+            Ticket.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    Ticket.objects.bulk_update(batch, ["excerpt"])
+
+    responses = TicketResponse.objects.filter(ticket=OuterRef("pk")).order_by()
+    latest = responses.order_by("-created_at", "-id")
+    Ticket.objects.update(
+        responses_count=Coalesce(
+            Subquery(responses.values("ticket").annotate(n=Count("pk")).values("n")),
+            0,
+        ),
+        last_response_at=Subquery(latest.values("created_at")[:1]),
+        has_unread_admin_reply=Coalesce(
+            Subquery(latest.values("is_admin_response")[:1]), False
+        ),
+    )
+    # Ответ считается активностью по тикету
+    Ticket.objects.filter(last_response_at__gt=F("updated_at")).update(
+        updated_at=F("last_response_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_ticket_ticket_user_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="ticket",
+            name="ticket_user_created_idx",
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False, verbose_name="Анонс"),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="has_unread_admin_reply",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                verbose_name="Непрочитанный ответ администрации",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_response_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Последний ответ"
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="responses_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Ответов"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["user", "-updated_at"], name="ticket_user_activity_idx"
+            ),
+        ),
+        migrations.RunPython(fill_ticket_activity, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,28 @@
 # accounts/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 
+from main.utils import make_excerpt
+from reviews.models import Review
+
+from .stats import invalidate_user_stats
+
 
 class UserProfile(models.Model):
     user = models.OneToOneField(
@@ -32,17 +49,54 @@ class UserProfile(models.Model):
 
 
 @receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    if created:
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """Создаёт профиль новому пользователю.
+
+    Последующие сохранения пользователя (в том числе обновление
+    ``last_login`` при каждом входе) профиль не затрагивают: он сохраняется
+    формами профиля, только если его поля изменились.
+    """
+    if created and not raw:
         UserProfile.objects.create(user=instance)
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, "userprofile"):
-        instance.userprofile.save()
-    else:
-        UserProfile.objects.create(user=instance)
+class TicketQuerySet(models.QuerySet):
+    def refresh_response_stats(self, reset_unread=False):
+        """Пересчитывает счётчик ответов, время и непрочитанность по ответам.
+
+        Нужен после удаления ответов и записи ответов через ``bulk_create``:
+        обычно поля обновляет ``TicketResponse.save()``.
+
+        Args:
+            reset_unread (bool): Считать непрочитанным тикет, последний ответ
+                которого от администрации (после ``bulk_create``). По
+                умолчанию отметка сохраняется и снимается, только если ответов
+                администрации не осталось: удаление ответа не делает
+                прочитанный тикет непрочитанным.
+        """
+        responses = TicketResponse.objects.filter(ticket=OuterRef("pk")).order_by()
+        latest = responses.order_by("-created_at", "-id")
+        if reset_unread:
+            unread = Coalesce(Subquery(latest.values("is_admin_response")[:1]), False)
+        else:
+            unread = Case(
+                When(
+                    Q(has_unread_admin_reply=True)
+                    & Exists(responses.filter(is_admin_response=True)),
+                    then=Value(True),
+                ),
+                default=Value(False),
+            )
+        return self.update(
+            responses_count=Coalesce(
+                Subquery(
+                    responses.values("ticket").annotate(n=Count("pk")).values("n")
+                ),
+                0,
+            ),
+            last_response_at=Subquery(latest.values("created_at")[:1]),
+            has_unread_admin_reply=unread,
+        )
 
 
 class Ticket(models.Model):
@@ -60,17 +114,48 @@ class Ticket(models.Model):
     status = models.CharField(
         _("Статус"), max_length=20, choices=STATUS_CHOICES, default="open"
     )
+    excerpt = models.TextField(
+        _("Анонс"), blank=True, editable=False
+    )  # Начало сообщения без разметки для списка тикетов
     created_at = models.DateTimeField(_("Создано"), auto_now_add=True)
+    # Время последней активности: изменение тикета или новый ответ
     updated_at = models.DateTimeField(_("Обновлено"), auto_now=True)
 
+    # Обновляются при создании ответа (TicketResponse.save)
+    responses_count = models.PositiveIntegerField(
+        _("Ответов"), default=0, editable=False
+    )
+    last_response_at = models.DateTimeField(
+        _("Последний ответ"), null=True, blank=True, editable=False
+    )
+    has_unread_admin_reply = models.BooleanField(
+        _("Непрочитанный ответ администрации"), default=False, editable=False
+    )
+
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Тикет")
         verbose_name_plural = _("Тикеты")
         ordering = ["-created_at"]
+        indexes = [
+            # Тикеты пользователя по последней активности: ticket_list
+            models.Index(
+                fields=["user", "-updated_at"], name="ticket_user_activity_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Тикет #{self.id} - {self.subject}"
 
+    def save(self, *args, **kwargs):
+        self.update_excerpt()
+        super().save(*args, **kwargs)
+
+    def update_excerpt(self):
+        """Обновление анонса из сообщения (30 слов без HTML)"""
+        self.excerpt = make_excerpt(self.message, 30)
+
     def get_absolute_url(self):
         return reverse("accounts:ticket_detail", kwargs={"pk": self.pk})
 
@@ -96,3 +181,55 @@ class TicketResponse(models.Model):
 
     def __str__(self):
         return f"Ответ на тикет #{self.ticket.id}"
+
+    def save(self, *args, **kwargs):
+        """Сохраняет ответ и в той же транзакции обновляет поля тикета.
+
+        Счётчик увеличивается выражением ``F()``, поэтому одновременные ответы
+        не теряются.
+        """
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if not adding:
+                return
+            changes = {
+                "last_response_at": self.created_at,
+                "updated_at": self.created_at,
+                # Ответ пользователя означает, что ответы администрации прочитаны
+                "has_unread_admin_reply": self.is_admin_response,
+            }
+            Ticket.objects.filter(pk=self.ticket_id).update(
+                responses_count=F("responses_count") + 1, **changes
+            )
+        # Тикет в памяти (в представлении) не должен затереть новые значения
+        if TicketResponse.ticket.is_cached(self):
+            for name, value in changes.items():
+                setattr(self.ticket, name, value)
+            self.ticket.responses_count += 1
+
+
+@receiver([post_save, post_delete], sender=Ticket)
+def invalidate_ticket_stats(sender, instance, **kwargs):
+    invalidate_user_stats(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=TicketResponse)
+def invalidate_response_stats(sender, instance, origin=None, **kwargs):
+    # Ответы удаляемого тикета: кеш сбрасывает обработчик тикета
+    if getattr(origin, "model", type(origin)) is Ticket:
+        return
+    invalidate_user_stats(instance.ticket.user_id)
+
+
+@receiver(post_delete, sender=TicketResponse)
+def refresh_ticket_response_stats(sender, instance, origin=None, **kwargs):
+    if getattr(origin, "model", type(origin)) is not Ticket:
+        Ticket.objects.filter(pk=instance.ticket_id).refresh_response_stats()
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review_stats(sender, instance, **kwargs):
+    invalidate_user_stats(
+        *User.objects.filter(email__iexact=instance.email).values_list("pk", flat=True)
+    )
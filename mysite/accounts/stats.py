@@ -0,0 +1,90 @@
+# accounts/stats.py
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Func, IntegerField, Subquery, Value
+
+STATS_KEY_PREFIX = "accounts:stats:"
+
+
+def _count(queryset):
+    """Подзапрос ``SELECT COUNT(*)`` для подстановки в другой запрос."""
+    return Subquery(
+        queryset.order_by()
+        .annotate(n=Func(F("pk"), function="COUNT", output_field=IntegerField()))
+        .values("n")
+    )
+
+
+def _stats_key(user_id):
+    return "%s%d" % (STATS_KEY_PREFIX, user_id)
+
+
+def get_user_stats(user):
+    """Статистика пользователя для страницы профиля.
+
+    Все счётчики считаются одним запросом к базе (подзапросы ``COUNT``) и
+    кешируются для пользователя на ``PROFILE_STATS_TIMEOUT`` секунд.
+    Сохранение и удаление тикетов, ответов и отзывов сбрасывает кеш
+    (``accounts.models``); смена email пользователя учитывается по истечении
+    срока.
+
+    Args:
+        user (User): Пользователь.
+
+    Returns:
+        dict: ``tickets`` - всего тикетов, ``tickets_by_status`` - тикеты по
+        статусам, ``responses`` и ``admin_responses`` - ответы на тикеты
+        пользователя (всего и от администрации), ``reviews`` - отзывы,
+        оставленные с email пользователя.
+    """
+    from reviews.models import Review
+
+    from .models import Ticket, TicketResponse
+
+    key = _stats_key(user.pk)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+
+    counts = {
+        status: _count(Ticket.objects.filter(user=user, status=status))
+        for status, _ in Ticket.STATUS_CHOICES
+    }
+    responses = TicketResponse.objects.filter(ticket__user=user)
+    # У отзывов нет автора: отзыв относится к пользователю по email
+    reviews = (
+        _count(Review.objects.filter(email__iexact=user.email))
+        if user.email
+        else Value(0)
+    )
+    row = (
+        User.objects.filter(pk=user.pk)
+        .values(
+            responses=_count(responses),
+            admin_responses=_count(responses.filter(is_admin_response=True)),
+            reviews=reviews,
+            **{"tickets_%s" % status: count for status, count in counts.items()},
+        )
+        .get()
+    )
+
+    by_status = {status: row["tickets_%s" % status] for status in counts}
+    stats = {
+        "tickets": sum(by_status.values()),
+        "tickets_by_status": by_status,
+        "responses": row["responses"],
+        "admin_responses": row["admin_responses"],
+        "reviews": row["reviews"],
+    }
+    cache.set(key, stats, getattr(settings, "PROFILE_STATS_TIMEOUT", 60))
+    return stats
+
+
+def invalidate_user_stats(*user_ids):
+    """Сбрасывает кеш статистики пользователей после фиксации транзакции."""
+    keys = [_stats_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
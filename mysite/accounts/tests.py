@@ -1,3 +1,201 @@
-from django.test import TestCase
+# accounts/tests.py
 
-# Create your tests here.
+from unittest import mock, skipUnless
+
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import reverse
+
+from main.testing import SiteTestCase
+from reviews.models import Review
+
+from .models import Ticket, TicketResponse, UserProfile
+from .stats import get_user_stats
+
+
+@skipUnless(connection.vendor == "sqlite", "Планы запросов проверяются для SQLite")
+class TicketQueryPlanTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("client", password="password")
+        other = User.objects.create_user("other", password="password")
+        Ticket.objects.bulk_create(
+            Ticket(
+                user=cls.user if i % 2 else other,
+                subject=f"Ticket {i}",
+                message="Message",
+            )
+            for i in range(30)
+        )
+
+    def test_ticket_list(self):
+        self.client.force_login(self.user)
+        with self.capture_sql() as queries:
+            response = self.client.get(reverse("accounts:ticket_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNoFullScanSort(queries)
+
+
+class ProfileStatsTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            "client", email="client@example.com", password="password"
+        )
+        staff = User.objects.create_user("staff", password="password")
+        cls.ticket = Ticket.objects.create(
+            user=cls.user, subject="Ticket", message="Message"
+        )
+        Ticket.objects.create(
+            user=cls.user, subject="Closed", message="Message", status="closed"
+        )
+        TicketResponse.objects.create(
+            ticket=cls.ticket, user=staff, message="Reply", is_admin_response=True
+        )
+        Review.objects.create(
+            full_name="Client",
+            phone="+79000000000",
+            email="Client@Example.com",
+            message="Review",
+        )
+
+    def test_stats_in_one_cached_query(self):
+        with self.assertNumQueries(1):
+            stats = get_user_stats(self.user)
+        self.assertEqual(stats["tickets"], 2)
+        self.assertEqual(
+            stats["tickets_by_status"], {"open": 1, "in_progress": 0, "closed": 1}
+        )
+        self.assertEqual((stats["responses"], stats["admin_responses"]), (1, 1))
+        self.assertEqual(stats["reviews"], 1)
+        with self.assertNumQueries(0):
+            get_user_stats(self.user)
+
+    def test_cache_reset_on_changes(self):
+        get_user_stats(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            TicketResponse.objects.create(
+                ticket=self.ticket, user=self.user, message="Thanks"
+            )
+        self.assertEqual(get_user_stats(self.user)["responses"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket.delete()
+        stats = get_user_stats(self.user)
+        self.assertEqual((stats["tickets"], stats["responses"]), (1, 0))
+
+    def test_profile_page(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("accounts:profile"))
+        self.assertContains(response, '<div class="stat-number">2</div>')
+
+
+class UserProfileTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("client", password="password")
+        UserProfile.objects.filter(user=cls.user).update(phone="+79001234567")
+
+    def test_profile_created_once(self):
+        self.user.save()
+        self.assertEqual(UserProfile.objects.filter(user=self.user).count(), 1)
+
+    def test_login_does_not_touch_profile(self):
+        # Пользователь, сессия (проверка ключа, запись, обновление) и last_login
+        with self.assertNumQueries(9), self.capture_sql() as queries:
+            response = self.client.post(
+                reverse("accounts:login"),
+                {"username": "client", "password": "password"},
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(any("accounts_userprofile" in sql for sql, _ in queries))
+
+    def test_failed_login_hashes_password_once(self):
+        # Пароль хешируется при проверке и для неизвестного пользователя
+        # (защита от перебора имён по времени ответа)
+        hasher = type(get_hasher())
+        for username in ("client", "unknown"):
+            with self.subTest(username), mock.patch.object(
+                hasher, "encode", autospec=True, side_effect=hasher.encode
+            ) as encode:
+                response = self.client.post(
+                    reverse("accounts:login"),
+                    {"username": username, "password": "wrong"},
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(encode.call_count, 1)
+
+    def test_profile_loaded_with_user(self):
+        self.client.force_login(self.user)
+        with self.capture_sql() as queries:
+            response = self.client.get(reverse("accounts:profile"))
+        self.assertContains(response, "+79001234567")
+        profile_queries = [sql for sql, _ in queries if "accounts_userprofile" in sql]
+        self.assertEqual(len(profile_queries), 1)
+        self.assertIn('FROM "auth_user"', profile_queries[0])
+
+
+class TicketActivityTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("client", password="password")
+        cls.staff = User.objects.create_user("staff", is_staff=True)
+        cls.tickets = [
+            Ticket.objects.create(user=cls.user, subject=f"Ticket {i}", message="Text")
+            for i in range(12)
+        ]
+
+    def test_response_updates_ticket(self):
+        ticket = self.tickets[0]
+        older = TicketResponse.objects.create(
+            ticket=ticket, user=self.staff, message="First", is_admin_response=True
+        )
+        response = TicketResponse.objects.create(
+            ticket=ticket, user=self.staff, message="Reply", is_admin_response=True
+        )
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.responses_count, 2)
+        self.assertEqual(ticket.last_response_at, response.created_at)
+        self.assertEqual(ticket.updated_at, response.created_at)
+        self.assertTrue(ticket.has_unread_admin_reply)
+
+        self.client.force_login(self.user)
+        self.client.get(reverse("accounts:ticket_detail", args=[ticket.pk]))
+        ticket.refresh_from_db()
+        self.assertFalse(ticket.has_unread_admin_reply)
+
+        # Удаление старого ответа не делает прочитанный тикет непрочитанным
+        older.delete()
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.responses_count, 1)
+        self.assertFalse(ticket.has_unread_admin_reply)
+
+        response.delete()
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.responses_count, ticket.last_response_at), (0, None))
+
+    def test_user_reply_keeps_counters(self):
+        ticket = self.tickets[0]
+        self.client.force_login(self.user)
+        url = reverse("accounts:ticket_detail", args=[ticket.pk])
+        self.client.post(url, {"message": "First"})
+        self.client.post(url, {"message": "Second"})
+
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.status, ticket.responses_count), ("in_progress", 2))
+
+    def test_list_sorted_by_activity(self):
+        oldest = self.tickets[0]
+        TicketResponse.objects.create(ticket=oldest, user=self.user, message="Up")
+        self.client.force_login(self.user)
+
+        first = self.client.get(reverse("accounts:ticket_list")).context["tickets"]
+        self.assertEqual(len(first), 10)
+        self.assertEqual(first[0], oldest)
+        second = self.client.get(
+            reverse("accounts:ticket_list") + "?after=" + first.next_cursor
+        ).context["tickets"]
+        self.assertEqual(len(second), 2)
+        self.assertFalse(second.has_next)
+        self.assertNotIn(oldest, list(second))
@@ -8,7 +8,10 @@ from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_protect
 from django.conf import settings
 
+from main.pagination import KeysetPaginator
+
 from .models import Ticket, TicketResponse, UserProfile
+from .stats import get_user_stats
 from .forms import (
     UserRegisterForm,
     UserUpdateForm,
@@ -44,38 +47,7 @@ def profile(request):
     """
     Отображение профиля пользователя со статистикой
     """
-    # Получаем статистику пользователя
-    tickets_count = Ticket.objects.filter(user=request.user).count()
-
-    # Пытаемся импортировать модели из других приложений
-    reviews_count = 0
-    comments_count = 0
-
-    try:
-        from reviews.models import Review
-
-        reviews_count = Review.objects.filter(author=request.user).count()
-    except ImportError:
-        pass
-    except Exception as e:
-        # Логируем ошибку, если нужно
-        print(f"Error loading reviews: {e}")
-
-    try:
-        from comments.models import Comment
-
-        comments_count = Comment.objects.filter(author=request.user).count()
-    except ImportError:
-        pass
-    except Exception as e:
-        # Логируем ошибку, если нужно
-        print(f"Error loading comments: {e}")
-
-    context = {
-        "tickets_count": tickets_count,
-        "reviews_count": reviews_count,
-        "comments_count": comments_count,
-    }
+    context = {"stats": get_user_stats(request.user)}
     return render(request, "accounts/profile.html", context)
 
 
@@ -103,16 +75,23 @@ def profile_update(request):
     """
     Расширенное редактирование профиля пользователя
     """
-    # Получаем или создаем профиль пользователя
-    user_profile, created = UserProfile.objects.get_or_create(user=request.user)
+    # Профиль загружен вместе с пользователем (accounts.backends); его нет у
+    # пользователей, созданных без сигналов (bulk_create, loaddata)
+    try:
+        user_profile = request.user.userprofile
+    except UserProfile.DoesNotExist:
+        user_profile = UserProfile.objects.create(user=request.user)
 
     if request.method == "POST":
         u_form = UserUpdateForm(request.POST, instance=request.user)
         p_form = ProfileUpdateForm(request.POST, request.FILES, instance=user_profile)
 
         if u_form.is_valid() and p_form.is_valid():
-            u_form.save()
-            p_form.save()
+            # Сохраняются только изменённые формы
+            if u_form.has_changed():
+                u_form.save()
+            if p_form.has_changed():
+                p_form.save()
             messages.success(request, "Профиль успешно обновлен!")
             return redirect("accounts:profile")
         else:
@@ -153,7 +132,16 @@ def ticket_list(request):
     """
     Список тикетов пользователя
     """
-    tickets = Ticket.objects.filter(user=request.user).order_by("-created_at")
+    # Сначала тикеты с последней активностью; текст сообщения не нужен:
+    # список показывает анонс
+    paginator = KeysetPaginator(
+        Ticket.objects.filter(user=request.user).defer("message"),
+        10,
+        ordering=("-updated_at", "-id"),
+    )
+    tickets = paginator.get_page(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
     return render(request, "accounts/ticket_list.html", {"tickets": tickets})
 
 
@@ -173,15 +161,19 @@ def ticket_detail(request, pk):
             response.is_admin_response = request.user.is_staff
             response.save()
 
-            # Обновляем статус тикета если отвечает пользователь
+            # Обновляем статус тикета если отвечает пользователь. Поля ответов
+            # уже обновлены при сохранении ответа
             if not request.user.is_staff:
                 ticket.status = "in_progress"
-                ticket.save()
+                ticket.save(update_fields=["status", "updated_at"])
 
             messages.success(request, "Сообщение отправлено!")
             return redirect("accounts:ticket_detail", pk=pk)
     else:
         form = TicketResponseForm()
+        # Пользователь открыл тикет: ответы администрации прочитаны
+        if ticket.has_unread_admin_reply:
+            Ticket.objects.filter(pk=ticket.pk).update(has_unread_admin_reply=False)
 
     responses = ticket.responses.all().order_by("created_at")
 
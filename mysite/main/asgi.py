@@ -0,0 +1,63 @@
+# main/asgi.py
+
+import copy
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.shortcuts import render
+
+
+class SiteASGIHandler(ASGIHandler):
+    """ASGI-обработчик сайта с асинхронными представлениями.
+
+    Под ASGI запросы разбираются по ``ASGI_ROOT_URLCONF``: те же адреса и
+    имена маршрутов, что в ``ROOT_URLCONF``, но публичные страницы
+    обслуживают асинхронные представления (``<app>/async_views.py``).
+    Синхронные представления остаются для WSGI/Passenger.
+    """
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        urlconf = getattr(settings, "ASGI_ROOT_URLCONF", None)
+        if request is not None and urlconf:
+            request.urlconf = urlconf
+        return request, error_response
+
+
+def with_async_views(urlpatterns, views_module):
+    """Копия маршрутов приложения с асинхронными представлениями.
+
+    Представление маршрута заменяется одноимённой функцией из
+    ``views_module``, если она там есть; остальные маршруты не меняются.
+
+    Args:
+        urlpatterns (list): Маршруты приложения (``urls.urlpatterns``).
+        views_module: Модуль с асинхронными представлениями.
+
+    Returns:
+        list: Новый список маршрутов.
+    """
+    patterns = []
+    for pattern in urlpatterns:
+        view = getattr(views_module, getattr(pattern.callback, "__name__", ""), None)
+        if view is not None:
+            pattern = copy.copy(pattern)
+            pattern.callback = view
+        patterns.append(pattern)
+    return patterns
+
+
+async def arender(request, template_name, context=None):
+    """``render()`` для асинхронных представлений.
+
+    Контекстные процессоры и шаблонные теги обращаются к базе и кешу
+    синхронно, поэтому шаблон рендерится в потоке синхронного кода: один
+    переход между потоками на страницу.
+    """
+    return await sync_to_async(render)(request, template_name, context)
+
+
+async def alist(queryset):
+    """Выполняет запрос асинхронно и возвращает список объектов."""
+    return [obj async for obj in queryset]
@@ -0,0 +1,39 @@
+# main/async_views.py
+"""Асинхронные варианты представлений main.views для ASGI."""
+
+import asyncio
+
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.cache import cache_control
+
+from .asgi import arender
+from .caching import aget_page_versions
+from .conditional import ConditionalPage
+from .models import Page, SiteSettings
+
+
+@cache_control(public=True, max_age=60 * 5)
+async def index(request):
+    settings = await SiteSettings.aload()
+    if settings and settings.site_closed:
+        return await arender(request, "main/site_closed.html", {"settings": settings})
+
+    return await arender(request, "main/index.html")
+
+
+@cache_control(public=True, max_age=60 * 10)
+async def page_detail(request, slug):
+    settings, versions = await asyncio.gather(
+        SiteSettings.aload(), aget_page_versions(request.resolver_match.namespace)
+    )
+    if settings and settings.site_closed:
+        return await arender(request, "main/site_closed.html", {"settings": settings})
+
+    page = await aget_object_or_404(Page, slug=slug, show_on_site=True)
+
+    conditional = ConditionalPage(request, page.updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+    return conditional.finish(
+        await arender(request, "main/page_detail.html", {"page": page})
+    )
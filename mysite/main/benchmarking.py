@@ -0,0 +1,198 @@
+# main/benchmarking.py
+
+import asyncio
+import io
+import math
+import sys
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+
+from .counters import flush_view_counters
+
+# Кеш в памяти процесса: замер не должен трогать файловый кеш сайта
+BENCHMARK_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+def production_profile():
+    """Профиль из настроек проекта (SQLITE_PRAGMAS, CONN_MAX_AGE).
+
+    Замеры идут на временных копиях базы, поэтому режим WAL включается
+    в профиль и без переменной окружения DJANGO_SQLITE_WAL.
+    """
+    database = settings.DATABASES["default"]
+    return {
+        "pragmas": {
+            **getattr(settings, "SQLITE_PRAGMAS", {}),
+            **getattr(settings, "SQLITE_WAL_PRAGMAS", {}),
+        },
+        "transaction_mode": database.get("OPTIONS", {}).get("transaction_mode"),
+        "conn_max_age": database.get("CONN_MAX_AGE", 0),
+    }
+
+
+@contextmanager
+def temporary_database(path, pragmas=None, transaction_mode=None, conn_max_age=0):
+    """Временно переключает соединение default на отдельный файл SQLite.
+
+    Соединения создаются отдельно в каждом потоке из общего словаря
+    настроек, поэтому изменение действует и в потоках, запущенных внутри
+    блока. Соединение текущего потока с основной базой не закрывается, а
+    заменяется на время блока (база в памяти у тестов при закрытии
+    пропала бы). Схема базы создаётся миграциями.
+
+    Args:
+        path: Путь к файлу базы (может не существовать).
+        pragmas (dict): PRAGMA, применяемые к каждому соединению.
+        transaction_mode (str): Режим транзакций SQLite или None.
+        conn_max_age (int): Время жизни соединения (CONN_MAX_AGE).
+    """
+    database = connections.settings["default"]
+    saved = {key: database.get(key) for key in ("NAME", "OPTIONS", "CONN_MAX_AGE")}
+    original = connections["default"]
+    options = {
+        "init_command": ";".join(
+            f"PRAGMA {name} = {value}" for name, value in (pragmas or {}).items()
+        )
+    }
+    if transaction_mode:
+        options["transaction_mode"] = transaction_mode
+    database.update(NAME=str(path), OPTIONS=options, CONN_MAX_AGE=conn_max_age)
+    connections["default"] = connections.create_connection("default")
+    try:
+        call_command("migrate", verbosity=0)
+        yield
+    finally:
+        # Просмотры, накопленные на временной базе, не должны попасть в основную
+        flush_view_counters()
+        connections["default"].close()
+        connections["default"] = original
+        database.update(saved)
+
+
+def benchmark_database(path):
+    """База для замера: отдельный файл SQLite или база из настроек.
+
+    Args:
+        path: Путь к файлу базы с настройками из ``production_profile()``
+            или None, чтобы использовать базу проекта.
+    """
+    if path is None:
+        return nullcontext()
+    return temporary_database(path, **production_profile())
+
+
+def sample_urls():
+    """Публичные страницы всех разделов по первым записям базы."""
+    from news.models import News, NewsCategory
+    from portfolio.models import Portfolio, PortfolioCategory
+
+    from .models import Page
+
+    urls = ["/", "/news/", "/portfolio/", "/reviews/", "/news/feed/rss/"]
+    for queryset in (
+        Page.objects.filter(show_on_site=True),
+        NewsCategory.objects.filter(is_active=True),
+        News.objects.active(),
+        PortfolioCategory.objects.filter(is_active=True),
+        Portfolio.objects.filter(is_active=True),
+    ):
+        obj = queryset.exclude(slug="").order_by("pk").first()
+        if obj is not None:
+            urls.append(obj.get_absolute_url())
+    return urls
+
+
+def percentile(values, percent):
+    """Возвращает перцентиль (метод ближайшего ранга) списка значений."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def wsgi_get(application, url, host="testserver"):
+    """Выполняет GET-запрос к WSGI-приложению в текущем потоке.
+
+    Returns:
+        tuple: Код ответа и тело ответа (bytes).
+    """
+    path, _, query = url.partition("?")
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": host,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": host,
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split()[0]))
+
+    result = application(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return statuses[0], body
+
+
+async def asgi_get(application, url, host="testserver"):
+    """Выполняет GET-запрос к ASGI-приложению.
+
+    Returns:
+        tuple: Код ответа и тело ответа (bytes).
+    """
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", host.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (host, 80),
+    }
+    messages = []
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Клиент не отключается: Django отменит ожидание после ответа
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    body = b"".join(
+        m.get("body", b"") for m in messages if m["type"] == "http.response.body"
+    )
+    return status, body
@@ -0,0 +1,154 @@
+# main/caching.py
+
+import datetime
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY_PREFIX = "main:version:"
+
+
+def _new_version():
+    """Новый штамп версии: время смены в секундах и случайная часть."""
+    return "%d-%s" % (time.time(), uuid.uuid4().hex[:16])
+
+
+def version_timestamp(version):
+    """Возвращает время смены версии или None для штампов без времени.
+
+    Args:
+        version (str): Штамп версии из ``get_version()``.
+
+    Returns:
+        datetime | None: Момент смены версии (UTC).
+    """
+    seconds, sep, _ = version.partition("-")
+    if not sep or not seconds.isdigit():
+        return None
+    return datetime.datetime.fromtimestamp(int(seconds), datetime.timezone.utc)
+
+
+def get_version(name):
+    """Возвращает текущую версию (штамп) именованного набора данных.
+
+    Версия хранится в общем кеше Django, поэтому все рабочие процессы видят
+    одно и то же значение. Если ключа нет (холодный кеш или вытеснение),
+    создаётся новая версия. Штамп начинается со времени смены версии (см.
+    ``version_timestamp()``).
+
+    Args:
+        name (str): Имя набора данных, например ``"site_settings"``.
+
+    Returns:
+        str: Текущая версия.
+    """
+    key = VERSION_KEY_PREFIX + name
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(*names):
+    """Вариант ``get_version()`` для нескольких наборов сразу.
+
+    Версии читаются одним обращением к кешу (``get_many``).
+
+    Args:
+        *names (str): Имена наборов данных.
+
+    Returns:
+        list: Версии в порядке имён.
+    """
+    keys = [VERSION_KEY_PREFIX + name for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*names):
+    """Асинхронный вариант ``get_versions()``.
+
+    Версии читаются одним обращением к кешу (``aget_many``).
+
+    Args:
+        *names (str): Имена наборов данных.
+
+    Returns:
+        list: Версии в порядке имён.
+    """
+    keys = [VERSION_KEY_PREFIX + name for name in names]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, _new_version(), None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(*names):
+    """Сменяет версию наборов данных, делая все связанные копии устаревшими.
+
+    Args:
+        *names (str): Имена наборов данных.
+    """
+    cache.set_many({VERSION_KEY_PREFIX + name: _new_version() for name in names}, None)
+
+
+def bump_version_on_commit(*names):
+    """Сменяет версию наборов данных после фиксации текущей транзакции.
+
+    Используется в обработчиках сигналов моделей: если сменить версию внутри
+    транзакции, другой процесс может успеть закешировать ещё не сохранённые
+    данные под новой версией.
+
+    Args:
+        *names (str): Имена наборов данных.
+    """
+    transaction.on_commit(lambda: bump_version(*names))
+
+
+# Версии данных, от которых зависят страницы каждого пространства имён URL.
+# Шапка, подвал и меню есть на всех страницах, поэтому "site_settings" и "menu"
+# добавляются всегда.
+PAGE_DEPENDENCIES = {
+    "main": ("pages",),
+    "news": ("news",),
+    "portfolio": ("portfolio",),
+    "reviews": ("reviews",),
+    "search": ("news", "portfolio", "pages"),
+}
+PAGE_COMMON_DEPENDENCIES = ("site_settings", "menu")
+# Страницы, которые учитывают просмотры: из кеша страниц они не отдаются,
+# иначе просмотр не будет засчитан (main.counters)
+PAGE_CACHE_EXCLUDED_VIEWS = ("news:detail", "portfolio:detail")
+
+
+def get_page_versions(namespace):
+    """Возвращает версии данных, от которых зависят страницы раздела.
+
+    Args:
+        namespace (str): Пространство имён URL (``"news"``, ``"main"`` и т.д.).
+
+    Returns:
+        list | None: Версии данных или None, если раздел не описан в
+        ``PAGE_DEPENDENCIES``.
+    """
+    dependencies = PAGE_DEPENDENCIES.get(namespace)
+    if dependencies is None:
+        return None
+    return [get_version(name) for name in dependencies + PAGE_COMMON_DEPENDENCIES]
+
+
+async def aget_page_versions(namespace):
+    """Асинхронный вариант ``get_page_versions()``."""
+    dependencies = PAGE_DEPENDENCIES.get(namespace)
+    if dependencies is None:
+        return None
+    return await aget_versions(*dependencies, *PAGE_COMMON_DEPENDENCIES)
@@ -0,0 +1,122 @@
+# main/conditional.py
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .caching import aget_versions, get_page_versions, get_version, version_timestamp
+
+LATEST_UPDATE_CACHE_TIMEOUT = 60 * 60
+
+
+def latest_update(queryset, cache_version):
+    """Возвращает наибольшее ``updated_at`` набора объектов.
+
+    Значение хранится в кеше под версией ``cache_version``, поэтому агрегат
+    пересчитывается только после изменения данных.
+
+    Args:
+        queryset (QuerySet): Объекты списка.
+        cache_version (str): Имя версии данных (см. main.caching).
+
+    Returns:
+        datetime | None: Время последнего изменения или None для пустого списка.
+    """
+    queryset = queryset.order_by()
+    key = _latest_update_key(queryset, get_version(cache_version))
+    # Пустой список кешируем как False, чтобы отличить его от промаха
+    latest = cache.get(key)
+    if latest is None:
+        latest = queryset.aggregate(latest=Max("updated_at"))["latest"] or False
+        cache.set(key, latest, LATEST_UPDATE_CACHE_TIMEOUT)
+    return latest or None
+
+
+async def alatest_update(queryset, cache_version):
+    """Асинхронный вариант ``latest_update()``."""
+    queryset = queryset.order_by()
+    (version,) = await aget_versions(cache_version)
+    key = _latest_update_key(queryset, version)
+    latest = await cache.aget(key)
+    if latest is None:
+        result = await queryset.aaggregate(latest=Max("updated_at"))
+        latest = result["latest"] or False
+        await cache.aset(key, latest, LATEST_UPDATE_CACHE_TIMEOUT)
+    return latest or None
+
+
+def _latest_update_key(queryset, version):
+    return "main:latest:%s:%s" % (
+        version,
+        hashlib.md5(str(queryset.query).encode()).hexdigest(),
+    )
+
+
+class ConditionalPage:
+    """Валидаторы ETag и Last-Modified для страницы с контентом.
+
+    Страница меняется вместе с объектом (``updated_at``) и с общими данными
+    раздела: шапкой, меню, сайдбарами (версии из ``main.caching``). ETag
+    учитывает всё это, Last-Modified - самое позднее из времени изменения
+    объекта и времени смены версий.
+
+    Пример::
+
+        page = ConditionalPage(request, news.updated_at)
+        if (response := page.not_modified()) is not None:
+            return response
+        return page.finish(render(request, ...))
+
+    Асинхронные представления передают версии, прочитанные заранее
+    (``main.caching.aget_page_versions()``). У запроса без маршрута
+    (например, из RequestFactory) версии раздела неизвестны, поэтому
+    валидаторы не добавляются и страница всегда отдаётся целиком.
+
+    Args:
+        request: HTTP-запрос.
+        updated_at (datetime | None): Время изменения контента страницы.
+        versions (list | None): Версии данных раздела.
+    """
+
+    def __init__(self, request, updated_at, versions=None):
+        self.request = request
+        if versions is None:
+            match = getattr(request, "resolver_match", None)
+            if match is None:
+                self.etag = self.last_modified = None
+                return
+            versions = get_page_versions(match.namespace)
+        versions = versions or []
+
+        times = [updated_at] if updated_at else []
+        times += filter(None, map(version_timestamp, versions))
+        self.last_modified = int(max(times).timestamp()) if times else None
+
+        # Страница одинакова для всех посетителей: меню пользователя
+        # подгружается отдельно (main.views.user_menu)
+        stamp = ":".join([updated_at.isoformat() if updated_at else ""] + versions)
+        self.etag = quote_etag(hashlib.md5(stamp.encode()).hexdigest())
+
+    def not_modified(self):
+        """Возвращает ответ 304, если у клиента актуальная копия, иначе None."""
+        if self.etag is None:
+            return None
+        response = get_conditional_response(
+            self.request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is not None:
+            self.finish(response)
+        return response
+
+    def finish(self, response):
+        """Добавляет валидаторы к ответу на GET/HEAD запрос."""
+        if self.etag and self.request.method in ("GET", "HEAD"):
+            response.headers.setdefault("ETag", self.etag)
+            if self.last_modified:
+                response.headers.setdefault(
+                    "Last-Modified", http_date(self.last_modified)
+                )
+        return response
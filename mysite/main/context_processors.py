@@ -1,13 +1,22 @@
 # main/context_processors.py
 
-from .models import SiteSettings, Page
+from django.conf import settings as django_settings
+from django.utils.functional import SimpleLazyObject
+
+from .menu import get_menu
+from .models import SiteSettings
 
 
 def site_settings(request):
-    settings = SiteSettings.objects.first()
+    settings = SiteSettings.load()
     return {"site_settings": settings}
 
 
 def menu_items(request):
-    pages = Page.objects.filter(show_in_menu=True, show_on_site=True).order_by("order")
-    return {"menu_pages": pages}
+    # Меню строится (или читается из кеша) только если шаблон к нему обратится
+    return {"menu": SimpleLazyObject(get_menu)}
+
+
+def session_hint(request):
+    # Имя cookie-подсказки для script.js (см. main.middleware.SessionHintMiddleware)
+    return {"session_hint_cookie": django_settings.SESSION_HINT_COOKIE_NAME}
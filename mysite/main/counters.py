@@ -0,0 +1,114 @@
+# main/counters.py
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# Накопленные просмотры: (класс модели, pk) -> количество
+_pending = Counter()
+_last_flush = time.monotonic()
+# Время (time.time()) самого старого незаписанного просмотра или None
+_oldest_pending = None
+
+
+def record_view(instance):
+    """Учитывает просмотр объекта без записи в базу данных.
+
+    Просмотры копятся в памяти процесса и записываются пачкой, когда прошло
+    ``VIEW_COUNTER_FLUSH_INTERVAL`` секунд с последней записи или набралось
+    ``VIEW_COUNTER_MAX_PENDING`` разных объектов.
+
+    Args:
+        instance: Объект модели с полем ``views``.
+    """
+    if _count_view(instance):
+        flush_view_counters()
+
+
+async def arecord_view(instance):
+    """Асинхронный вариант ``record_view()``.
+
+    Запись пачки в базу выполняется в потоке синхронного кода, обычный учёт
+    просмотра обходится без перехода между потоками.
+    """
+    if _count_view(instance):
+        await sync_to_async(flush_view_counters)()
+
+
+def _count_view(instance):
+    """Добавляет просмотр в буфер и сообщает, пора ли записать буфер в базу."""
+    interval = getattr(settings, "VIEW_COUNTER_FLUSH_INTERVAL", 60)
+    max_pending = getattr(settings, "VIEW_COUNTER_MAX_PENDING", 500)
+
+    global _oldest_pending
+
+    with _lock:
+        if not _pending:
+            _oldest_pending = time.time()
+        _pending[(type(instance), instance.pk)] += 1
+        return (
+            len(_pending) >= max_pending or time.monotonic() - _last_flush >= interval
+        )
+
+
+def flush_view_counters():
+    """Записывает накопленные просмотры в базу данных.
+
+    Объекты с одинаковым приростом обновляются одним запросом
+    ``UPDATE ... SET views = views + n WHERE id IN (...)``. Если запись не
+    удалась, просмотры возвращаются в буфер до следующей попытки.
+
+    Returns:
+        int: Количество записанных просмотров.
+    """
+    global _pending, _last_flush, _oldest_pending
+
+    with _lock:
+        pending, _pending = _pending, Counter()
+        oldest, _oldest_pending = _oldest_pending, None
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    batches = defaultdict(lambda: defaultdict(list))
+    for (model, pk), hits in pending.items():
+        batches[model][hits].append(pk)
+
+    try:
+        with transaction.atomic():
+            for model, by_hits in batches.items():
+                for hits, pks in by_hits.items():
+                    model.objects.filter(pk__in=pks).update(views=F("views") + hits)
+    except DatabaseError:
+        logger.exception("Не удалось записать счетчики просмотров")
+        with _lock:
+            _pending.update(pending)
+            if oldest is not None:
+                _oldest_pending = min(oldest, _oldest_pending or oldest)
+        return 0
+    return sum(pending.values())
+
+
+def view_counter_state():
+    """Состояние буфера просмотров процесса для метрик (main.metrics).
+
+    Returns:
+        tuple: Количество объектов с незаписанными просмотрами и время
+        (``time.time()``) самого старого из них или None.
+    """
+    with _lock:
+        return len(_pending), _oldest_pending
+
+
+# Не теряем накопленные просмотры при остановке рабочего процесса
+atexit.register(flush_view_counters)
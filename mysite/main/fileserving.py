@@ -0,0 +1,266 @@
+# main/fileserving.py
+
+import mimetypes
+import os
+import re
+import stat
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+
+# Заранее сжатые копии (main.storage) в порядке предпочтения
+ENCODINGS = ((".br", "br"), (".gz", "gzip"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+BLOCK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_ZERO_QUALITY_RE = re.compile(r"^q=0(\.0*)?$")
+
+FileEntry = namedtuple("FileEntry", "path size mtime etag content_type")
+
+
+def _file_entry(path, st):
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type.endswith("javascript"):
+        content_type += "; charset=utf-8"
+    return FileEntry(
+        path,
+        st.st_size,
+        st.st_mtime,
+        '"%x-%x"' % (st.st_mtime_ns, st.st_size),
+        content_type,
+    )
+
+
+def _accepts(request, coding):
+    """Разрешает ли клиент кодировку ответа (заголовок Accept-Encoding)."""
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() == coding:
+            return not _ZERO_QUALITY_RE.match(params.replace(" ", ""))
+    return False
+
+
+def _etag_matches(header, etag):
+    """Сравнение ETag для If-None-Match (слабое, RFC 9110)."""
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _parse_range(header, size):
+    """Разбирает заголовок Range с одним диапазоном.
+
+    Returns:
+        tuple | None: ``(start, end)`` включительно, ``None``, если заголовок
+        не поддерживается и нужно отдать файл целиком.
+
+    Raises:
+        ValueError: Диапазон вне файла (ответ 416).
+    """
+    match = _RANGE_RE.match(header.replace(" ", ""))
+    if not match or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if not start:
+        # bytes=-500: последние 500 байт
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(f, length):
+    try:
+        while length > 0:
+            chunk = f.read(min(BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+class FileIndex:
+    """Файлы каталога, отдаваемые по адресам с префиксом.
+
+    Список файлов с размерами, ETag и типами строится один раз при создании,
+    поэтому запрос не проверяет файловую систему: файл открывается сразу, а
+    наличие сжатых копий ``.br``/``.gz`` определяется по списку.
+
+    С ``lazy=True`` (медиафайлы) файлы, загруженные после запуска процесса,
+    добавляются в список при первом запросе, а размер открытого файла
+    сверяется со списком: имя удалённого файла может занять новый.
+
+    Args:
+        prefix (str): Адрес каталога, например ``"/static/"``.
+        root (str): Каталог с файлами.
+        lazy (bool): Искать файлы, которых нет в списке.
+        immutable (Iterable[str]): Файлы с хешем содержимого в имени,
+            кешируемые браузером навсегда.
+    """
+
+    def __init__(self, prefix, root, lazy=False, immutable=()):
+        self.prefix = prefix
+        self.root = os.path.abspath(root)
+        self.lazy = lazy
+        self.immutable = frozenset(immutable)
+        self.max_age = getattr(settings, "FILE_SERVING_MAX_AGE", 3600)
+        self.files = {}
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    relative = os.path.relpath(path, self.root)
+                    self.files[relative.replace(os.sep, "/")] = _file_entry(path, st)
+
+    def find(self, relative):
+        entry = self.files.get(relative)
+        if entry is not None or not self.lazy:
+            return entry
+        # Скрытые файлы и выход за пределы каталога не отдаются
+        if any(part.startswith(".") for part in relative.split("/")):
+            return None
+        try:
+            path = safe_join(self.root, relative)
+            st = os.stat(path)
+        except (SuspiciousFileOperation, OSError, ValueError):
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        entry = self.files[relative] = _file_entry(path, st)
+        return entry
+
+    def serve(self, request, relative):
+        """Ответ с файлом или ``None``, если файла нет в каталоге.
+
+        Поддерживаются If-None-Match и If-Modified-Since (ответ 304), Range с
+        одним диапазоном (206 и 416) и выбор сжатой копии по Accept-Encoding.
+        Полный файл отдаётся ``FileResponse``: под WSGI он передаётся серверу
+        через ``wsgi.file_wrapper`` (sendfile у Passenger и gunicorn).
+        """
+        entry = self.find(relative)
+        if entry is None:
+            return None
+
+        range_header = request.headers.get("Range")
+        variants = [
+            (relative + suffix, coding)
+            for suffix, coding in ENCODINGS
+            if relative + suffix in self.files
+        ]
+        key, encoding = relative, None
+        # Диапазоны отдаются только из исходного файла
+        if not range_header:
+            for variant, coding in variants:
+                if _accepts(request, coding):
+                    key, encoding = variant, coding
+                    break
+        chosen = self.files.get(key, entry)
+
+        try:
+            f = open(chosen.path, "rb")
+        except OSError:
+            self.files.pop(key, None)
+            return None
+        if self.lazy:
+            st = os.fstat(f.fileno())
+            if (st.st_size, st.st_mtime) != (chosen.size, chosen.mtime):
+                chosen = self.files[key] = _file_entry(chosen.path, st)
+
+        headers = {
+            "Content-Type": entry.content_type,
+            "ETag": chosen.etag,
+            "Last-Modified": http_date(chosen.mtime),
+            "Cache-Control": (
+                IMMUTABLE
+                if relative in self.immutable
+                else "public, max-age=%d" % self.max_age
+            ),
+            "Accept-Ranges": "bytes",
+            "X-Content-Type-Options": "nosniff",
+        }
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if self.not_modified(request, chosen):
+            f.close()
+            del headers["Content-Type"]
+            return HttpResponse(status=304, headers=headers)
+
+        start, end = 0, chosen.size - 1
+        status = 200
+        if_range = request.headers.get("If-Range")
+        if range_header and (not if_range or if_range == chosen.etag):
+            try:
+                byte_range = _parse_range(range_header, chosen.size)
+            except ValueError:
+                f.close()
+                headers["Content-Range"] = "bytes */%d" % chosen.size
+                return HttpResponse(status=416, headers=headers)
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                headers["Content-Range"] = "bytes %d-%d/%d" % (
+                    start,
+                    end,
+                    chosen.size,
+                )
+        headers["Content-Length"] = end - start + 1
+
+        if request.method == "HEAD":
+            f.close()
+            return HttpResponse(status=status, headers=headers)
+        if status == 206:
+            f.seek(start)
+            return StreamingHttpResponse(
+                _read_range(f, end - start + 1), status=206, headers=headers
+            )
+        response = FileResponse(f, content_type=entry.content_type)
+        response.block_size = BLOCK_SIZE
+        # Имя файла в Content-Disposition (у сжатой копии - с .br/.gz) не нужно
+        del response["Content-Disposition"]
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def not_modified(self, request, entry):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            return _etag_matches(if_none_match, entry.etag)
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        return since is not None and int(entry.mtime) <= since
+
+
+def build_indexes():
+    """Списки файлов ``STATIC_ROOT`` и ``MEDIA_ROOT`` для раздачи.
+
+    Каталоги с адресом на другом домене (CDN) не раздаются. Файлы из
+    манифеста collectstatic (main.storage) отдаются с immutable.
+
+    Returns:
+        list[FileIndex]: Списки в порядке проверки адресов.
+    """
+    indexes = []
+    static_url, static_root = settings.STATIC_URL, settings.STATIC_ROOT
+    if static_url and static_url.startswith("/") and static_root:
+        hashed = getattr(staticfiles_storage, "hashed_files", {}).values()
+        indexes.append(FileIndex(static_url, static_root, immutable=hashed))
+    media_url, media_root = settings.MEDIA_URL, settings.MEDIA_ROOT
+    if media_url and media_url.startswith("/") and media_root:
+        indexes.append(FileIndex(media_url, media_root, lazy=True))
+    return indexes
@@ -0,0 +1,52 @@
+# main/management/commands/backfill_excerpts.py
+
+from django.core.management.base import BaseCommand
+
+from main.caching import bump_version
+from news.models import News, NewsCategory
+from portfolio.models import Portfolio
+
+# Модель и поле, из которого строится анонс
+EXCERPT_SOURCES = (
+    (NewsCategory, "description"),
+    (News, "short_description"),
+    (Portfolio, "short_description"),
+)
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает анонсы (excerpt) для уже сохранённых записей пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Количество записей в одной пачке (по умолчанию 500)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        for model, source in EXCERPT_SOURCES:
+            updated = 0
+            last_pk = 0
+            while True:
+                batch = list(
+                    model.objects.filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    .only("pk", source, "excerpt")[:batch_size]
+                )
+                if not batch:
+                    break
+                for obj in batch:
+                    obj.update_excerpt()
+                model.objects.bulk_update(batch, ["excerpt"])
+                updated += len(batch)
+                last_pk = batch[-1].pk
+
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {updated}")
+
+        # bulk_update не отправляет сигналы, поэтому сбрасываем кеши явно
+        bump_version("menu", "news", "portfolio")
+        self.stdout.write(self.style.SUCCESS("Анонсы обновлены"))
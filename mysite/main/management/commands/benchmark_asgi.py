@@ -0,0 +1,191 @@
+# main/management/commands/benchmark_asgi.py
+
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import override_settings
+
+from main.asgi import SiteASGIHandler
+from main.benchmarking import (
+    BENCHMARK_CACHES,
+    asgi_get,
+    percentile,
+    temporary_database,
+    wsgi_get,
+)
+from main.models import SiteSettings
+from news.models import News, NewsCategory
+from portfolio.models import Portfolio, PortfolioCategory
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест публичных страниц: синхронные представления под WSGI "
+        "(пул потоков) против асинхронных под ASGI (один цикл событий). Замер "
+        "выполняется в процессе на временной базе SQLite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Количество запросов в каждом режиме (по умолчанию 2000)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Количество одновременных запросов (по умолчанию 20)",
+        )
+        parser.add_argument(
+            "--news",
+            type=int,
+            default=500,
+            help="Количество новостей и работ портфолио (по умолчанию 500)",
+        )
+
+    def handle(self, *args, **options):
+        if settings.DATABASES["default"]["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("Замер доступен только для базы SQLite")
+
+        database = settings.DATABASES["default"]
+        # Профилирование и метрики не входят в замеряемую работу страниц
+        with tempfile.TemporaryDirectory() as tmpdir, override_settings(
+            CACHES=BENCHMARK_CACHES,
+            PAGE_CACHE_ENABLED=False,
+            REQUEST_PROFILING_ENABLED=False,
+            METRICS_ENABLED=False,
+        ):
+            with temporary_database(
+                Path(tmpdir) / "asgi.sqlite3",
+                pragmas=getattr(settings, "SQLITE_PRAGMAS", {}),
+                transaction_mode=database.get("OPTIONS", {}).get("transaction_mode"),
+                conn_max_age=database.get("CONN_MAX_AGE", 0),
+            ):
+                urls = self.seed(options["news"])
+                connections.close_all()
+
+                for name, run in (("wsgi", self.run_wsgi), ("asgi", self.run_asgi)):
+                    timings, errors, elapsed = run(urls, options)
+                    self.report(name, timings, errors, elapsed)
+
+    def seed(self, count):
+        """Создаёт данные для замера и возвращает адреса проверяемых страниц."""
+        SiteSettings.objects.get_or_create(pk=1, defaults={"logo_text": "Benchmark"})
+        news_category = NewsCategory.objects.create(name="Новости", slug="news")
+        portfolio_category = PortfolioCategory.objects.create(
+            name="Сайты", slug="sites"
+        )
+        # Без изображений: файлов во временном окружении нет, а неудачные
+        # попытки создать копии изображений не относятся к замеру
+        News.objects.bulk_create(
+            [
+                News(
+                    title=f"Новость для замера {i}",
+                    slug=f"news-{i}",
+                    category=news_category,
+                    short_description="<p>Краткое описание новости</p>",
+                    excerpt="Краткое описание новости",
+                    content="<p>Текст новости</p>" * 20,
+                )
+                for i in range(count)
+            ],
+            batch_size=500,
+        )
+        Portfolio.objects.bulk_create(
+            [
+                Portfolio(
+                    title=f"Работа {i}",
+                    slug=f"work-{i}",
+                    category=portfolio_category,
+                    short_description="Описание работы",
+                    excerpt="Описание работы",
+                )
+                for i in range(count)
+            ],
+            batch_size=500,
+        )
+        Review.objects.bulk_create(
+            [
+                Review(
+                    full_name=f"Клиент {i}",
+                    email=f"client{i}@example.com",
+                    phone="+70000000000",
+                    message="Отличная работа",
+                    status="approved",
+                )
+                for i in range(50)
+            ]
+        )
+        return [
+            "/",
+            "/news/",
+            "/news/category/news/",
+            f"/news/news-{count // 2}/",
+            "/portfolio/",
+            "/portfolio/category/sites/",
+            f"/portfolio/work-{count // 2}/",
+            "/reviews/",
+        ]
+
+    def run_wsgi(self, urls, options):
+        """Синхронные представления: запросы выполняет пул потоков."""
+        application = WSGIHandler()
+        total = options["requests"]
+
+        def request(i):
+            started = time.perf_counter()
+            status, _ = wsgi_get(application, urls[i % len(urls)])
+            return time.perf_counter() - started, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            results = list(pool.map(request, range(total)))
+        elapsed = time.perf_counter() - started
+        # Потоки пула держали свои соединения (CONN_MAX_AGE)
+        connections.close_all()
+        return self.collect(results, elapsed)
+
+    def run_asgi(self, urls, options):
+        """Асинхронные представления: запросы выполняются в одном цикле событий."""
+        application = SiteASGIHandler()
+        total = options["requests"]
+
+        async def main():
+            semaphore = asyncio.Semaphore(options["concurrency"])
+
+            async def request(i):
+                async with semaphore:
+                    started = time.perf_counter()
+                    status, _ = await asgi_get(application, urls[i % len(urls)])
+                    return time.perf_counter() - started, status
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(request(i) for i in range(total)))
+            return results, time.perf_counter() - started
+
+        results, elapsed = asyncio.run(main())
+        return self.collect(results, elapsed)
+
+    def collect(self, results, elapsed):
+        timings = [seconds * 1000 for seconds, _ in results]
+        errors = sum(1 for _, status in results if status != 200)
+        return timings, errors, elapsed
+
+    def report(self, name, timings, errors, elapsed):
+        self.stdout.write(
+            f"{name}: {len(timings) / elapsed:.1f} запросов/с, "
+            f"p50 {percentile(timings, 50):.1f} мс, "
+            f"p95 {percentile(timings, 95):.1f} мс, "
+            f"p99 {percentile(timings, 99):.1f} мс, "
+            f"ошибок {errors}"
+        )
@@ -0,0 +1,175 @@
+# main/management/commands/benchmark_site.py
+
+import json
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import override_settings
+from django.utils import timezone
+
+from main.benchmarking import (
+    BENCHMARK_CACHES,
+    benchmark_database,
+    percentile,
+    sample_urls,
+    wsgi_get,
+)
+from news.models import News, NewsCategory
+from portfolio.models import Portfolio, PortfolioCategory
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный замер страниц сайта: запросы к WSGI-приложению в процессе "
+        "(без сети) из нескольких потоков. Для каждого адреса выводит p50, p95, "
+        "p99 и запросы в секунду и сохраняет результаты в JSON для сравнения "
+        "запусков. Данные готовит команда seed_benchmark_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help="Файл SQLite, наполненный seed_benchmark_data. По умолчанию "
+            "используется база проекта",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            help="Адрес для замера (можно указать несколько раз). По умолчанию "
+            "публичные страницы всех разделов",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Количество запросов к каждому адресу (по умолчанию 200)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Количество одновременных запросов (по умолчанию 8)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Запросов к каждому адресу до замера (по умолчанию 5)",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл для результатов. По умолчанию "
+            "benchmarks/<дата>-<время>.json в каталоге проекта",
+        )
+
+    def handle(self, *args, **options):
+        path = options["database"]
+        if path and settings.DATABASES["default"]["ENGINE"] != (
+            "django.db.backends.sqlite3"
+        ):
+            raise CommandError("--database доступен только для базы SQLite")
+
+        started = timezone.now()
+        # Профилирование и метрики не входят в замеряемую работу страниц
+        with override_settings(
+            CACHES=BENCHMARK_CACHES,
+            REQUEST_PROFILING_ENABLED=False,
+            METRICS_ENABLED=False,
+        ), benchmark_database(Path(path) if path else None):
+            urls = options["urls"] or self.default_urls()
+            data_size = self.data_size()
+            connections.close_all()
+
+            application = WSGIHandler()
+            results = {}
+            for url in urls:
+                results[url] = self.measure(application, url, options)
+                self.report(url, results[url])
+
+        output = Path(
+            options["output"]
+            or Path(settings.BASE_DIR)
+            / "benchmarks"
+            / started.strftime("%Y%m%d-%H%M%S.json")
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(
+            json.dumps(
+                {
+                    "started": started.isoformat(),
+                    "python": platform.python_version(),
+                    "django": django.get_version(),
+                    "database": path or str(settings.DATABASES["default"]["NAME"]),
+                    "data": data_size,
+                    "requests": options["requests"],
+                    "concurrency": options["concurrency"],
+                    "urls": results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(f"Результаты сохранены в {output}"))
+
+    def default_urls(self):
+        if not News.objects.exists():
+            raise CommandError("В базе нет новостей: запустите seed_benchmark_data")
+        return sample_urls()
+
+    def data_size(self):
+        return {
+            model._meta.model_name: model.objects.count()
+            for model in (News, NewsCategory, Portfolio, PortfolioCategory, Review)
+        }
+
+    def measure(self, application, url, options):
+        """Замер одного адреса.
+
+        Returns:
+            dict: Запросы в секунду, перцентили времени ответа (мс), ошибки и
+            размер ответа.
+        """
+
+        def request(_):
+            started = time.perf_counter()
+            status, body = wsgi_get(application, url)
+            return time.perf_counter() - started, status, len(body)
+
+        for i in range(options["warmup"]):
+            request(i)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            results = list(pool.map(request, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        # Потоки пула держали свои соединения (CONN_MAX_AGE)
+        connections.close_all()
+
+        timings = [seconds * 1000 for seconds, _, _ in results]
+        return {
+            "requests_per_second": round(len(results) / elapsed, 1),
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "mean_ms": round(sum(timings) / len(timings), 2) if timings else 0.0,
+            "errors": sum(1 for _, status, _ in results if status != 200),
+            "bytes": max((size for _, _, size in results), default=0),
+        }
+
+    def report(self, url, result):
+        self.stdout.write(
+            f"{url}: {result['requests_per_second']:.1f} запросов/с, "
+            f"p50 {result['p50_ms']:.1f} мс, "
+            f"p95 {result['p95_ms']:.1f} мс, "
+            f"p99 {result['p99_ms']:.1f} мс, "
+            f"ошибок {result['errors']}"
+        )
@@ -0,0 +1,214 @@
+# main/management/commands/benchmark_sqlite.py
+
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
+
+from main.benchmarking import production_profile, temporary_database
+from news.models import News, NewsCategory
+from news.views import news_list
+
+# Настройки SQLite по умолчанию: журнал отката и новое соединение на запрос
+DEFAULT_PROFILE = {
+    "pragmas": {"journal_mode": "DELETE", "synchronous": "FULL"},
+    "transaction_mode": None,
+    "conn_max_age": 0,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает скорость чтения списка новостей при параллельной записи "
+        "счетчиков просмотров с настройками SQLite по умолчанию и с профилем "
+        "из SQLITE_PRAGMAS в режиме WAL. Замеры выполняются на временной копии "
+        "базы."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10.0,
+            help="Длительность замера каждого профиля в секундах (по умолчанию 10)",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Количество потоков, открывающих список новостей (по умолчанию 4)",
+        )
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=2,
+            help="Количество потоков, записывающих просмотры (по умолчанию 2)",
+        )
+        parser.add_argument(
+            "--news",
+            type=int,
+            default=1000,
+            help="Минимальное количество новостей в копии базы (по умолчанию 1000)",
+        )
+
+    def handle(self, *args, **options):
+        database = settings.DATABASES["default"]
+        if database["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("Замер доступен только для базы SQLite")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            results = {}
+            for name, profile in (
+                ("default", DEFAULT_PROFILE),
+                ("production", production_profile()),
+            ):
+                path = Path(tmpdir) / f"{name}.sqlite3"
+                self.copy_database(path)
+                results[name] = self.run_profile(path, profile, options)
+                self.report(name, profile, results[name])
+
+        before, after = results["default"], results["production"]
+        if before["reads_per_second"]:
+            ratio = after["reads_per_second"] / before["reads_per_second"]
+            self.stdout.write(self.style.SUCCESS(f"Ускорение чтения: x{ratio:.2f}"))
+
+    def copy_database(self, target):
+        """Копирует базу через backup API, чтобы не зависеть от режима журнала."""
+        source = connections["default"]
+        source.ensure_connection()
+        dst = sqlite3.connect(target)
+        try:
+            source.connection.backup(dst)
+        finally:
+            dst.close()
+
+    def seed(self, count):
+        """Дополняет копию базы новостями до нужного количества."""
+        missing = count - News.objects.active().count()
+        if missing <= 0:
+            return
+        category, _ = NewsCategory.objects.get_or_create(
+            slug="benchmark", defaults={"name": "Benchmark"}
+        )
+        now = timezone.now()
+        News.objects.bulk_create(
+            [
+                News(
+                    title=f"Новость для замера {i}",
+                    slug=f"benchmark-{now.timestamp():.0f}-{i}",
+                    category=category,
+                    short_description="<p>Краткое описание новости</p>",
+                    excerpt="Краткое описание новости",
+                    content="<p>Текст новости</p>",
+                    is_active=True,
+                )
+                for i in range(missing)
+            ],
+            batch_size=500,
+        )
+
+    def run_profile(self, path, profile, options):
+        """Запускает читателей и писателей на время замера.
+
+        Returns:
+            dict: Количество чтений, записей, ошибок и чтений в секунду.
+        """
+        with temporary_database(
+            path,
+            pragmas=profile["pragmas"],
+            transaction_mode=profile["transaction_mode"],
+            conn_max_age=profile["conn_max_age"],
+        ):
+            self.seed(options["news"])
+            pks = list(News.objects.active().values_list("pk", flat=True)[:200])
+            connections.close_all()
+
+            stats = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+            lock = threading.Lock()
+            stop = threading.Event()
+            factory = RequestFactory()
+            # Представление берёт версии раздела из маршрута запроса
+            match = resolve("/news/")
+            reuse = profile["conn_max_age"] != 0
+
+            def count(key):
+                with lock:
+                    stats[key] += 1
+
+            def reader():
+                while not stop.is_set():
+                    request = factory.get("/news/")
+                    request.resolver_match = match
+                    request.user = AnonymousUser()
+                    request.session = SessionBase()
+                    try:
+                        news_list(request)
+                        count("reads")
+                    except DatabaseError:
+                        count("read_errors")
+                    if not reuse:
+                        connections["default"].close()
+                connections["default"].close()
+
+            def writer():
+                i = 0
+                while not stop.is_set():
+                    batch = pks[i % len(pks) :][:20]
+                    i += 20
+                    try:
+                        # Так же записывает просмотры main.counters
+                        with transaction.atomic():
+                            News.objects.filter(pk__in=batch).update(
+                                views=F("views") + 1
+                            )
+                        count("writes")
+                    except DatabaseError:
+                        count("write_errors")
+                    if not reuse:
+                        connections["default"].close()
+                connections["default"].close()
+
+            threads = [
+                threading.Thread(target=reader) for _ in range(options["readers"])
+            ]
+            if pks:
+                threads += [
+                    threading.Thread(target=writer) for _ in range(options["writers"])
+                ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(options["duration"])
+            stop.set()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            stats["reads_per_second"] = stats["reads"] / elapsed
+            stats["writes_per_second"] = stats["writes"] / elapsed
+            return stats
+
+    def report(self, name, profile, stats):
+        pragmas = ", ".join(f"{k}={v}" for k, v in profile["pragmas"].items())
+        self.stdout.write(
+            f"Профиль {name} ({pragmas}, CONN_MAX_AGE={profile['conn_max_age']})"
+        )
+        self.stdout.write(
+            f"  чтения: {stats['reads']} ({stats['reads_per_second']:.1f}/с), "
+            f"ошибок: {stats['read_errors']}"
+        )
+        self.stdout.write(
+            f"  записи: {stats['writes']} ({stats['writes_per_second']:.1f}/с), "
+            f"ошибок: {stats['write_errors']}"
+        )
@@ -0,0 +1,90 @@
+# main/management/commands/benchmark_templates.py
+
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from main.benchmarking import BENCHMARK_CACHES, benchmark_database, sample_urls
+
+TEMPLATE_TIMING_RE = re.compile(r"\btpl;dur=([\d.]+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендеринга шаблонов страниц без кеша фрагментов "
+        "(шапка, главный блок, подвал) и с ним. Время берётся из заголовка "
+        "Server-Timing (main.profiling)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help="Файл SQLite, наполненный seed_benchmark_data. По умолчанию "
+            "используется база проекта",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            help="Адрес для замера (можно указать несколько раз)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Количество рендерингов каждой страницы (по умолчанию 50)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["database"]
+        if path and settings.DATABASES["default"]["ENGINE"] != (
+            "django.db.backends.sqlite3"
+        ):
+            raise CommandError("--database доступен только для базы SQLite")
+
+        with override_settings(
+            CACHES=BENCHMARK_CACHES,
+            PAGE_CACHE_ENABLED=False,
+            REQUEST_PROFILING_ENABLED=True,
+            METRICS_ENABLED=False,
+            QUERY_BUDGET_RAISE=False,
+        ), benchmark_database(Path(path) if path else None):
+            client = Client()
+            total_before = total_after = 0.0
+            for url in options["urls"] or sample_urls():
+                before = self.measure(client, url, options["repeat"], False)
+                after = self.measure(client, url, options["repeat"], True)
+                total_before += before
+                total_after += after
+                self.report(url, before, after)
+            self.report("Итого", total_before, total_after)
+
+    def measure(self, client, url, repeat, fragments):
+        """Среднее время рендеринга шаблонов страницы, мс.
+
+        Кеш прогревается первым запросом: замер показывает работу рабочего
+        процесса, у которого версии данных и меню уже в кеше.
+        """
+        with override_settings(FRAGMENT_CACHE_ENABLED=fragments):
+            cache.clear()
+            client.get(url)
+            total = 0.0
+            for _ in range(repeat):
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"{url}: код ответа {response.status_code}")
+                match = TEMPLATE_TIMING_RE.search(response.get("Server-Timing", ""))
+                total += float(match.group(1)) if match else 0.0
+        return total / repeat
+
+    def report(self, url, before, after):
+        saved = before - after
+        percent = saved / before * 100 if before else 0.0
+        self.stdout.write(
+            f"{url}: {before:.2f} мс -> {after:.2f} мс "
+            f"(экономия {saved:.2f} мс, {percent:.0f}%)"
+        )
@@ -0,0 +1,349 @@
+# main/management/commands/seed_benchmark_data.py
+
+import random
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from PIL import Image, ImageDraw
+
+from accounts.models import Ticket, TicketResponse, UserProfile
+from main.benchmarking import benchmark_database
+from main.caching import bump_version
+from main.models import Page, SiteSettings
+from news.models import News, NewsCategory
+from portfolio.models import Portfolio, PortfolioCategory
+from reviews.models import Review
+from search.index import rebuild_index
+
+# Префикс slug, имён пользователей и адресов созданных записей: по нему
+# --clear находит и удаляет данные прошлого запуска
+PREFIX = "bench-"
+
+WORDS = (
+    "разработка сайт проект клиент дизайн интерфейс решение задача команда "
+    "сервис бизнес компания продукт результат опыт поддержка запуск этап "
+    "качество скорость страница каталог магазин интеграция система анализ "
+    "стратегия продвижение поиск аудитория контент мобильный удобный новый "
+    "современный надёжный быстрый простой уникальный полезный важный"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Наполняет базу синтетическими данными для нагрузочных замеров: "
+        "новости, категории, работы портфолио, страницы, отзывы, пользователи "
+        "и тикеты с ответами. Записи создаются через bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help="Файл SQLite для замеров (создаётся миграциями). По умолчанию "
+            "используется база проекта",
+        )
+        parser.add_argument(
+            "--news", type=int, default=5000, help="Новостей (по умолчанию 5000)"
+        )
+        parser.add_argument(
+            "--categories",
+            type=int,
+            default=20,
+            help="Категорий новостей и портфолио (по умолчанию 20)",
+        )
+        parser.add_argument(
+            "--works",
+            type=int,
+            default=1000,
+            help="Работ портфолио (по умолчанию 1000)",
+        )
+        parser.add_argument(
+            "--pages", type=int, default=10, help="Страниц сайта (по умолчанию 10)"
+        )
+        parser.add_argument(
+            "--reviews", type=int, default=2000, help="Отзывов (по умолчанию 2000)"
+        )
+        parser.add_argument(
+            "--users", type=int, default=500, help="Пользователей (по умолчанию 500)"
+        )
+        parser.add_argument(
+            "--tickets", type=int, default=2000, help="Тикетов (по умолчанию 2000)"
+        )
+        parser.add_argument(
+            "--responses",
+            type=int,
+            default=3,
+            help="Ответов на каждый тикет (по умолчанию 3)",
+        )
+        parser.add_argument(
+            "--images",
+            type=int,
+            default=20,
+            help="Разных изображений для новостей и работ (по умолчанию 20)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Начальное значение генератора случайных чисел (по умолчанию 1)",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Удалить данные, созданные прошлым запуском",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Количество записей в одной пачке (по умолчанию 500)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["database"]
+        if path and settings.DATABASES["default"]["ENGINE"] != (
+            "django.db.backends.sqlite3"
+        ):
+            raise CommandError("--database доступен только для базы SQLite")
+
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        with benchmark_database(Path(path) if path else None):
+            if options["clear"]:
+                self.clear()
+            elif News.objects.filter(slug__startswith=PREFIX).exists():
+                raise CommandError(
+                    "Данные для замеров уже созданы; используйте --clear"
+                )
+            with transaction.atomic():
+                self.seed(options)
+            # bulk_create не отправляет сигналы: индекс и кеши обновляются явно
+            rebuild_index(batch_size=self.batch_size)
+            bump_version(
+                "site_settings", "menu", "pages", "news", "portfolio", "reviews"
+            )
+        self.stdout.write(self.style.SUCCESS("Данные для замеров созданы"))
+
+    def clear(self):
+        """Удаляет записи, созданные прошлым запуском команды."""
+        for queryset in (
+            User.objects.filter(username__startswith=PREFIX),
+            Review.objects.filter(email__startswith=PREFIX),
+            News.objects.filter(slug__startswith=PREFIX),
+            NewsCategory.objects.filter(slug__startswith=PREFIX),
+            Portfolio.objects.filter(slug__startswith=PREFIX),
+            PortfolioCategory.objects.filter(slug__startswith=PREFIX),
+            Page.objects.filter(slug__startswith=PREFIX),
+        ):
+            deleted, _ = queryset.delete()
+            self.stdout.write(f"{queryset.model._meta.verbose_name_plural}: -{deleted}")
+
+    def seed(self, options):
+        SiteSettings.objects.get_or_create(
+            pk=1, defaults={"logo_text": "Benchmark", "content": self.html(3)}
+        )
+        images = self.images(options["images"])
+
+        self.create(
+            Page(
+                title=self.sentence(3),
+                slug=f"{PREFIX}page-{i}",
+                content=self.html(8, images),
+                order=i,
+            )
+            for i in range(options["pages"])
+        )
+
+        news_categories = self.create(
+            self.with_excerpt(
+                NewsCategory(
+                    name=f"Рубрика {i}",
+                    slug=f"{PREFIX}news-{i}",
+                    description=self.html(1),
+                    order=i,
+                )
+            )
+            for i in range(options["categories"])
+        )
+        portfolio_categories = self.create(
+            PortfolioCategory(
+                name=f"Направление {i}",
+                slug=f"{PREFIX}works-{i}",
+                description=self.sentence(20),
+                order=i,
+            )
+            for i in range(options["categories"])
+        )
+
+        self.create(
+            self.with_excerpt(
+                News(
+                    title=self.sentence(6),
+                    slug=f"{PREFIX}news-item-{i}",
+                    category=self.random.choice(news_categories),
+                    image=images[i % len(images)][0],
+                    short_description=self.html(1),
+                    content=self.html(10, images),
+                    is_active=self.random.random() > 0.05,
+                    views=self.random.randrange(10000),
+                )
+            )
+            for i in range(options["news"])
+        )
+        self.create(
+            self.with_excerpt(
+                Portfolio(
+                    title=self.sentence(4),
+                    slug=f"{PREFIX}work-{i}",
+                    category=self.random.choice(portfolio_categories),
+                    image=images[i % len(images)][1],
+                    short_description=self.sentence(30),
+                    content=self.html(6, images),
+                    is_active=self.random.random() > 0.05,
+                    views=self.random.randrange(10000),
+                )
+            )
+            for i in range(options["works"])
+        )
+
+        self.create(
+            Review(
+                full_name=f"Клиент {i}",
+                email=f"{PREFIX}{i}@example.com",
+                phone="+7900%07d" % i,
+                message=self.sentence(self.random.randint(10, 80)),
+                status=self.random.choice(("approved", "approved", "pending")),
+            )
+            for i in range(options["reviews"])
+        )
+
+        # Хеш пароля вычисляется один раз: он намеренно медленный
+        password = make_password("benchmark")
+        users = self.create(
+            User(
+                username=f"{PREFIX}user-{i}",
+                email=f"{PREFIX}user-{i}@example.com",
+                first_name="Пользователь",
+                last_name=str(i),
+                password=password,
+                is_staff=i == 0,
+            )
+            for i in range(max(options["users"], 1))
+        )
+        self.create(UserProfile(user=user) for user in users)
+
+        tickets = self.create(
+            self.with_excerpt(
+                Ticket(
+                    user=self.random.choice(users),
+                    subject=self.sentence(5),
+                    message=self.sentence(self.random.randint(20, 120)),
+                    status=self.random.choice(("open", "in_progress", "closed")),
+                )
+            )
+            for _ in range(options["tickets"])
+        )
+        staff = users[0]
+        self.create(
+            TicketResponse(
+                ticket=ticket,
+                user=staff if n % 2 == 0 else ticket.user,
+                message=self.sentence(self.random.randint(10, 60)),
+                is_admin_response=n % 2 == 0,
+            )
+            for ticket in tickets
+            for n in range(options["responses"])
+        )
+        # bulk_create не вызывает TicketResponse.save(): поля ответов тикетов
+        # пересчитываются одним запросом
+        Ticket.objects.filter(user__in=users).refresh_response_stats(reset_unread=True)
+
+    def create(self, objects):
+        """Создаёт объекты пачками и возвращает их список с первичными ключами."""
+        objects = list(objects)
+        if not objects:
+            return objects
+        model = type(objects[0])
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.stdout.write(f"{model._meta.verbose_name_plural}: {len(created)}")
+        return created
+
+    def with_excerpt(self, obj):
+        obj.update_excerpt()
+        return obj
+
+    def sentence(self, words):
+        text = " ".join(self.random.choice(WORDS) for _ in range(words))
+        return text.capitalize()
+
+    def html(self, paragraphs, images=()):
+        """HTML в том виде, в каком его сохраняет CKEditor 5."""
+        blocks = []
+        for i in range(paragraphs):
+            kind = self.random.random()
+            if i and kind < 0.15:
+                blocks.append("<h2>%s</h2>" % self.sentence(4))
+            elif kind < 0.25:
+                items = "".join(
+                    "<li>%s</li>" % self.sentence(5)
+                    for _ in range(self.random.randint(2, 5))
+                )
+                blocks.append("<ul>%s</ul>" % items)
+            elif images and kind < 0.35:
+                name = self.random.choice(images)[0]
+                blocks.append(
+                    '<figure class="image"><img src="%s" alt="%s"></figure>'
+                    % (default_storage.url(name), self.sentence(3))
+                )
+            blocks.append(
+                '<p>%s <strong>%s</strong> %s <a href="https://example.com/">%s</a>.</p>'
+                % (
+                    self.sentence(self.random.randint(15, 40)),
+                    self.sentence(2).lower(),
+                    self.sentence(self.random.randint(10, 30)).lower(),
+                    self.sentence(2).lower(),
+                )
+            )
+        return "".join(blocks)
+
+    def images(self, count):
+        """Создаёт JPEG-изображения для новостей и работ портфолио.
+
+        Returns:
+            list: Пары имён файлов в хранилище (новость, работа портфолио).
+        """
+        names = []
+        for i in range(max(count, 1)):
+            pair = []
+            for folder in ("news", "portfolio"):
+                name = f"{folder}/{PREFIX}{i}.jpg"
+                if not default_storage.exists(name):
+                    default_storage.save(name, ContentFile(self.image()))
+                pair.append(name)
+            names.append(pair)
+        return names
+
+    def image(self):
+        """Градиент с фигурами 1600x900: размер файла как у фотографии."""
+        width, height = 1600, 900
+        start = [self.random.randrange(256) for _ in range(3)]
+        end = [self.random.randrange(256) for _ in range(3)]
+        image = Image.new("RGB", (width, height))
+        draw = ImageDraw.Draw(image)
+        for x in range(width):
+            color = tuple(s + (e - s) * x // width for s, e in zip(start, end))
+            draw.line([(x, 0), (x, height)], fill=color)
+        for _ in range(12):
+            x, y = self.random.randrange(width), self.random.randrange(height)
+            r = self.random.randint(40, 200)
+            fill = tuple(self.random.randrange(256) for _ in range(3))
+            draw.ellipse([x - r, y - r, x + r, y + r], fill=fill)
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=85)
+        return buffer.getvalue()
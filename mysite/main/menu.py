@@ -0,0 +1,89 @@
+# main/menu.py
+
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from .caching import aget_versions, get_version
+
+MENU_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Пункт меню: страница или категория новостей/портфолио. image - имя файла
+# в хранилище (копии для карточек выводит тег {% picture %})
+MenuItem = namedtuple("MenuItem", ["title", "slug", "url", "image", "excerpt"])
+
+# Дерево меню: кортежи пунктов для каждого раздела сайта
+MenuTree = namedtuple("MenuTree", ["pages", "news_categories", "portfolio_categories"])
+
+
+def _build_items(queryset, title_field):
+    """Превращает queryset страниц или категорий в кортеж пунктов меню."""
+    return tuple(
+        MenuItem(
+            title=getattr(obj, title_field),
+            slug=obj.slug,
+            url=obj.get_absolute_url() if obj.slug else "",
+            image=obj.image.name if getattr(obj, "image", None) else "",
+            excerpt=getattr(obj, "excerpt", ""),
+        )
+        for obj in queryset
+    )
+
+
+def build_menu():
+    """Строит дерево меню из страниц и категорий новостей и портфолио.
+
+    Returns:
+        MenuTree: Пункты меню для всех разделов сайта.
+    """
+    from news.models import NewsCategory
+    from portfolio.models import PortfolioCategory
+
+    from .models import Page
+
+    return MenuTree(
+        pages=_build_items(
+            Page.objects.filter(show_in_menu=True, show_on_site=True).order_by("order"),
+            "title",
+        ),
+        news_categories=_build_items(
+            NewsCategory.objects.filter(is_active=True, show_in_menu=True), "name"
+        ),
+        portfolio_categories=_build_items(
+            PortfolioCategory.objects.filter(is_active=True, show_in_menu=True),
+            "name",
+        ),
+    )
+
+
+def get_menu():
+    """Возвращает дерево меню из кеша, при необходимости перестраивая его.
+
+    Ключ кеша содержит версию ``"menu"``, которую меняют обработчики
+    сигналов ``Page``, ``NewsCategory`` и ``PortfolioCategory``.
+
+    Returns:
+        MenuTree: Пункты меню для всех разделов сайта.
+    """
+    key = "main:menu:v2:%s" % get_version("menu")
+    menu = cache.get(key)
+    if menu is None:
+        menu = build_menu()
+        cache.set(key, menu, MENU_CACHE_TIMEOUT)
+    return menu
+
+
+async def aget_menu():
+    """Асинхронный вариант ``get_menu()``.
+
+    При промахе меню строится в потоке синхронного кода: три запроса за
+    один переход между потоками вместо перехода на каждый запрос.
+    """
+    (version,) = await aget_versions("menu")
+    key = "main:menu:v2:%s" % version
+    menu = await cache.aget(key)
+    if menu is None:
+        menu = await sync_to_async(build_menu)()
+        await cache.aset(key, menu, MENU_CACHE_TIMEOUT)
+    return menu
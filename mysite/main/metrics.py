@@ -0,0 +1,372 @@
+# main/metrics.py
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import locks
+from django.db.models import Count
+
+from .counters import view_counter_state
+
+# Границы корзин гистограмм (как в prometheus_client)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+HISTOGRAMS = {
+    "django_request_duration_seconds": (
+        "Время обработки запроса по имени маршрута",
+        LATENCY_BUCKETS,
+    ),
+    "django_request_db_queries": (
+        "Количество запросов к базе за HTTP-запрос по имени маршрута",
+        QUERY_BUCKETS,
+    ),
+}
+COUNTERS = {
+    "django_requests_total": "Количество запросов по имени маршрута и коду ответа",
+    "django_cache_requests_total": "Обращения к кешу: попадания (hit) и промахи (miss)",
+    "django_page_cache_requests_total": (
+        "Кеш страниц для анонимных посетителей: попадания (hit) и промахи (miss)"
+    ),
+}
+
+_lock = threading.Lock()
+# Показатели процесса: имя -> метки -> [счётчики корзин..., сумма, количество]
+_histograms = defaultdict(dict)
+# Имя -> метки -> значение
+_counters = defaultdict(lambda: defaultdict(float))
+_last_write = 0.0
+# PID процесса и имя его файла показателей
+_process_file = (None, None)
+
+# Сумма показателей завершившихся процессов
+AGGREGATE_FILE = "aggregate.json"
+
+
+def _labels(**labels):
+    """Метки в формате экспозиции Prometheus: ``view="news:list"``."""
+    return ",".join(
+        '%s="%s"'
+        % (
+            name,
+            str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"),
+        )
+        for name, value in sorted(labels.items())
+    )
+
+
+def _observe(name, labels, value):
+    buckets = HISTOGRAMS[name][1]
+    series = _histograms[name].setdefault(labels, [0] * (len(buckets) + 3))
+    # Корзина с наименьшей границей не меньше значения, последняя - +Inf
+    series[bisect_left(buckets, value)] += 1
+    series[-2] += value
+    series[-1] += 1
+
+
+def metrics_directory():
+    """Общий каталог, в котором процессы сохраняют свои показатели."""
+    return Path(getattr(settings, "METRICS_DIR", ""))
+
+
+def process_file_name():
+    """Имя файла показателей текущего процесса: ``<pid>-<случайная часть>.json``.
+
+    PID завершившегося процесса может получить новый рабочий процесс;
+    случайная часть не даёт ему перезаписать файл предшественника. Имя
+    создаётся заново после fork.
+    """
+    global _process_file
+
+    pid = os.getpid()
+    if _process_file[0] != pid:
+        _process_file = (pid, "%d-%s.json" % (pid, uuid.uuid4().hex[:12]))
+    return _process_file[1]
+
+
+def record_request(view_name, status, profile, page_cache=None):
+    """Учитывает обработанный запрос (main.middleware.RequestProfilingMiddleware).
+
+    Показатели копятся в памяти процесса и сохраняются в ``METRICS_DIR`` не
+    чаще раза в ``METRICS_WRITE_INTERVAL`` секунд.
+
+    Args:
+        view_name (str | None): Имя маршрута, например ``"news:list"``.
+        status (int): Код ответа.
+        profile (RequestProfile): Показатели запроса (main.profiling).
+        page_cache (str | None): Заголовок ``X-Page-Cache`` ответа (``"HIT"``
+            или ``"MISS"``), если запрос прошёл через кеш страниц.
+    """
+    view = _labels(view=view_name or "<unresolved>")
+    with _lock:
+        _observe("django_request_duration_seconds", view, profile.total_time)
+        _observe("django_request_db_queries", view, profile.queries)
+        requests = _counters["django_requests_total"]
+        requests[_labels(view=view_name or "<unresolved>", status=status)] += 1
+        cache = _counters["django_cache_requests_total"]
+        cache[_labels(result="hit")] += profile.cache_hits
+        cache[_labels(result="miss")] += profile.cache_misses
+        if page_cache:
+            page = _counters["django_page_cache_requests_total"]
+            page[_labels(result=page_cache.lower())] += 1
+        due = time.monotonic() - _last_write >= getattr(
+            settings, "METRICS_WRITE_INTERVAL", 10
+        )
+    if due:
+        write_process_metrics()
+
+
+def write_process_metrics():
+    """Сохраняет показатели процесса в ``METRICS_DIR`` (``process_file_name()``).
+
+    Файл заменяется атомарно, поэтому читающий процесс не видит его
+    частично записанным.
+    """
+    global _last_write
+
+    directory = metrics_directory()
+    # Процессы, не обслуживавшие запросов (команды manage.py), не пишут файл
+    if not str(directory) or not _counters:
+        return
+    pending, oldest_pending = view_counter_state()
+    with _lock:
+        data = {
+            "pid": os.getpid(),
+            "histograms": {name: dict(series) for name, series in _histograms.items()},
+            "counters": {name: dict(series) for name, series in _counters.items()},
+            "view_counter_pending": pending,
+            "view_counter_oldest_pending": oldest_pending,
+        }
+        _last_write = time.monotonic()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _write_json(directory / process_file_name(), data)
+
+
+def _write_json(path, data):
+    """Записывает JSON во временный файл и подменяет им ``path``."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(histograms, counters, data):
+    """Добавляет гистограммы и счётчики из ``data`` к суммам."""
+    for name, series in data.get("histograms", {}).items():
+        for labels, values in series.items():
+            total = histograms[name].get(labels)
+            histograms[name][labels] = (
+                [a + b for a, b in zip(total, values)] if total else values
+            )
+    for name, series in data.get("counters", {}).items():
+        for labels, value in series.items():
+            counters[name][labels] += value
+
+
+def _process_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def fold_dead_processes(directory):
+    """Переносит показатели завершившихся процессов в ``AGGREGATE_FILE``.
+
+    Файлы процессов после переноса удаляются, поэтому каталог не растёт с
+    перезапусками рабочих процессов. Перенос выполняется под блокировкой
+    файла ``.lock``, чтобы одновременные запросы метрик не учли один файл
+    дважды. Имена перенесённых, но ещё не удалённых файлов хранятся в
+    сводном файле и при суммировании пропускаются.
+
+    Returns:
+        dict: Содержимое сводного файла.
+    """
+    aggregate_path = directory / AGGREGATE_FILE
+    with open(directory / ".lock", "a") as lock:
+        locks.lock(lock, locks.LOCK_EX)
+        try:
+            aggregate = _read_json(aggregate_path) or {}
+            stale = [directory / name for name in aggregate.get("folded", ())]
+            histograms = defaultdict(dict)
+            counters = defaultdict(lambda: defaultdict(float))
+            _merge(histograms, counters, aggregate)
+
+            dead = []
+            for path in directory.glob("*.json"):
+                if path.name == AGGREGATE_FILE or path in stale:
+                    continue
+                data = _read_json(path)
+                if data is None or _process_alive(data.get("pid", 0)):
+                    continue
+                _merge(histograms, counters, data)
+                dead.append(path)
+
+            if dead or stale:
+                removed = [path for path in dead + stale if path.exists()]
+                aggregate = {
+                    "histograms": histograms,
+                    "counters": counters,
+                    "folded": [path.name for path in removed],
+                }
+                _write_json(aggregate_path, aggregate)
+                for path in removed:
+                    path.unlink(missing_ok=True)
+        finally:
+            locks.unlock(lock)
+    return aggregate
+
+
+def collect_process_metrics():
+    """Суммирует показатели всех процессов из ``METRICS_DIR``.
+
+    Показатели завершившихся процессов переносятся в сводный файл
+    (``fold_dead_processes()``) и продолжают учитываться: значения счётчиков
+    не уменьшаются при перезапуске рабочих процессов. Состояние буфера
+    просмотров учитывается только для работающих процессов. Каталог очищают
+    при развёртывании.
+
+    Returns:
+        dict: Гистограммы, счётчики и состояние счётчиков просмотров.
+    """
+    write_process_metrics()
+    directory = metrics_directory()
+    histograms = defaultdict(dict)
+    counters = defaultdict(lambda: defaultdict(float))
+    pending = 0
+    oldest_pending = None
+
+    paths = []
+    if directory.is_dir():
+        aggregate = fold_dead_processes(directory)
+        _merge(histograms, counters, aggregate)
+        skip = {AGGREGATE_FILE, *aggregate.get("folded", ())}
+        paths = [path for path in directory.glob("*.json") if path.name not in skip]
+
+    for path in paths:
+        data = _read_json(path)
+        if data is None:
+            continue
+        _merge(histograms, counters, data)
+        pending += data.get("view_counter_pending", 0)
+        oldest = data.get("view_counter_oldest_pending")
+        if oldest is not None:
+            oldest_pending = min(oldest, oldest_pending or oldest)
+
+    return {
+        "histograms": histograms,
+        "counters": counters,
+        "view_counter_pending": pending,
+        "view_counter_lag": time.time() - oldest_pending if oldest_pending else 0.0,
+    }
+
+
+def queue_sizes():
+    """Размеры очередей модерации и поддержки.
+
+    Returns:
+        dict: ``{"reviews": {status: n}, "tickets": {status: n}}``.
+    """
+    from accounts.models import Ticket
+    from reviews.models import Review
+
+    sizes = {}
+    for name, model in (("reviews", Review), ("tickets", Ticket)):
+        counts = dict(
+            model.objects.order_by().values_list("status").annotate(Count("pk"))
+        )
+        sizes[name] = {
+            status: counts.get(status, 0) for status, _ in model.STATUS_CHOICES
+        }
+    return sizes
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """Возвращает показатели в текстовом формате экспозиции Prometheus."""
+    data = collect_process_metrics()
+    lines = []
+
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines += ["# HELP %s %s" % (name, description), "# TYPE %s histogram" % name]
+        for labels, values in sorted(data["histograms"].get(name, {}).items()):
+            cumulative = 0
+            for bound, count in zip(buckets + ("+Inf",), values[:-2]):
+                cumulative += count
+                lines.append(
+                    '%s_bucket{%s,le="%s"} %d' % (name, labels, bound, cumulative)
+                )
+            lines.append("%s_sum{%s} %s" % (name, labels, _format(values[-2])))
+            lines.append("%s_count{%s} %d" % (name, labels, values[-1]))
+
+    for name, description in COUNTERS.items():
+        lines += ["# HELP %s %s" % (name, description), "# TYPE %s counter" % name]
+        for labels, value in sorted(data["counters"].get(name, {}).items()):
+            lines.append("%s{%s} %s" % (name, labels, _format(value)))
+
+    cache = data["counters"].get("django_cache_requests_total", {})
+    hits, misses = cache.get(_labels(result="hit"), 0), cache.get(
+        _labels(result="miss"), 0
+    )
+    gauges = [
+        (
+            "django_cache_hit_ratio",
+            "Доля попаданий в кеш среди всех обращений",
+            [("", hits / (hits + misses) if hits + misses else 0.0)],
+        ),
+        (
+            "view_counter_pending_objects",
+            "Объекты с незаписанными просмотрами (main.counters)",
+            [("", data["view_counter_pending"])],
+        ),
+        (
+            "view_counter_flush_lag_seconds",
+            "Возраст самого старого незаписанного просмотра",
+            [("", data["view_counter_lag"])],
+        ),
+    ]
+    for queue, sizes in queue_sizes().items():
+        gauges.append(
+            (
+                "%s_queue_size" % queue,
+                "Количество записей по статусам",
+                [(_labels(status=status), n) for status, n in sorted(sizes.items())],
+            )
+        )
+
+    for name, description, samples in gauges:
+        lines += ["# HELP %s %s" % (name, description), "# TYPE %s gauge" % name]
+        for labels, value in samples:
+            lines.append(
+                "%s%s %s" % (name, "{%s}" % labels if labels else "", _format(value))
+            )
+    return "\n".join(lines) + "\n"
+
+
+# Показатели завершающегося процесса сохраняются для суммирования
+atexit.register(write_process_metrics)
@@ -0,0 +1,352 @@
+# main/middleware.py
+
+import hashlib
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.urls import Resolver404, resolve
+
+from .caching import (
+    PAGE_CACHE_EXCLUDED_VIEWS,
+    aget_page_versions,
+    get_page_versions,
+)
+from .fileserving import build_indexes
+from .metrics import record_request
+from .profiling import QueryBudgetExceeded, finish_profile, start_profile
+
+profiling_logger = logging.getLogger("main.profiling")
+
+
+class AsyncCapableMiddleware:
+    """Основа middleware, работающих под WSGI и под ASGI.
+
+    Под ASGI синхронное middleware заставляет Django выполнять всю цепочку
+    после него в отдельном потоке, поэтому собственные middleware сайта
+    реализуют оба варианта: ``__call__`` и ``__acall__``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        """Обработка ответа без обращений к базе и кешу."""
+        return response
+
+
+class StaticFilesMiddleware(AsyncCapableMiddleware):
+    """Раздача ``STATIC_ROOT`` и ``MEDIA_ROOT`` приложением (main.fileserving).
+
+    Нужна, если веб-сервер хостинга не настроен отдавать эти каталоги сам.
+    Включается настройкой ``FILE_SERVING_ENABLED``. Список файлов строится
+    при загрузке middleware, то есть при запуске процесса: после
+    collectstatic процессы перезапускают. Стоит в MIDDLEWARE первым, чтобы
+    запросы файлов не проходили сессии, профилирование и метрики.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "FILE_SERVING_ENABLED", False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.indexes = build_indexes()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.serve(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def serve(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        path = request.path_info
+        for index in self.indexes:
+            if path.startswith(index.prefix):
+                return index.serve(request, path[len(index.prefix) :])
+        return None
+
+
+class AnonymousPageCacheMiddleware(AsyncCapableMiddleware):
+    """Кеш готовых страниц для анонимных посетителей.
+
+    Включается настройкой ``PAGE_CACHE_ENABLED``. Кешируются только GET/HEAD
+    запросы без cookie сессии к публичным разделам сайта (см.
+    ``main.caching.PAGE_DEPENDENCIES``), кроме страниц, учитывающих просмотры
+    (``PAGE_CACHE_EXCLUDED_VIEWS``). Ключ содержит версии данных раздела,
+    поэтому сохранение связанной модели в админке делает старые копии недоступными.
+    Попадания и промахи учитываются в метриках (main.metrics) по заголовку
+    ``X-Page-Cache``.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, "PAGE_CACHE_ENABLED", False):
+            return self.get_response(request)
+
+        match = self.resolve_cacheable(request)
+        if match is None:
+            return self.get_response(request)
+        key = self.get_cache_key(request, get_page_versions(match.namespace))
+        if key is None:
+            return self.get_response(request)
+
+        cached = cache.get(key)
+        if cached is not None:
+            return self.cached_response(cached)
+
+        response = self.get_response(request)
+        if request.method == "GET" and self.is_cacheable(request, response):
+            cache.set(
+                key,
+                self.cache_entry(response),
+                getattr(settings, "PAGE_CACHE_TIMEOUT", 600),
+            )
+        response["X-Page-Cache"] = "MISS"
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, "PAGE_CACHE_ENABLED", False):
+            return await self.get_response(request)
+
+        match = self.resolve_cacheable(request)
+        if match is None:
+            return await self.get_response(request)
+        versions = await aget_page_versions(match.namespace)
+        key = self.get_cache_key(request, versions)
+        if key is None:
+            return await self.get_response(request)
+
+        cached = await cache.aget(key)
+        if cached is not None:
+            return self.cached_response(cached)
+
+        response = await self.get_response(request)
+        if request.method == "GET" and self.is_cacheable(request, response):
+            await cache.aset(
+                key,
+                self.cache_entry(response),
+                getattr(settings, "PAGE_CACHE_TIMEOUT", 600),
+            )
+        response["X-Page-Cache"] = "MISS"
+        return response
+
+    def resolve_cacheable(self, request):
+        """Возвращает маршрут запроса или None, если кешировать нельзя."""
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return None
+        # Страница покажет и удалит сообщения посетителя
+        if CookieStorage.cookie_name in request.COOKIES:
+            return None
+
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.view_name in PAGE_CACHE_EXCLUDED_VIEWS:
+            return None
+        return match
+
+    def get_cache_key(self, request, versions):
+        """Возвращает ключ кеша страницы или None для разделов без версий."""
+        if versions is None:
+            return None
+        url = request.build_absolute_uri()
+        digest = hashlib.md5(":".join(versions + [url]).encode()).hexdigest()
+        return "main:page:%s" % digest
+
+    def cached_response(self, cached):
+        """Восстанавливает ответ из записи кеша."""
+        status, content, headers = cached
+        response = HttpResponse(content, status=status)
+        for header, value in headers:
+            response[header] = value
+        response["X-Page-Cache"] = "HIT"
+        return response
+
+    def cache_entry(self, response):
+        """Запись кеша для ответа: статус, содержимое и заголовки."""
+        headers = [
+            (header, value)
+            for header, value in response.items()
+            if header.lower() != "content-length"
+        ]
+        return response.status_code, response.content, headers
+
+    def is_cacheable(self, request, response):
+        """Проверяет, что ответ не зависит от конкретного посетителя."""
+        if response.status_code != 200 or response.streaming:
+            return False
+        # Ответ создал сессию или другую cookie
+        if response.cookies:
+            return False
+        # Страница содержит CSRF-токен, привязанный к cookie посетителя
+        if request.META.get("CSRF_COOKIE_USED"):
+            return False
+        cache_control = response.get("Cache-Control", "").lower()
+        return "private" not in cache_control and "no-cache" not in cache_control
+
+
+class PublicCacheGuardMiddleware(AsyncCapableMiddleware):
+    """Не даёт кешировать в nginx/CDN ответы, зависящие от посетителя.
+
+    Публичные представления помечаются ``cache_control(public=True, ...)``.
+    Если при обработке запроса всё же была прочитана сессия или ответ
+    устанавливает cookie (сессия, сообщения, CSRF), ``public`` заменяется на
+    ``private``. Должен стоять в MIDDLEWARE перед SessionMiddleware, чтобы
+    видеть cookie, которые добавляют остальные middleware.
+    """
+
+    def process_response(self, request, response):
+        if "public" not in response.get("Cache-Control", ""):
+            return response
+
+        session = getattr(request, "session", None)
+        if (session is not None and session.accessed) or response.cookies:
+            patch_cache_control(response, private=True, max_age=0)
+        return response
+
+
+class SessionHintMiddleware(AsyncCapableMiddleware):
+    """Ставит cookie-подсказку ``SESSION_HINT_COOKIE_NAME`` вошедшим посетителям.
+
+    Cookie сессии недоступна JavaScript, поэтому script.js по подсказке решает,
+    подгружать ли меню пользователя (``main:user_menu``). Подсказка
+    обновляется только в запросах, которые сами читали сессию (вход, выход,
+    личный кабинет), поэтому публичные страницы сессию не трогают.
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, "session", None)
+        if session is None or not session.accessed:
+            return response
+
+        name = settings.SESSION_HINT_COOKIE_NAME
+        logged_in = SESSION_KEY in session
+        if logged_in and name not in request.COOKIES:
+            response.set_cookie(
+                name,
+                "1",
+                max_age=settings.SESSION_COOKIE_AGE,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite="Lax",
+            )
+        elif not logged_in and name in request.COOKIES:
+            response.delete_cookie(name, samesite="Lax")
+        return response
+
+
+class RequestProfilingMiddleware(AsyncCapableMiddleware):
+    """Профилирование запросов (main.profiling).
+
+    Включается настройкой ``REQUEST_PROFILING_ENABLED``. Для каждого запроса
+    считает запросы к базе и их время, время рендеринга шаблонов, попадания
+    и промахи кеша и общее время, добавляет заголовок ``Server-Timing`` и
+    пишет строку JSON в журнал ``main.profiling``.
+
+    ``QUERY_BUDGETS`` задаёт наибольшее число запросов к базе для имени
+    маршрута (``{"news:list": 4}``). Превышение пишется в журнал, а при
+    ``QUERY_BUDGET_RAISE`` вызывает ``QueryBudgetExceeded``. Должен стоять
+    в MIDDLEWARE первым после ``StaticFilesMiddleware``, чтобы учесть работу
+    всех остальных middleware.
+
+    При ``METRICS_ENABLED`` показатели запроса также учитываются в метриках
+    Prometheus (main.metrics), даже если профилирование выключено.
+    """
+
+    def enabled(self):
+        return getattr(settings, "REQUEST_PROFILING_ENABLED", False) or getattr(
+            settings, "METRICS_ENABLED", False
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled():
+            return self.get_response(request)
+
+        profile, token = start_profile()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_profile(token)
+        return self.report(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.enabled():
+            return await self.get_response(request)
+
+        profile, token = start_profile()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_profile(token)
+        return self.report(request, response, profile)
+
+    def report(self, request, response, profile):
+        """Добавляет Server-Timing, пишет журнал и проверяет лимит запросов."""
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        if getattr(settings, "METRICS_ENABLED", False):
+            record_request(
+                view_name,
+                response.status_code,
+                profile,
+                page_cache=response.get("X-Page-Cache"),
+            )
+        if not getattr(settings, "REQUEST_PROFILING_ENABLED", False):
+            return response
+
+        response["Server-Timing"] = profile.server_timing()
+
+        data = {
+            "method": request.method,
+            "path": request.path,
+            "view": view_name,
+            "status": response.status_code,
+            **profile.as_dict(),
+        }
+        profiling_logger.info(json.dumps(data, ensure_ascii=False), extra=data)
+
+        budget = getattr(settings, "QUERY_BUDGETS", {}).get(view_name)
+        if budget is not None and profile.queries > budget:
+            message = "Превышен лимит запросов к базе для %s: %d из %d" % (
+                view_name,
+                profile.queries,
+                budget,
+            )
+            if getattr(settings, "QUERY_BUDGET_RAISE", False):
+                raise QueryBudgetExceeded(message)
+            profiling_logger.warning(message, extra=data)
+        return response
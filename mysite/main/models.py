@@ -1,7 +1,19 @@
 from django.db import models
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django_ckeditor_5.fields import CKEditor5Field
+from django_cleanup.signals import cleanup_post_delete
+
+from .caching import aget_versions, bump_version_on_commit, get_version
+from .profiling import profile_queries
+from .thumbnails import delete_thumbnails
+
+# Копия настроек в памяти процесса: (версия, объект)
+_site_settings_local = (None, None)
 
 
 class SiteSettings(models.Model):
@@ -36,7 +48,7 @@ class SiteSettings(models.Model):
     Methods:
         __str__: Возвращает строковое представление объекта.
         save(*args, **kwargs): Переопределённый метод сохранения, разрешающий только одну запись.
-        load(): Классовый метод для получения или создания экземпляра настроек.
+        load(): Классовый метод для получения экземпляра настроек из кеша.
     """
 
     phone1 = models.CharField(_("Телефон 1"), max_length=20, blank=True)
@@ -94,17 +106,52 @@ class SiteSettings(models.Model):
     @classmethod
     def load(cls):
         """
-        Классовый метод для получения или создания экземпляра настроек.
+        Классовый метод для получения экземпляра настроек.
+
+        Если запись ещё не создана (в админке), возвращается несохранённый
+        экземпляр со значениями по умолчанию: чтение страницы не пишет в базу.
 
-        Всегда возвращает единственный экземпляр модели с первичным ключом 1.
+        Экземпляр хранится в памяти процесса вместе с версией, которая лежит
+        в общем кеше Django. Пока версия не изменилась, запрос к базе данных
+        не выполняется; сохранение или удаление настроек меняет версию, и все
+        процессы перечитывают запись при следующем обращении.
 
         Returns:
             SiteSettings: Единственный экземпляр настроек.
         """
-        # Метод для загрузки единственной записи настроек
-        obj, created = cls.objects.get_or_create(pk=1)
+        global _site_settings_local
+
+        version = get_version("site_settings")
+        local_version, obj = _site_settings_local
+        if local_version == version:
+            return obj
+
+        # Запись создаётся в админке; до этого страницы используют значения
+        # по умолчанию без записи в базу
+        obj = cls.objects.first() or cls()
+        _site_settings_local = (version, obj)
         return obj
 
+    @classmethod
+    async def aload(cls):
+        """Асинхронный вариант ``load()``."""
+        global _site_settings_local
+
+        (version,) = await aget_versions("site_settings")
+        local_version, obj = _site_settings_local
+        if local_version == version:
+            return obj
+
+        obj = await cls.objects.afirst() or cls()
+        _site_settings_local = (version, obj)
+        return obj
+
+
+@receiver([post_save, post_delete], sender=SiteSettings)
+def invalidate_site_settings(sender, **kwargs):
+    """Сбрасывает кешированные настройки сайта во всех процессах."""
+    bump_version_on_commit("site_settings")
+
 
 class Page(models.Model):
     """Модель страницы сайта, представляющая структуру данных для пользовательских страниц.
@@ -129,6 +176,7 @@ class Page(models.Model):
 
     Методы:
         __str__: Возвращает строковое представление объекта (заголовок страницы).
+        get_absolute_url: Возвращает абсолютный URL страницы.
     """
 
     title = models.CharField(_("Заголовок"), max_length=200)
@@ -157,3 +205,28 @@ class Page(models.Model):
         Возвращает строковое представление объекта - заголовок страницы.
         """
         return self.title
+
+    def get_absolute_url(self):
+        """
+        Возвращает абсолютный URL страницы.
+        """
+        return reverse("main:page_detail", kwargs={"slug": self.slug})
+
+
+@receiver([post_save, post_delete], sender=Page)
+def invalidate_page_caches(sender, **kwargs):
+    """Сбрасывает меню навигации и кеш страниц при изменении страниц."""
+    bump_version_on_commit("menu", "pages")
+
+
+@receiver(cleanup_post_delete)
+def delete_file_thumbnails(sender, file_name, **kwargs):
+    """Удаляет уменьшенные копии вместе с файлом, который удалил django_cleanup."""
+    delete_thumbnails(file_name)
+
+
+@receiver(connection_created)
+def install_query_profiler(sender, connection, **kwargs):
+    """Подключает учёт запросов к базе для профилирования (main.profiling)."""
+    if profile_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_queries)
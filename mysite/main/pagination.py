@@ -0,0 +1,259 @@
+# main/pagination.py
+
+import base64
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .caching import get_version
+
+COUNT_CACHE_TIMEOUT = 60 * 60
+
+
+class InvalidCursor(ValueError):
+    """Курсор страницы повреждён или не соответствует сортировке."""
+
+
+class CursorPage:
+    """Страница курсорной пагинации.
+
+    Attributes:
+        object_list (list): Объекты страницы.
+        has_next (bool): Есть ли следующая страница.
+        has_previous (bool): Есть ли предыдущая страница.
+        next_cursor (str): Курсор для ссылки «вперёд» (параметр ``after``).
+        previous_cursor (str): Курсор для ссылки «назад» (параметр ``before``).
+    """
+
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[-1])
+        return ""
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[0])
+        return ""
+
+
+class KeysetPaginator:
+    """Курсорная (keyset) пагинация без COUNT(*) и OFFSET.
+
+    Следующая страница выбирается условием «после последней записи текущей
+    страницы» по полям сортировки, поэтому стоимость запроса не зависит от
+    номера страницы. Последнее поле сортировки должно быть уникальным
+    (обычно ``id``).
+
+    Args:
+        queryset (QuerySet): Исходный набор объектов.
+        per_page (int): Количество объектов на странице.
+        ordering (tuple): Поля сортировки, например ``("-created_at", "-id")``.
+    """
+
+    # Признак курсорного режима для общего шаблона пагинации
+    is_keyset = True
+
+    def __init__(self, queryset, per_page, ordering=("-created_at", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = tuple(field.lstrip("-") for field in self.ordering)
+
+    def encode_cursor(self, obj):
+        """Кодирует значения полей сортировки объекта в строку курсора."""
+        values = [getattr(obj, field) for field in self.fields]
+        # isoformat() без округления: курсор должен точно совпадать со значением
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        ]
+        data = json.dumps(values).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Восстанавливает значения полей сортировки из строки курсора.
+
+        Raises:
+            InvalidCursor: Если курсор не удаётся разобрать.
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(data)
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor(cursor) from e
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor(cursor)
+        try:
+            return [
+                self._output_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except Exception as e:
+            raise InvalidCursor(cursor) from e
+
+    def _output_field(self, name):
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return self.queryset.model._meta.get_field(name)
+
+    def _seek(self, values, forward):
+        """Строит условие «строго после» (или «строго до») значений курсора."""
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            name = self.fields[i]
+            descending = field.startswith("-")
+            lookup = "lt" if descending == forward else "gt"
+            prefix = {self.fields[j]: values[j] for j in range(i)}
+            condition |= Q(**prefix, **{f"{name}__{lookup}": values[i]})
+        # Нестрогое условие по первому полю позволяет базе начать с позиции
+        # курсора в индексе, а не фильтровать весь индекс от начала
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") == forward else "gte"
+        return Q(**{f"{self.fields[0]}__{bound}": values[0]}) & condition
+
+    def get_page(self, after=None, before=None):
+        """Возвращает страницу после курсора ``after`` или до курсора ``before``.
+
+        Некорректный курсор приводит к первой странице.
+
+        Returns:
+            CursorPage: Страница объектов.
+        """
+        queryset, direction = self._page_queryset(after, before)
+        return self._make_page(list(queryset), direction)
+
+    async def aget_page(self, after=None, before=None):
+        """Асинхронный вариант ``get_page()``."""
+        queryset, direction = self._page_queryset(after, before)
+        return self._make_page([obj async for obj in queryset], direction)
+
+    def _page_queryset(self, after, before):
+        """Возвращает запрос страницы (на один объект больше) и направление."""
+        try:
+            if before:
+                return self._queryset_before(self.decode_cursor(before)), "before"
+            if after:
+                return self._queryset_after(self.decode_cursor(after)), "after"
+        except InvalidCursor:
+            pass
+        return self.queryset.order_by(*self.ordering)[: self.per_page + 1], None
+
+    def _queryset_after(self, values):
+        queryset = self.queryset.filter(self._seek(values, forward=True))
+        return queryset.order_by(*self.ordering)[: self.per_page + 1]
+
+    def _queryset_before(self, values):
+        reverse = [
+            field[1:] if field.startswith("-") else "-" + field
+            for field in self.ordering
+        ]
+        queryset = self.queryset.filter(self._seek(values, forward=False))
+        return queryset.order_by(*reverse)[: self.per_page + 1]
+
+    def _make_page(self, objects, direction):
+        """Собирает страницу из выборки с лишним объектом-признаком продолжения."""
+        has_more = len(objects) > self.per_page
+        objects = objects[: self.per_page]
+        if direction == "before":
+            objects.reverse()
+            return CursorPage(self, objects, True, has_more)
+        return CursorPage(self, objects, has_more, direction == "after")
+
+
+class CachedCountPaginator(Paginator):
+    """Постраничная навигация с номерами страниц и кешированным COUNT(*).
+
+    Количество объектов хранится в кеше под версией ``cache_version``
+    (см. main.caching), поэтому пересчитывается только после изменения данных.
+    """
+
+    def __init__(self, object_list, per_page, cache_version, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_version = cache_version
+
+    @cached_property
+    def count(self):
+        sql = str(self.object_list.query)
+        key = "main:count:%s:%s" % (
+            get_version(self.cache_version),
+            hashlib.md5(sql.encode()).hexdigest(),
+        )
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+
+def paginate(request, queryset, per_page, cache_version):
+    """Возвращает страницу списка для представления.
+
+    По умолчанию используется курсорная пагинация (параметры ``after`` и
+    ``before``). Нумерованные страницы с кешированным общим количеством
+    включаются настройкой ``PAGINATION_NUMBERED`` или параметром ``page``
+    (чтобы старые ссылки продолжали работать).
+
+    Args:
+        request: HTTP-запрос.
+        queryset (QuerySet): Набор объектов, отсортированный по дате.
+        per_page (int): Количество объектов на странице.
+        cache_version (str): Имя версии данных для кеша количества объектов.
+
+    Returns:
+        CursorPage | Page: Страница объектов.
+    """
+    if getattr(settings, "PAGINATION_NUMBERED", False) or "page" in request.GET:
+        paginator = CachedCountPaginator(
+            queryset.order_by("-created_at", "-id"), per_page, cache_version
+        )
+        return paginator.get_page(request.GET.get("page"))
+
+    paginator = KeysetPaginator(queryset, per_page)
+    return paginator.get_page(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
+
+
+async def apaginate(request, queryset, per_page, cache_version):
+    """Асинхронный вариант ``paginate()``.
+
+    Нумерованные страницы (Paginator работает только синхронно) строятся в
+    потоке синхронного кода.
+    """
+    if getattr(settings, "PAGINATION_NUMBERED", False) or "page" in request.GET:
+        return await sync_to_async(paginate)(request, queryset, per_page, cache_version)
+
+    paginator = KeysetPaginator(queryset, per_page)
+    return await paginator.aget_page(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
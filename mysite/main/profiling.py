@@ -0,0 +1,155 @@
+# main/profiling.py
+
+import time
+from contextvars import ContextVar
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.template.backends.django import DjangoTemplates, Template
+
+# Профиль текущего запроса. Контекстная переменная видна и в потоках
+# sync_to_async, поэтому запросы к базе и рендеринг шаблонов асинхронных
+# представлений попадают в профиль своего запроса.
+_current_profile = ContextVar("request_profile", default=None)
+
+_MISSING = object()
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов к базе, чем разрешено."""
+
+
+class RequestProfile:
+    """Показатели обработки одного запроса.
+
+    Attributes:
+        queries (int): Количество запросов к базе данных.
+        db_time (float): Время запросов к базе, с.
+        template_time (float): Время рендеринга шаблонов, с (включает запросы
+            ленивых QuerySet, выполненные из шаблона).
+        cache_hits (int): Попадания в кеш.
+        cache_misses (int): Промахи кеша.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        """Показатели для журнала (время в миллисекундах)."""
+        return {
+            "total_ms": round(self.total_time * 1000, 1),
+            "db_queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 1),
+            "template_ms": round(self.template_time * 1000, 1),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing."""
+        return ", ".join(
+            [
+                'db;dur=%.1f;desc="%d queries"' % (self.db_time * 1000, self.queries),
+                "tpl;dur=%.1f" % (self.template_time * 1000),
+                'cache;desc="%d hits, %d misses"'
+                % (self.cache_hits, self.cache_misses),
+                "total;dur=%.1f" % (self.total_time * 1000),
+            ]
+        )
+
+
+def start_profile():
+    """Начинает профиль запроса и возвращает его вместе с токеном для сброса."""
+    profile = RequestProfile()
+    return profile, _current_profile.set(profile)
+
+
+def finish_profile(token):
+    _current_profile.reset(token)
+
+
+def current_profile():
+    """Профиль обрабатываемого запроса или None вне запроса."""
+    return _current_profile.get()
+
+
+def profile_queries(execute, sql, params, many, context):
+    """Обёртка выполнения SQL (``connection.execute_wrappers``).
+
+    Подключается ко всем соединениям обработчиком ``connection_created``
+    (см. main.models) и учитывает запросы в профиле текущего запроса.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.db_time += time.perf_counter() - started
+        profile.queries += 1
+
+
+class ProfiledTemplate(Template):
+    """Шаблон, время рендеринга которого учитывается в профиле запроса."""
+
+    def render(self, context=None, request=None):
+        profile = _current_profile.get()
+        if profile is None:
+            return super().render(context, request)
+        # Вложенный рендеринг (render_to_string из тега) уже входит во внешний
+        profile.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.template_depth -= 1
+            if not profile.template_depth:
+                profile.template_time += time.perf_counter() - started
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """Шаблонизатор Django с учётом времени рендеринга (TEMPLATES BACKEND)."""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name).template, self)
+
+
+class ProfiledCacheMixin:
+    """Учёт попаданий и промахов кеша в профиле запроса.
+
+    Бэкенды файлового кеша и кеша в памяти читают ключи только через
+    ``get()``: ``get_many()``, ``get_or_set()`` и асинхронные методы
+    базового класса вызывают его для каждого ключа.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        profile = _current_profile.get()
+        if profile is not None:
+            if value is _MISSING:
+                profile.cache_misses += 1
+            else:
+                profile.cache_hits += 1
+        return default if value is _MISSING else value
+
+
+class ProfiledFileBasedCache(ProfiledCacheMixin, FileBasedCache):
+    pass
+
+
+class ProfiledLocMemCache(ProfiledCacheMixin, LocMemCache):
+    pass
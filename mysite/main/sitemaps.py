@@ -0,0 +1,173 @@
+# main/sitemaps.py
+
+from collections import namedtuple
+from xml.sax.saxutils import escape
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from .caching import get_version
+
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+
+SITEMAP_XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# Раздел карты сайта: модель, фильтр опубликованных объектов, имя URL детальной
+# страницы, поле времени изменения (None - lastmod не выводится) и версия
+# данных из main.caching, при смене которой карта раздела устаревает.
+SitemapSection = namedtuple(
+    "SitemapSection",
+    ["model", "filters", "url_name", "lastmod_field", "version", "changefreq"],
+)
+
+SITEMAP_SECTIONS = {
+    "pages": SitemapSection(
+        model="main.Page",
+        filters={"show_on_site": True},
+        url_name="main:page_detail",
+        lastmod_field="updated_at",
+        version="pages",
+        changefreq="monthly",
+    ),
+    "news": SitemapSection(
+        model="news.News",
+        filters={"is_active": True},
+        url_name="news:detail",
+        lastmod_field="updated_at",
+        version="news",
+        changefreq="weekly",
+    ),
+    "news_categories": SitemapSection(
+        model="news.NewsCategory",
+        filters={"is_active": True},
+        url_name="news:category",
+        lastmod_field=None,
+        version="news",
+        changefreq="daily",
+    ),
+    "portfolio": SitemapSection(
+        model="portfolio.Portfolio",
+        filters={"is_active": True},
+        url_name="portfolio:detail",
+        lastmod_field="updated_at",
+        version="portfolio",
+        changefreq="monthly",
+    ),
+    "portfolio_categories": SitemapSection(
+        model="portfolio.PortfolioCategory",
+        filters={"is_active": True},
+        url_name="portfolio:category",
+        lastmod_field=None,
+        version="portfolio",
+        changefreq="weekly",
+    ),
+}
+
+
+def section_queryset(section):
+    """Опубликованные объекты раздела в порядке первичного ключа."""
+    model = apps.get_model(section.model)
+    return model.objects.filter(**section.filters).order_by("pk")
+
+
+def format_lastmod(value):
+    """Время изменения в формате W3C Datetime без микросекунд."""
+    return value.replace(microsecond=0).isoformat()
+
+
+def section_chunks(name, section):
+    """Разбивает раздел на файлы карты по ``settings.SITEMAP_LIMIT`` адресов.
+
+    Файлы задаются границами первичного ключа, а не смещением: каждая часть
+    выбирается по индексу ``pk`` без OFFSET. Границы и время последнего
+    изменения части считаются одним проходом по узкой выборке и хранятся
+    в кеше до смены версии раздела.
+
+    Returns:
+        list: Пары (первый pk части, lastmod части или None).
+    """
+    # Не больше стольких адресов в одном файле (ограничение протокола 50000)
+    limit = getattr(settings, "SITEMAP_LIMIT", 50_000)
+    key = "main:sitemap:chunks:%s:%d:%s" % (
+        name,
+        limit,
+        get_version(section.version),
+    )
+    chunks = cache.get(key)
+    if chunks is not None:
+        return chunks
+
+    fields = ["pk"] + ([section.lastmod_field] if section.lastmod_field else [])
+    chunks = []
+    rows = section_queryset(section).values_list(*fields)
+    for position, row in enumerate(rows.iterator(chunk_size=2000)):
+        if position % limit == 0:
+            chunks.append([row[0], None])
+        lastmod = row[1] if len(row) > 1 else None
+        if lastmod and (chunks[-1][1] is None or lastmod > chunks[-1][1]):
+            chunks[-1][1] = lastmod
+    chunks = [tuple(chunk) for chunk in chunks]
+    cache.set(key, chunks, SITEMAP_CACHE_TIMEOUT)
+    return chunks
+
+
+def sitemap_index_versions():
+    """Версии данных всех разделов: ключ кеша индекса карты."""
+    names = sorted({section.version for section in SITEMAP_SECTIONS.values()})
+    return ":".join(get_version(name) for name in names)
+
+
+def render_sitemap_index(base_url):
+    """Возвращает XML индекса карты сайта со ссылками на все части разделов."""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<sitemapindex xmlns="%s">\n' % SITEMAP_XMLNS,
+    ]
+    for name, section in SITEMAP_SECTIONS.items():
+        for page, (_, lastmod) in enumerate(section_chunks(name, section), 1):
+            location = base_url + reverse(
+                "sitemap_section", kwargs={"section": name, "page": page}
+            )
+            lines.append("<sitemap><loc>%s</loc>" % escape(location))
+            if lastmod:
+                lines.append("<lastmod>%s</lastmod>" % format_lastmod(lastmod))
+            lines.append("</sitemap>\n")
+    lines.append("</sitemapindex>\n")
+    return "".join(lines)
+
+
+def iter_sitemap_section(base_url, section, start, stop):
+    """Построчно выдаёт XML части раздела с ``pk`` в диапазоне [start, stop).
+
+    Объекты читаются через ``.iterator()`` узкой выборкой (slug и время
+    изменения), поэтому память не зависит от размера раздела.
+    """
+    queryset = section_queryset(section).filter(pk__gte=start)
+    if stop is not None:
+        queryset = queryset.filter(pk__lt=stop)
+    fields = ["slug"] + ([section.lastmod_field] if section.lastmod_field else [])
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<urlset xmlns="%s">\n' % SITEMAP_XMLNS
+    for row in queryset.values_list(*fields).iterator(chunk_size=2000):
+        location = base_url + reverse(section.url_name, kwargs={"slug": row[0]})
+        item = "<url><loc>%s</loc>" % escape(location)
+        if len(row) > 1 and row[1]:
+            item += "<lastmod>%s</lastmod>" % format_lastmod(row[1])
+        yield item + "<changefreq>%s</changefreq></url>\n" % section.changefreq
+    yield "</urlset>\n"
+
+
+def cache_while_streaming(chunks, key, timeout=SITEMAP_CACHE_TIMEOUT):
+    """Передаёт части ответа дальше и кеширует ответ целиком после отдачи.
+
+    Если клиент оборвал соединение, генератор не доходит до конца и неполный
+    ответ в кеш не попадает.
+    """
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, "".join(parts), timeout)
@@ -0,0 +1,215 @@
+# main/storage.py
+
+import gzip
+import logging
+import os
+import re
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from PIL import Image, UnidentifiedImageError, features
+
+try:
+    import brotli
+except ImportError:  # .br-копии создаются, только если установлен brotli
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Файлы, для которых имеет смысл хранить сжатые копии
+COMPRESSIBLE_EXTENSIONS = (
+    ".css",
+    ".js",
+    ".mjs",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+    ".html",
+    ".ico",
+    ".ttf",
+    ".otf",
+    ".eot",
+)
+# Сжатая копия сохраняется, если она хотя бы на 5% меньше исходного файла
+COMPRESSION_MIN_SIZE = 256
+COMPRESSION_MIN_RATIO = 0.95
+
+RASTER_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# Формат Pillow, расширение и параметры сохранения копий изображений
+IMAGE_VARIANTS = (
+    ("WEBP", ".webp", {"quality": 80, "method": 6}),
+    ("AVIF", ".avif", {"quality": 60}),
+)
+
+_CSS_COMMENT_RE = re.compile(r"/\*(?!!).*?\*/", re.S)
+_CSS_STRING_RE = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+
+
+def minify_css(source):
+    """Удаляет из CSS комментарии и лишние пробелы.
+
+    Строки в кавычках не меняются, комментарии вида ``/*! ... */``
+    (лицензии) сохраняются.
+    """
+    parts = _CSS_STRING_RE.split(source)
+    for i in range(0, len(parts), 2):
+        code = _CSS_COMMENT_RE.sub("", parts[i])
+        code = re.sub(r"\s+", " ", code)
+        code = re.sub(r" ?([{};,>]) ?", r"\1", code)
+        code = re.sub(r" ?: ?(?=[^{}]*[;}])", ":", code)
+        parts[i] = code.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def minify_js(source):
+    """Удаляет из JavaScript отступы, пустые строки и строки-комментарии.
+
+    Переводы строк сохраняются, поэтому автоматическая расстановка точек с
+    запятой и код внутри строк не меняются. Сжатие сильнее даёт gzip/brotli.
+    """
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if line and not line.startswith("//"):
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+class MinifiedSourceStorage:
+    """Хранилище исходных файлов, отдающее CSS и JS уже сжатыми.
+
+    Подставляется вместо хранилища-источника в ``post_process()``, поэтому
+    ``ManifestStaticFilesStorage`` считает хеш и заменяет ``url()`` в уже
+    сжатом содержимом. Остальные атрибуты берутся у исходного хранилища.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __getattr__(self, name):
+        return getattr(self.storage, name)
+
+    def open(self, name, mode="rb"):
+        minifier = MINIFIERS.get(os.path.splitext(name)[1].lower())
+        if minifier is None:
+            return self.storage.open(name, mode)
+        with self.storage.open(name) as f:
+            source = f.read().decode()
+        return ContentFile(minifier(source).encode(), name=name)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище collectstatic для рабочего сайта.
+
+    К возможностям ``ManifestStaticFilesStorage`` (хеш содержимого в именах
+    файлов и манифест staticfiles.json) добавляются:
+
+    * сжатие CSS и JS из ``STATICFILES_DIRS`` (сторонние приложения
+      поставляют свои сборки как есть);
+    * копии ``.gz`` и ``.br`` рядом с файлами с хешем, чтобы веб-сервер
+      отдавал заранее сжатые файлы;
+    * копии растровых изображений в WebP и AVIF. Они попадают в манифест под
+      именем исходного файла с новым расширением: ``{% static
+      "images/fon1.webp" %}`` вернёт адрес копии ``images/fon1.jpg``.
+
+    Хеш в имени CSS и JS считается по сжатому содержимому, у копий
+    изображений - по байтам самой копии. Изменение минификатора или
+    параметров WebP/AVIF даёт новые имена, поэтому файлы с хешем можно
+    отдавать с ``Cache-Control: max-age=31536000, immutable``.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        paths = {
+            name: (
+                (MinifiedSourceStorage(storage), path)
+                if self._is_project_file(storage)
+                else (storage, path)
+            )
+            for name, (storage, path) in paths.items()
+        }
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        for name, hashed_name in list(self.hashed_files.items()):
+            if os.path.splitext(name)[1].lower() in RASTER_EXTENSIONS:
+                for variant in self._save_image_variants(name, hashed_name):
+                    yield variant, self.hashed_files[variant], True
+
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+                self._compress(hashed_name)
+        self.save_manifest()
+
+    def _is_project_file(self, storage):
+        location = os.path.abspath(getattr(storage, "location", ""))
+        return any(
+            location
+            == os.path.abspath(
+                directory[1] if isinstance(directory, tuple) else directory
+            )
+            for directory in settings.STATICFILES_DIRS
+        )
+
+    def _replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
+
+    def _save_image_variants(self, name, hashed_name):
+        """Сохраняет WebP и AVIF копии изображения и добавляет их в манифест.
+
+        Копия не сохраняется, если формат не поддерживается сборкой Pillow
+        или копия получилась не меньше исходного файла.
+
+        Returns:
+            list: Имена копий без хеша.
+        """
+        try:
+            with self.open(hashed_name) as f:
+                original = f.read()
+            image = Image.open(BytesIO(original))
+            image.load()
+        except (OSError, UnidentifiedImageError):
+            logger.warning("Не удалось прочитать изображение %s", name)
+            return []
+        if image.mode not in ("RGB", "RGBA"):
+            alpha = "A" in image.mode or "transparency" in image.info
+            image = image.convert("RGBA" if alpha else "RGB")
+
+        created = []
+        for image_format, extension, params in IMAGE_VARIANTS:
+            variant = os.path.splitext(name)[0] + extension
+            if variant in self.hashed_files or not features.check(image_format.lower()):
+                continue
+            buffer = BytesIO()
+            image.save(buffer, image_format, **params)
+            if buffer.tell() >= len(original):
+                continue
+            data = buffer.getvalue()
+            hashed_variant = self.hashed_name(variant, ContentFile(data))
+            self._replace(hashed_variant, data)
+            self.hashed_files[variant] = hashed_variant
+            created.append(variant)
+        return created
+
+    def _compress(self, hashed_name):
+        with self.open(hashed_name) as f:
+            content = f.read()
+        if len(content) < COMPRESSION_MIN_SIZE:
+            return
+        limit = len(content) * COMPRESSION_MIN_RATIO
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) < limit:
+            self._replace(hashed_name + ".gz", compressed)
+        if brotli is not None:
+            compressed = brotli.compress(content, quality=11)
+            if len(compressed) < limit:
+                self._replace(hashed_name + ".br", compressed)
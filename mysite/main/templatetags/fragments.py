@@ -0,0 +1,64 @@
+# main/templatetags/fragments.py
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from main.caching import get_versions
+
+register = template.Library()
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, tags):
+        self.nodelist = nodelist
+        self.name = name
+        self.tags = tags
+
+    def render(self, context):
+        if not getattr(settings, "FRAGMENT_CACHE_ENABLED", True):
+            return self.nodelist.render(context)
+
+        key = "main:fragment:%s:%s" % (self.name, ":".join(get_versions(*self.tags)))
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(
+                key,
+                content,
+                getattr(settings, "FRAGMENT_CACHE_TIMEOUT", FRAGMENT_CACHE_TIMEOUT),
+            )
+        return content
+
+
+@register.tag
+def cache_fragment(parser, token):
+    """Кеширует готовый HTML блока до смены версий перечисленных данных.
+
+    Блок не должен зависеть от запроса и пользователя: он одинаков на всех
+    страницах, пока не изменятся данные с указанными именами версий (см.
+    main.caching).
+
+    Пример::
+
+        {% load fragments %}
+        {% cache_fragment "footer" "site_settings" %}...{% endcache_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "'%s' ожидает имя блока и хотя бы одно имя версии" % bits[0]
+        )
+    names = []
+    for bit in bits[1:]:
+        if bit[0] not in "\"'" or bit[0] != bit[-1]:
+            raise template.TemplateSyntaxError(
+                "Аргументы '%s' должны быть строками в кавычках" % bits[0]
+            )
+        names.append(bit[1:-1])
+
+    nodelist = parser.parse(("endcache_fragment",))
+    parser.delete_first_token()
+    return CacheFragmentNode(nodelist, names[0], names[1:])
@@ -0,0 +1,36 @@
+# main/templatetags/thumbnails.py
+
+from django import template
+
+from main.thumbnails import get_thumbnail
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail(image, preset):
+    """Уменьшенные копии изображения для собственной разметки.
+
+    Пример::
+
+        {% thumbnail news.image "card" as thumb %}
+        <img src="{{ thumb.src }}" srcset="{{ thumb.srcset }}">
+    """
+    return get_thumbnail(image, preset)
+
+
+@register.inclusion_tag("main/_picture.html")
+def picture(image, preset, alt="", css_class="", style="", loading="lazy"):
+    """Выводит <picture> с WebP и srcset для плотностей экрана.
+
+    Пример::
+
+        {% picture news.image "card" alt=news.title css_class="card-img-top" %}
+    """
+    return {
+        "thumb": get_thumbnail(image, preset),
+        "alt": alt,
+        "css_class": css_class,
+        "style": style,
+        "loading": loading,
+    }
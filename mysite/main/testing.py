@@ -0,0 +1,220 @@
+# main/testing.py
+
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+# Отдельный кеш в памяти, чтобы тесты не видели данные файлового кеша сайта
+TEST_CACHES = {"default": {"BACKEND": "main.profiling.ProfiledLocMemCache"}}
+
+# Статика без манифеста: тесты не зависят от запуска collectstatic
+TEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Таблицы, для списков которых объявлены индексы
+INDEXED_TABLES = (
+    "news_news",
+    "portfolio_portfolio",
+    "reviews_review",
+    "accounts_ticket",
+)
+
+
+# Объекты, созданные seed_site(), на страницы которых ссылаются тесты
+SeededSite = namedtuple(
+    "SeededSite",
+    ["user", "page", "news_category", "news", "portfolio_category", "work", "ticket"],
+)
+
+# HTML, похожий на содержимое из CKEditor
+CONTENT_HTML = (
+    "<h2>Заголовок раздела</h2>"
+    "<p>Абзац текста с <strong>выделением</strong> и "
+    '<a href="https://example.com/">ссылкой</a>.</p>'
+    "<ul><li>Первый пункт</li><li>Второй пункт</li></ul>"
+) * 5
+
+
+def seed_site(news=300, works=200, reviews=200, tickets=60, responses=3):
+    """Наполняет базу данными в объёмах, близких к рабочему сайту.
+
+    Объекты создаются через ``bulk_create()``: вызывать из ``setUpTestData``.
+    Новости и работы создаются без изображений: файлов в хранилище нет, а копии
+    изображений проверяются в ``main.tests.ThumbnailTests``.
+
+    Returns:
+        SeededSite: Пользователь с тикетами и объекты для детальных страниц.
+    """
+    from accounts.models import Ticket, TicketResponse
+    from news.models import News, NewsCategory
+    from portfolio.models import Portfolio, PortfolioCategory
+    from reviews.models import Review
+
+    from .models import Page, SiteSettings
+
+    SiteSettings.objects.create(logo_text="Site", content=CONTENT_HTML)
+    user = User.objects.create_user("client", "client@example.com", "password")
+    staff = User.objects.create_user("manager", "manager@example.com", is_staff=True)
+
+    Page.objects.bulk_create(
+        Page(title=f"Страница {i}", slug=f"page-{i}", content=CONTENT_HTML, order=i)
+        for i in range(5)
+    )
+    NewsCategory.objects.bulk_create(
+        NewsCategory(name=f"Рубрика {i}", slug=f"news-category-{i}", order=i)
+        for i in range(8)
+    )
+    PortfolioCategory.objects.bulk_create(
+        PortfolioCategory(name=f"Направление {i}", slug=f"works-{i}", order=i)
+        for i in range(6)
+    )
+    news_categories = list(NewsCategory.objects.order_by("order"))
+    portfolio_categories = list(PortfolioCategory.objects.order_by("order"))
+
+    News.objects.bulk_create(
+        News(
+            title=f"Новость {i}",
+            slug=f"news-{i}",
+            category=news_categories[i % len(news_categories)],
+            short_description="<p>Краткое описание новости</p>",
+            excerpt="Краткое описание новости",
+            content=CONTENT_HTML,
+            is_active=i % 10 != 0,
+        )
+        for i in range(news)
+    )
+    Portfolio.objects.bulk_create(
+        Portfolio(
+            title=f"Работа {i}",
+            slug=f"work-{i}",
+            category=portfolio_categories[i % len(portfolio_categories)],
+            short_description="Краткое описание работы",
+            excerpt="Краткое описание работы",
+            is_active=i % 10 != 0,
+        )
+        for i in range(works)
+    )
+    Review.objects.bulk_create(
+        Review(
+            full_name=f"Клиент {i}",
+            email=f"client{i % 20}@example.com",
+            phone="+70000000000",
+            message="Спасибо за работу! " * 10,
+            status=("approved", "pending", "rejected")[i % 3],
+        )
+        for i in range(reviews)
+    )
+    Ticket.objects.bulk_create(
+        Ticket(
+            user=user if i % 2 else staff,
+            subject=f"Обращение {i}",
+            message="Текст обращения",
+            status=("open", "in_progress", "closed")[i % 3],
+        )
+        for i in range(tickets)
+    )
+    ticket = Ticket.objects.filter(user=user).latest("pk")
+    TicketResponse.objects.bulk_create(
+        TicketResponse(
+            ticket=t,
+            user=staff if n % 2 else t.user,
+            message="Ответ по обращению",
+            is_admin_response=bool(n % 2),
+        )
+        for t in Ticket.objects.all()
+        for n in range(responses)
+    )
+
+    return SeededSite(
+        user=user,
+        page=Page.objects.get(slug="page-1"),
+        news_category=news_categories[1],
+        news=News.objects.get(slug="news-1"),
+        portfolio_category=portfolio_categories[1],
+        work=Portfolio.objects.get(slug="work-1"),
+        ticket=ticket,
+    )
+
+
+@override_settings(
+    CACHES=TEST_CACHES,
+    STORAGES=TEST_STORAGES,
+    METRICS_ENABLED=False,
+    REQUEST_PROFILING_ENABLED=False,
+    FILE_SERVING_ENABLED=False,
+)
+class SiteTestCase(TestCase):
+    """Базовый класс тестов с чистым кешем перед каждым тестом.
+
+    Метрики выключены, чтобы тесты не писали в каталог ``METRICS_DIR``,
+    профилирование - чтобы не засорять вывод строками журнала, раздача
+    файлов - чтобы каждый тестовый клиент не строил списки файлов.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @contextmanager
+    def capture_sql(self):
+        """Собирает SQL-запросы вместе с параметрами в список."""
+        queries = []
+
+        def wrapper(execute, sql, params, many, context):
+            queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(wrapper):
+            yield queries
+
+    def explain(self, sql, params):
+        """Возвращает план выполнения запроса SQLite одной строкой."""
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return " | ".join(row[-1] for row in cursor.fetchall())
+
+    def assertNoFullScanSort(self, queries):
+        """Проверяет, что списки не читаются полным просмотром с сортировкой.
+
+        Для каждого SELECT по таблицам из ``INDEXED_TABLES`` план не должен
+        одновременно содержать полный просмотр таблицы (``SCAN <table>`` без
+        индекса) и временное B-дерево для ORDER BY.
+        """
+        for sql, params in queries:
+            if not sql.startswith("SELECT"):
+                continue
+            tables = [t for t in INDEXED_TABLES if 'FROM "%s"' % t in sql]
+            if not tables:
+                continue
+            plan = self.explain(sql, params)
+            full_scan = any(
+                re.search(r"\bSCAN %s(?! USING)" % table, plan) for table in tables
+            )
+            if full_scan and "USE TEMP B-TREE FOR ORDER BY" in plan:
+                self.fail("Полный просмотр с сортировкой:\n%s\n%s" % (sql, plan))
+
+    def assertPageCost(self, method, url, status, queries, max_size, **extra):
+        """Проверяет код ответа, точное число запросов к базе и размер ответа.
+
+        Кеш очищается перед запросом: число запросов соответствует первому
+        обращению к странице после изменения данных.
+        """
+        cache.clear()
+        with self.assertNumQueries(queries):
+            response = getattr(self.client, method)(url, **extra)
+            if response.streaming:
+                content = b"".join(response.streaming_content)
+            else:
+                content = response.content
+        self.assertEqual(response.status_code, status)
+        self.assertLessEqual(
+            len(content), max_size, "Размер ответа %s превышает лимит" % url
+        )
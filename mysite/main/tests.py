@@ -1,3 +1,628 @@
-from django.test import TestCase
+# main/tests.py
 
-# Create your tests here.
+import gzip
+import hashlib
+import importlib
+import json
+import re
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.templatetags.static import static
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from news.models import News, NewsCategory
+from portfolio.models import PortfolioCategory
+
+from reviews.models import Review
+from . import metrics
+from .models import Page, SiteSettings
+from .profiling import QueryBudgetExceeded
+from .testing import TEST_CACHES, TEST_STORAGES, SiteTestCase, seed_site
+from .thumbnails import delete_thumbnails, get_thumbnail, rendition_dir
+
+
+def make_image(size=(1200, 800), fmt="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class ThumbnailTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def test_renditions_for_each_density(self):
+        name = default_storage.save("news/photo.jpg", BytesIO(make_image()))
+        thumb = get_thumbnail(name, "card")
+
+        self.assertEqual((thumb.width, thumb.height), (400, 200))
+        self.assertIn("400x200c.jpg 1x", thumb.srcset)
+        self.assertIn("800x400c.jpg 2x", thumb.srcset)
+        self.assertIn("800x400c.webp 2x", thumb.webp_srcset)
+        _, files = default_storage.listdir(rendition_dir(name))
+        self.assertEqual(len(files), 4)
+
+    def test_sources_differing_by_extension(self):
+        jpeg = default_storage.save("news/photo.jpg", BytesIO(make_image()))
+        buffer = BytesIO()
+        Image.new("RGB", (1200, 800), "blue").save(buffer, "PNG")
+        png = default_storage.save("news/photo.png", buffer)
+        get_thumbnail(jpeg, "card")
+        png_thumb = get_thumbnail(png, "card")
+
+        self.assertNotEqual(rendition_dir(jpeg), rendition_dir(png))
+        # Копии второго файла сделаны из него, а не взяты у первого
+        webp = png_thumb.webp_srcset.split()[0].removeprefix(settings.MEDIA_URL)
+        with default_storage.open(webp) as f:
+            red, green, blue = Image.open(f).convert("RGB").getpixel((0, 0))
+        self.assertGreater(blue, red)
+
+        delete_thumbnails(jpeg)
+        _, files = default_storage.listdir(rendition_dir(png))
+        self.assertEqual(len(files), 4)
+
+    def test_small_source_is_not_upscaled(self):
+        name = default_storage.save(
+            "news/small.png", BytesIO(make_image((300, 100), "PNG"))
+        )
+        thumb = get_thumbnail(name, "card")
+
+        self.assertEqual((thumb.width, thumb.height), (200, 100))
+        self.assertNotIn("2x", thumb.srcset)
+
+    def test_missing_file_falls_back_to_original(self):
+        with self.assertLogs("main.thumbnails", "WARNING"):
+            thumb = get_thumbnail("news/missing.jpg", "card")
+
+        self.assertEqual(thumb.src, default_storage.url("news/missing.jpg"))
+        self.assertEqual(thumb.srcset, "")
+
+    def test_renditions_removed_with_file(self):
+        category = NewsCategory.objects.create(name="Category", slug="category")
+        news = News.objects.create(
+            title="News",
+            slug="news",
+            category=category,
+            image=SimpleUploadedFile("photo.jpg", make_image()),
+        )
+        get_thumbnail(news.image, "card")
+        directory = rendition_dir(news.image.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            news.delete()
+
+        self.assertFalse(default_storage.exists(directory))
+
+
+class CookieFreePageTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        cls.user = User.objects.create_user("visitor", password="secret-password")
+
+    def test_anonymous_page_does_not_touch_session(self):
+        response = self.client.get(reverse("news:list"))
+
+        self.assertFalse(response.wsgi_request.session.accessed)
+        self.assertEqual(response.cookies, {})
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertEqual(response["Cache-Control"], "public, max-age=300")
+
+    def test_logged_in_user_gets_same_public_page(self):
+        self.client.login(username="visitor", password="secret-password")
+
+        response = self.client.get(reverse("news:list"))
+
+        self.assertNotContains(response, "visitor")
+        self.assertEqual(response["Cache-Control"], "public, max-age=300")
+
+    def test_user_menu_fragment(self):
+        self.client.login(username="visitor", password="secret-password")
+
+        response = self.client.get(reverse("main:user_menu"))
+
+        self.assertContains(response, "visitor")
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(response.cookies["logged_in"].value, "1")
+
+    def test_response_with_messages_is_private(self):
+        response = self.client.post(
+            reverse("reviews:add"),
+            {
+                "full_name": "Visitor",
+                "phone": "+70000000000",
+                "email": "visitor@example.com",
+                "message": "Thanks",
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "модерацию")
+        self.assertIn("private", response["Cache-Control"])
+
+
+class SitemapTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = NewsCategory.objects.create(name="Category", slug="category")
+        for i in range(5):
+            News.objects.create(
+                title=f"News {i}",
+                slug=f"news-{i}",
+                category=cls.category,
+            )
+        News.objects.create(
+            title="Hidden",
+            slug="hidden",
+            category=cls.category,
+            is_active=False,
+        )
+        Page.objects.create(title="About", slug="about")
+        PortfolioCategory.objects.create(name="Sites", slug="sites")
+
+    def get_section(self, section, page):
+        url = reverse("sitemap_section", kwargs={"section": section, "page": page})
+        response = self.client.get(url)
+        if response.streaming:
+            return response, b"".join(response.streaming_content).decode()
+        return response, response.content.decode()
+
+    @override_settings(SITEMAP_LIMIT=2)
+    def test_index_splits_large_sections(self):
+        response = self.client.get(reverse("sitemap"))
+        content = response.content.decode()
+
+        self.assertEqual(response["Content-Type"], "application/xml; charset=utf-8")
+        self.assertIn("http://testserver/sitemap-news-3.xml", content)
+        self.assertNotIn("sitemap-news-4.xml", content)
+        self.assertIn("sitemap-pages-1.xml", content)
+        self.assertIn("sitemap-portfolio_categories-1.xml", content)
+        # Пустой раздел в индекс не попадает
+        self.assertNotIn("sitemap-portfolio-1.xml", content)
+
+        _, content = self.get_section("news", 3)
+        self.assertIn("http://testserver/news/news-4/", content)
+        self.assertEqual(content.count("<url>"), 1)
+        self.assertEqual(self.get_section("news", 4)[0].status_code, 404)
+
+    def test_section_streamed_then_cached(self):
+        response, content = self.get_section("news", 1)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(content.count("<url>"), 5)
+        self.assertNotIn("/news/hidden/", content)
+        self.assertIn("<lastmod>", content)
+
+        with self.assertNumQueries(0):
+            response, cached = self.get_section("news", 1)
+        self.assertFalse(response.streaming)
+        self.assertEqual(cached, content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            News.objects.filter(slug="hidden").get().delete()
+        response, _ = self.get_section("news", 1)
+        self.assertTrue(response.streaming)
+
+    def test_category_section_without_lastmod(self):
+        _, content = self.get_section("news_categories", 1)
+
+        self.assertIn("http://testserver/news/category/category/", content)
+        self.assertNotIn("<lastmod>", content)
+
+
+@override_settings(REQUEST_PROFILING_ENABLED=True)
+class RequestProfilingTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        category = NewsCategory.objects.create(name="Category", slug="category")
+        News.objects.create(title="News", slug="news", category=category)
+
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs("main.profiling", "INFO") as logs:
+            response = self.client.get(reverse("news:list"))
+
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=')
+        self.assertIn("total;dur=", timing)
+        record = logs.records[0]
+        self.assertEqual(record.view, "news:list")
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.template_ms, 0)
+        self.assertGreater(record.cache_misses, 0)
+
+        # Повторный запрос: версии и меню берутся из кеша
+        with self.assertLogs("main.profiling", "INFO") as logs:
+            self.client.get(reverse("news:list"))
+        self.assertLess(logs.records[0].db_queries, record.db_queries)
+        self.assertGreater(logs.records[0].cache_hits, record.cache_hits)
+
+    @override_settings(QUERY_BUDGETS={"news:detail": 1}, QUERY_BUDGET_RAISE=True)
+    def test_query_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded), self.assertLogs("main.profiling"):
+            self.client.get(reverse("news:detail", args=["news"]))
+
+    @override_settings(QUERY_BUDGETS={"news:detail": 1}, QUERY_BUDGET_RAISE=False)
+    def test_query_budget_logs(self):
+        with self.assertLogs("main.profiling", "WARNING") as logs:
+            response = self.client.get(reverse("news:detail", args=["news"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("news:detail", logs.output[0])
+
+
+class MetricsTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        NewsCategory.objects.create(name="Category", slug="category")
+        Review.objects.create(
+            full_name="Client", email="client@example.com", message="Text"
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir)
+        overrides = override_settings(
+            METRICS_ENABLED=True,
+            METRICS_DIR=self.metrics_dir,
+            REQUEST_PROFILING_ENABLED=False,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        # Показатели тестовых запросов не должны попасть в METRICS_DIR при
+        # завершении процесса
+        for series in (metrics._counters, metrics._histograms):
+            patcher = mock.patch.dict(series, clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_metrics_exposition(self):
+        self.client.get(reverse("news:list"))
+        # Показатели другого (уже завершённого) рабочего процесса
+        with open("%s/999999999.json" % self.metrics_dir, "w") as f:
+            json.dump(
+                {
+                    "pid": 999999999,
+                    "counters": {
+                        "django_requests_total": {'status="200",view="other:view"': 3}
+                    },
+                    "view_counter_pending": 10,
+                },
+                f,
+            )
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            'django_request_duration_seconds_bucket{view="news:list",le="+Inf"}', body
+        )
+        self.assertIn('django_request_db_queries_count{view="news:list"}', body)
+        self.assertIn('django_requests_total{status="200",view="other:view"} 3', body)
+        self.assertIn('reviews_queue_size{status="pending"} 1', body)
+        self.assertIn('tickets_queue_size{status="open"} 0', body)
+        self.assertIn("django_cache_hit_ratio ", body)
+        # Буфер просмотров завершённого процесса не учитывается
+        self.assertNotIn("view_counter_pending_objects 10", body)
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_page_cache_results(self):
+        self.client.get(reverse("news:list"))
+        self.client.get(reverse("news:list"))
+
+        body = metrics.render_metrics()
+        self.assertIn('django_page_cache_requests_total{result="hit"} 1.0', body)
+        self.assertIn('django_page_cache_requests_total{result="miss"} 1.0', body)
+
+    def test_totals_survive_worker_restart(self):
+        def finished_worker(name, requests):
+            with open("%s/%s.json" % (self.metrics_dir, name), "w") as f:
+                json.dump(
+                    {
+                        "pid": 999999999,
+                        "counters": {
+                            "django_requests_total": {
+                                'status="200",view="other:view"': requests
+                            }
+                        },
+                    },
+                    f,
+                )
+
+        sample = 'django_requests_total{status="200",view="other:view"} %s'
+        finished_worker("999999999-first", 3)
+        self.assertIn(sample % 3.0, metrics.render_metrics())
+
+        # Перезапущенный процесс получил тот же PID
+        finished_worker("999999999-second", 2)
+        self.assertIn(sample % 5.0, metrics.render_metrics())
+        self.assertIn(sample % 5.0, metrics.render_metrics())
+
+        # Файлы завершившихся процессов перенесены в сводный
+        files = [path.name for path in Path(self.metrics_dir).glob("*.json")]
+        self.assertEqual(files, [metrics.AGGREGATE_FILE])
+
+    def test_metrics_forbidden_for_remote_address(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.1")
+        self.assertEqual(response.status_code, 403)
+
+
+KB = 1024
+
+# Стоимость страниц на наполненной базе: (код ответа, запросов к базе,
+# максимальный размер ответа в байтах) для анонимного и вошедшего
+# пользователя. Число запросов - при пустом кеше. Если изменение шаблона или
+# представления меняет число запросов, значение правится здесь осознанно.
+PAGE_COSTS = {
+    "main:index": ("get", (), (200, 4, 15 * KB), (200, 4, 15 * KB)),
+    "main:page_detail": ("get", ("page",), (200, 5, 15 * KB), (200, 5, 15 * KB)),
+    "main:user_menu": ("get", (), (200, 1, 1 * KB), (200, 3, 2 * KB)),
+    "news:list": ("get", (), (200, 6, 51 * KB), (200, 6, 51 * KB)),
+    "news:category": ("get", ("news_category",), (200, 7, 38 * KB), (200, 7, 38 * KB)),
+    "news:feed_rss": ("get", (), (200, 1, 7 * KB), (200, 1, 7 * KB)),
+    "news:feed_atom": ("get", (), (200, 1, 9 * KB), (200, 1, 9 * KB)),
+    "news:category_feed_rss": (
+        "get",
+        ("news_category",),
+        (200, 2, 7 * KB),
+        (200, 2, 7 * KB),
+    ),
+    "news:category_feed_atom": (
+        "get",
+        ("news_category",),
+        (200, 2, 9 * KB),
+        (200, 2, 9 * KB),
+    ),
+    "news:detail": ("get", ("news",), (200, 6, 21 * KB), (200, 6, 21 * KB)),
+    "portfolio:list": ("get", (), (200, 6, 32 * KB), (200, 6, 32 * KB)),
+    "portfolio:category": (
+        "get",
+        ("portfolio_category",),
+        (200, 7, 26 * KB),
+        (200, 7, 26 * KB),
+    ),
+    "portfolio:detail": ("get", ("work",), (200, 6, 16 * KB), (200, 6, 16 * KB)),
+    "reviews:list": ("get", (), (200, 5, 59 * KB), (200, 5, 59 * KB)),
+    "reviews:add": ("get", (), (200, 4, 15 * KB), (200, 4, 15 * KB)),
+    "accounts:register": ("get", (), (200, 4, 21 * KB), (200, 4, 21 * KB)),
+    "accounts:login": ("get", (), (200, 4, 27 * KB), (302, 2, 0)),
+    "accounts:logout": ("post", (), (302, 0, 0), (302, 4, 0)),
+    "accounts:logout_confirm": ("get", (), (200, 4, 15 * KB), (200, 6, 15 * KB)),
+    "accounts:profile": ("get", (), (302, 0, 0), (200, 7, 23 * KB)),
+    "accounts:profile_edit": ("get", (), (302, 0, 0), (200, 6, 23 * KB)),
+    "accounts:profile_update": ("get", (), (302, 0, 0), (200, 6, 21 * KB)),
+    "accounts:password_change": ("get", (), (302, 0, 0), (200, 6, 19 * KB)),
+    "accounts:ticket_list": ("get", (), (302, 0, 0), (200, 7, 77 * KB)),
+    "accounts:create_ticket": ("get", (), (302, 0, 0), (200, 6, 18 * KB)),
+    "accounts:ticket_detail": ("get", ("ticket",), (302, 0, 0), (200, 11, 22 * KB)),
+}
+
+
+@override_settings(
+    # Счётчики просмотров не записываются в базу посреди проверяемого запроса
+    VIEW_COUNTER_FLUSH_INTERVAL=60 * 60,
+    VIEW_COUNTER_MAX_PENDING=10**6,
+)
+class PageCostTests(SiteTestCase):
+    """Число запросов к базе и размер ответа для каждого маршрута сайта."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = seed_site()
+
+    def url(self, name, args):
+        objects = [getattr(self.site, arg) for arg in args]
+        return reverse(name, args=[getattr(obj, "slug", obj.pk) for obj in objects])
+
+    def test_every_named_url_is_covered(self):
+        names = {
+            "%s:%s" % (app, pattern.name)
+            for app in ("main", "news", "portfolio", "reviews", "accounts")
+            for pattern in importlib.import_module("%s.urls" % app).urlpatterns
+            if pattern.name
+        }
+        self.assertEqual(names, set(PAGE_COSTS))
+
+    def test_anonymous(self):
+        for name, (method, args, cost, _) in PAGE_COSTS.items():
+            with self.subTest(name):
+                self.assertPageCost(method, self.url(name, args), *cost)
+
+    def test_authenticated(self):
+        for name, (method, args, _, cost) in PAGE_COSTS.items():
+            with self.subTest(name):
+                self.client.force_login(self.site.user)
+                self.assertPageCost(method, self.url(name, args), *cost)
+
+
+class FragmentCacheTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.settings = SiteSettings.objects.create(logo_text="Site", motto="Motto")
+        cls.page = Page.objects.create(title="About", slug="about")
+
+    def test_layout_fragments_follow_versions(self):
+        self.assertContains(self.client.get("/"), "Motto")
+
+        # Изменение без сигналов не сбрасывает версии: блоки берутся из кеша
+        SiteSettings.objects.update(motto="Changed")
+        Page.objects.update(title="Company")
+        response = self.client.get("/")
+        self.assertContains(response, "Motto")
+        self.assertContains(response, "About")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.refresh_from_db()
+            self.settings.save()
+            self.page.refresh_from_db()
+            self.page.save()
+        response = self.client.get("/")
+        self.assertContains(response, "Changed")
+        self.assertContains(response, "Company")
+
+
+class StaticPipelineTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        source = tempfile.mkdtemp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, root)
+        (Path(source) / "css").mkdir()
+        (Path(source) / "css" / "site.css").write_text(
+            "/* Оформление */\nbody {\n    color: #333;\n    margin: 0 auto;\n}\n"
+            + ".logo { background: url('../logo.png'); }\n" * 20
+        )
+        (Path(source) / "logo.png").write_bytes(make_image((400, 300), "PNG"))
+        static = override_settings(
+            STATIC_ROOT=root,
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STORAGES={
+                **settings.STORAGES,
+                "staticfiles": {
+                    "BACKEND": "main.storage.CompressedManifestStaticFilesStorage"
+                },
+            },
+        )
+        static.enable()
+        self.addCleanup(static.disable)
+        self.root = Path(root)
+
+    def test_collectstatic_writes_hashed_compressed_files(self):
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+        css_url = static("css/site.css")
+        css = (self.root / css_url.removeprefix(settings.STATIC_URL)).read_bytes()
+        self.assertNotIn(b"/*", css)
+        self.assertIn(b"body{color:#333;margin:0 auto}", css)
+        # Ссылки внутри CSS ведут на файлы с хешем
+        self.assertIn(static("logo.png").rsplit("/", 1)[1].encode(), css)
+        # Хеш в имени - от сжатого содержимого
+        self.assertIn(".%s.css" % hashlib.md5(css).hexdigest()[:12], css_url)
+        gz = self.root / (css_url.removeprefix(settings.STATIC_URL) + ".gz")
+        self.assertEqual(gzip.decompress(gz.read_bytes()), css)
+
+        webp_url = static("logo.webp")
+        self.assertRegex(webp_url, r"logo\.[0-9a-f]{12}\.webp$")
+        webp = self.root / webp_url.removeprefix(settings.STATIC_URL)
+        self.assertEqual(Image.open(webp).format, "WEBP")
+        self.assertIn(
+            ".%s.webp" % hashlib.md5(webp.read_bytes()).hexdigest()[:12], webp_url
+        )
+
+
+@override_settings(FILE_SERVING_ENABLED=True)
+class FileServingTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        static_root = tempfile.mkdtemp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        self.addCleanup(shutil.rmtree, media_root)
+        self.css = b"body{color:#333}\n" * 100
+        (Path(static_root) / "site.css").write_bytes(self.css)
+        (Path(static_root) / "site.css.gz").write_bytes(gzip.compress(self.css))
+        self.media_root = Path(media_root)
+        roots = override_settings(STATIC_ROOT=static_root, MEDIA_ROOT=media_root)
+        roots.enable()
+        self.addCleanup(roots.disable)
+
+    def test_precompressed_variant_and_etag(self):
+        response = self.client.get("/static/site.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.css)
+        self.assertEqual(response["Content-Type"], "text/css; charset=utf-8")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+        response = self.client.get(
+            "/static/site.css", headers={"Accept-Encoding": "gzip, br;q=0"}
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css; charset=utf-8")
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), self.css)
+        self.assertEqual(int(response["Content-Length"]), len(body))
+
+        response = self.client.get(
+            "/static/site.css",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        response = self.client.get("/static/site.css", headers={"Range": "bytes=5-9"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 5-9/%d" % len(self.css))
+        self.assertEqual(b"".join(response.streaming_content), self.css[5:10])
+
+        response = self.client.get("/static/site.css", headers={"Range": "bytes=-4"})
+        self.assertEqual(b"".join(response.streaming_content), self.css[-4:])
+
+        response = self.client.get(
+            "/static/site.css", headers={"Range": "bytes=%d-" % len(self.css)}
+        )
+        self.assertEqual(response.status_code, 416)
+
+    def test_media_uploaded_after_start(self):
+        self.assertEqual(self.client.get("/media/photo.jpg").status_code, 404)
+        (self.media_root / "photo.jpg").write_bytes(make_image((40, 30)))
+
+        response = self.client.get("/media/photo.jpg")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(self.client.get("/media/../db.sqlite3").status_code, 404)
+
+
+class SiteSettingsTests(SiteTestCase):
+    def test_missing_settings_are_not_created_on_read(self):
+        with self.assertNumQueries(1):
+            settings = SiteSettings.load()
+        self.assertIsNone(settings.pk)
+        self.assertFalse(SiteSettings.objects.exists())
+        self.assertEqual(self.client.get("/").status_code, 200)
+        self.assertFalse(SiteSettings.objects.exists())
+
+
+# Копия базы снимается через backup API, который ждёт завершения открытой
+# транзакции TestCase
+@override_settings(CACHES=TEST_CACHES, STORAGES=TEST_STORAGES, METRICS_ENABLED=False)
+class BenchmarkSqliteTests(TransactionTestCase):
+    def test_short_run_reads_news_list(self):
+        out = StringIO()
+        call_command(
+            "benchmark_sqlite",
+            duration=0.2,
+            readers=1,
+            writers=1,
+            news=5,
+            stdout=out,
+        )
+
+        reads = re.findall(r"чтения: (\d+) .*ошибок: (\d+)", out.getvalue())
+        self.assertEqual(len(reads), 2)
+        for count, errors in reads:
+            self.assertGreater(int(count), 0)
+            self.assertEqual(errors, "0")
+        # Новости добавляются только в копии базы
+        self.assertFalse(News.objects.exists())
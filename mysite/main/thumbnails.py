@@ -0,0 +1,195 @@
+# main/thumbnails.py
+
+import hashlib
+import logging
+import os
+import posixpath
+from collections import namedtuple
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Каталог уменьшенных копий внутри MEDIA_ROOT
+THUMBNAIL_ROOT = "thumbs"
+THUMBNAIL_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+# Ошибку (например, удалённый файл) запоминаем ненадолго
+THUMBNAIL_ERROR_TIMEOUT = 60 * 5
+
+# Размеры копий: (ширина, высота) в CSS-пикселях, crop - обрезка по размеру
+# (иначе вписывание), densities - плотности экрана для srcset.
+# Ноль в размере означает «не ограничивать».
+DEFAULT_THUMBNAIL_PRESETS = {
+    "card": {"size": (400, 200), "crop": True, "densities": (1, 2)},
+    "category": {"size": (360, 180), "crop": True, "densities": (1, 2)},
+    "detail": {"size": (900, 0), "crop": False, "densities": (1, 2)},
+    "logo": {"size": (0, 40), "crop": False, "densities": (1, 2)},
+}
+
+# Уменьшенная копия для шаблона: src и размеры для <img>, srcset для
+# исходного формата и для WebP (<source type="image/webp">)
+Thumbnail = namedtuple("Thumbnail", ["src", "width", "height", "srcset", "webp_srcset"])
+
+
+def get_presets():
+    """Возвращает размеры копий с учётом настройки ``THUMBNAIL_PRESETS``."""
+    return {**DEFAULT_THUMBNAIL_PRESETS, **getattr(settings, "THUMBNAIL_PRESETS", {})}
+
+
+def _cache_key(name, preset):
+    digest = hashlib.md5(("%s:%s" % (name, preset)).encode()).hexdigest()
+    return "main:thumb:%s" % digest
+
+
+def rendition_dir(name):
+    """Каталог копий исходного файла: ``thumbs/<путь к файлу>``.
+
+    Имя файла берётся вместе с расширением: у ``photo.jpg`` и ``photo.png``
+    разные каталоги копий.
+    """
+    return posixpath.join(THUMBNAIL_ROOT, name)
+
+
+def get_thumbnail(file, preset):
+    """Возвращает уменьшенные копии изображения для шаблона.
+
+    Копии создаются при первом обращении, сохраняются в ``MEDIA_ROOT/thumbs``
+    и запоминаются в кеше, поэтому следующие запросы не открывают файлы.
+    Если изображение не удаётся прочитать, возвращается исходный URL без
+    srcset.
+
+    Args:
+        file: Поле ImageField (FieldFile) или имя файла в хранилище.
+        preset (str): Имя размера из ``get_presets()``.
+
+    Returns:
+        Thumbnail | None: Копии изображения или None, если файла нет.
+    """
+    name = getattr(file, "name", file)
+    if not name:
+        return None
+
+    key = _cache_key(name, preset)
+    thumbnail = cache.get(key)
+    if thumbnail is None:
+        try:
+            thumbnail = generate_thumbnail(name, get_presets()[preset])
+            timeout = THUMBNAIL_CACHE_TIMEOUT
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+            logger.warning("Не удалось создать копии изображения %s", name)
+            thumbnail = Thumbnail(default_storage.url(name), None, None, "", "")
+            timeout = THUMBNAIL_ERROR_TIMEOUT
+        cache.set(key, thumbnail, timeout)
+    return thumbnail
+
+
+def _target_size(source_size, size, crop, density):
+    """Размер копии для плотности экрана без увеличения исходника."""
+    source_width, source_height = source_size
+    width, height = size[0] * density, size[1] * density
+    if crop:
+        scale = min(1, source_width / width, source_height / height)
+        return round(width * scale), round(height * scale)
+    scales = [1]
+    if width:
+        scales.append(width / source_width)
+    if height:
+        scales.append(height / source_height)
+    scale = min(scales)
+    return max(1, round(source_width * scale)), max(1, round(source_height * scale))
+
+
+def _save(image, name, target, crop, fmt):
+    """Сохраняет копию в хранилище, если её ещё нет, и возвращает URL."""
+    if not default_storage.exists(name):
+        if crop:
+            resized = ImageOps.fit(image, target, Image.LANCZOS)
+        else:
+            resized = image.resize(target, Image.LANCZOS)
+        buffer = BytesIO()
+        if fmt == "JPEG":
+            resized.convert("RGB").save(
+                buffer, "JPEG", quality=82, optimize=True, progressive=True
+            )
+        elif fmt == "WEBP":
+            resized.save(buffer, "WEBP", quality=80, method=4)
+        else:
+            resized.save(buffer, fmt, optimize=True)
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return default_storage.url(name)
+
+
+def generate_thumbnail(name, preset):
+    """Создаёт недостающие копии изображения для всех плотностей экрана.
+
+    Args:
+        name (str): Имя исходного файла в хранилище.
+        preset (dict): Размер копий (см. ``DEFAULT_THUMBNAIL_PRESETS``).
+
+    Returns:
+        Thumbnail: URL и размеры копий.
+    """
+    crop = preset["crop"]
+    with default_storage.open(name) as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    # Прозрачность сохраняем в PNG, остальное - в JPEG
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    fmt, ext = ("PNG", "png") if has_alpha else ("JPEG", "jpg")
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    directory = rendition_dir(name)
+    urls, srcset, webp_srcset, sizes = [], [], [], []
+    for density in preset["densities"]:
+        target = _target_size(image.size, preset["size"], crop, density)
+        # Исходник меньше копии для этой плотности - она не нужна
+        if target in sizes:
+            continue
+        sizes.append(target)
+        base = posixpath.join(directory, "%dx%d%s" % (*target, "c" if crop else ""))
+        url = _save(image, "%s.%s" % (base, ext), target, crop, fmt)
+        webp_url = _save(image, "%s.webp" % base, target, crop, "WEBP")
+        urls.append(url)
+        srcset.append("%s %sx" % (url, density))
+        webp_srcset.append("%s %sx" % (webp_url, density))
+
+    width, height = sizes[0]
+    return Thumbnail(
+        src=urls[0],
+        width=width,
+        height=height,
+        srcset=", ".join(srcset),
+        webp_srcset=", ".join(webp_srcset),
+    )
+
+
+def delete_thumbnails(name):
+    """Удаляет все копии исходного файла и их записи в кеше.
+
+    Args:
+        name (str): Имя исходного файла в хранилище.
+    """
+    if not name:
+        return
+    cache.delete_many([_cache_key(name, preset) for preset in get_presets()])
+
+    directory = rendition_dir(name)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        default_storage.delete(posixpath.join(directory, filename))
+    try:
+        # Пустой каталог копий больше не нужен
+        os.rmdir(default_storage.path(directory))
+    except (NotImplementedError, OSError):
+        pass
@@ -8,4 +8,5 @@ app_name = "main"
 urlpatterns = [
     path("", views.index, name="index"),
     path("page/<slug:slug>/", views.page_detail, name="page_detail"),
+    path("user-menu/", views.user_menu, name="user_menu"),
 ]
@@ -0,0 +1,9 @@
+# main/urls_async.py
+"""Маршруты main для ASGI: те же адреса, асинхронные представления."""
+
+from .asgi import with_async_views
+from . import async_views, urls
+
+app_name = urls.app_name
+
+urlpatterns = with_async_views(urls.urlpatterns, async_views)
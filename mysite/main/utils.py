@@ -0,0 +1,41 @@
+# main/utils.py
+
+import html
+import re
+
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Границы блоков, после которых при удалении тегов нужен пробел
+BLOCK_BOUNDARY_RE = re.compile(
+    r"(<br\s*/?>|</(?:p|div|li|h[1-6]|blockquote|td|th|tr)>)", re.IGNORECASE
+)
+
+
+def html_to_text(text):
+    """Превращает HTML-текст CKEditor в обычный текст.
+
+    Удаляет теги, раскрывает HTML-сущности (``&nbsp;`` и т.п.) и схлопывает
+    пробелы, сохраняя границы абзацев.
+
+    Args:
+        text (str): Исходный текст, возможно с HTML-разметкой.
+
+    Returns:
+        str: Текст без разметки.
+    """
+    text = BLOCK_BOUNDARY_RE.sub(r"\1 ", text or "")
+    return " ".join(html.unescape(strip_tags(text)).split())
+
+
+def make_excerpt(text, words):
+    """Готовит короткий анонс из HTML-текста CKEditor.
+
+    Args:
+        text (str): Исходный текст, возможно с HTML-разметкой.
+        words (int): Максимальное количество слов.
+
+    Returns:
+        str: Анонс без разметки, обрезанный до заданного числа слов.
+    """
+    return Truncator(html_to_text(text)).words(words, truncate="…")
@@ -1,22 +1,130 @@
 # main/views.py
 
+import hashlib
+
+from django.core.cache import cache
 from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse
+from django.conf import settings as django_settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_control, never_cache
+from .caching import get_version
+from .conditional import ConditionalPage
+from .metrics import render_metrics
 from .models import SiteSettings, Page
+from .sitemaps import (
+    SITEMAP_CACHE_TIMEOUT,
+    SITEMAP_SECTIONS,
+    cache_while_streaming,
+    iter_sitemap_section,
+    render_sitemap_index,
+    section_chunks,
+    sitemap_index_versions,
+)
 
 
+@cache_control(public=True, max_age=60 * 5)
 def index(request):
-    settings = SiteSettings.objects.first()
+    settings = SiteSettings.load()
     if settings and settings.site_closed:
         return render(request, "main/site_closed.html", {"settings": settings})
 
     return render(request, "main/index.html")
 
 
+@cache_control(public=True, max_age=60 * 10)
 def page_detail(request, slug):
-    settings = SiteSettings.objects.first()
+    settings = SiteSettings.load()
     if settings and settings.site_closed:
         return render(request, "main/site_closed.html", {"settings": settings})
 
     page = get_object_or_404(Page, slug=slug, show_on_site=True)
-    return render(request, "main/page_detail.html", {"page": page})
+
+    conditional = ConditionalPage(request, page.updated_at)
+    if (response := conditional.not_modified()) is not None:
+        return response
+    return conditional.finish(render(request, "main/page_detail.html", {"page": page}))
+
+
+@never_cache
+def user_menu(request):
+    """Меню пользователя в шапке сайта.
+
+    Публичные страницы одинаковы для всех посетителей и не читают сессию, а
+    меню вошедшего пользователя подгружается отдельным запросом (script.js).
+    """
+    return render(request, "main/_user_menu.html")
+
+
+def _site_url(request):
+    """Схема и домен сайта для абсолютных адресов карты сайта."""
+    return "%s://%s" % (request.scheme, request.get_host())
+
+
+@cache_control(public=True, max_age=60 * 60)
+def sitemap_index(request):
+    """Индекс карты сайта со ссылками на части разделов (main.sitemaps).
+
+    Готовый XML хранится в кеше до смены версии любого из разделов.
+    """
+    base_url = _site_url(request)
+    key = "main:sitemap:index:%s:%s" % (
+        hashlib.md5(base_url.encode()).hexdigest(),
+        sitemap_index_versions(),
+    )
+    content = cache.get(key)
+    if content is None:
+        content = render_sitemap_index(base_url)
+        cache.set(key, content, SITEMAP_CACHE_TIMEOUT)
+    return HttpResponse(content, content_type="application/xml; charset=utf-8")
+
+
+@cache_control(public=True, max_age=60 * 60)
+def sitemap_section(request, section, page):
+    """Часть карты сайта раздела ``section`` с номером ``page``.
+
+    Первый ответ после изменения раздела отдаётся потоком прямо из выборки,
+    а по его окончании сохраняется в кеш до смены версии раздела.
+    """
+    sitemap = SITEMAP_SECTIONS.get(section)
+    if sitemap is None:
+        raise Http404("Раздел карты сайта не найден")
+    chunks = section_chunks(section, sitemap)
+    if not 1 <= page <= len(chunks):
+        raise Http404("Часть карты сайта не найдена")
+
+    base_url = _site_url(request)
+    key = "main:sitemap:%s:%d:%s:%s" % (
+        section,
+        page,
+        hashlib.md5(base_url.encode()).hexdigest(),
+        get_version(sitemap.version),
+    )
+    content_type = "application/xml; charset=utf-8"
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type=content_type)
+
+    start = chunks[page - 1][0]
+    stop = chunks[page][0] if page < len(chunks) else None
+    return StreamingHttpResponse(
+        cache_while_streaming(
+            iter_sitemap_section(base_url, sitemap, start, stop), key
+        ),
+        content_type=content_type,
+    )
+
+
+@never_cache
+def metrics(request):
+    """Метрики в формате Prometheus, суммированные по всем рабочим процессам.
+
+    Доступны только с адресов из ``METRICS_ALLOWED_IPS``.
+    """
+    if not getattr(django_settings, "METRICS_ENABLED", False):
+        raise Http404
+    allowed = getattr(django_settings, "METRICS_ALLOWED_IPS", ())
+    if request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponse(status=403)
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# Публичные страницы под ASGI обслуживают асинхронные представления
+# (ASGI_ROOT_URLCONF), синхронные остаются для WSGI/Passenger
+from main.asgi import SiteASGIHandler  # noqa: E402
+
+application = SiteASGIHandler()
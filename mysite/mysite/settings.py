@@ -51,10 +51,21 @@ INSTALLED_APPS = [
     "portfolio.apps.PortfolioConfig",
     "reviews.apps.ReviewsConfig",
     "accounts.apps.AccountsConfig",
+    "search.apps.SearchConfig",
 ]
 
 MIDDLEWARE = [
+    # Первым: файлы отдаются без сессий, профилирования и метрик
+    "main.middleware.StaticFilesMiddleware",
+    # Учитывает время и запросы всех остальных middleware
+    "main.middleware.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Отвечает 304 и на страницы, отданные из кеша страниц
+    "django.middleware.http.ConditionalGetMiddleware",
+    "main.middleware.AnonymousPageCacheMiddleware",
+    # Ответы, прочитавшие сессию или ставящие cookie, не кешируются публично
+    "main.middleware.PublicCacheGuardMiddleware",
+    "main.middleware.SessionHintMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -64,13 +75,26 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = "mysite.urls"
+# Маршруты с асинхронными представлениями для ASGI (main.asgi.SiteASGIHandler)
+ASGI_ROOT_URLCONF = "mysite.urls_async"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Шаблоны Django с учётом времени рендеринга (main.profiling)
+        "BACKEND": "main.profiling.ProfiledDjangoTemplates",
         "DIRS": [os.path.join(BASE_DIR, "templates")],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Скомпилированные шаблоны хранятся в памяти процесса. В режиме
+            # отладки кеш сбрасывается при изменении файлов шаблонов
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -78,6 +102,7 @@ TEMPLATES = [
                 "django.contrib.messages.context_processors.messages",
                 "main.context_processors.site_settings",
                 "main.context_processors.menu_items",
+                "main.context_processors.session_hint",
                 "news.context_processors.latest_news",
             ],
         },
@@ -90,13 +115,133 @@ WSGI_APPLICATION = "mysite.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Режим WAL позволяет читать во время записи счетчиков просмотров,
+# synchronous=NORMAL в режиме WAL не теряет целостность базы при сбое.
+# Режим журнала сохраняется в самом файле базы и создаёт рядом файлы
+# -wal/-shm, поэтому он включается только на сервере переменной окружения
+# DJANGO_SQLITE_WAL=1, а база в репозитории остаётся в режиме DELETE.
+SQLITE_WAL = os.environ.get("DJANGO_SQLITE_WAL") == "1"
+SQLITE_WAL_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+
+# Профиль SQLite для продакшена. Параметры применяются к каждому новому
+# соединению. Сравнение с настройками по умолчанию: manage.py benchmark_sqlite
+SQLITE_PRAGMAS = {
+    **(SQLITE_WAL_PRAGMAS if SQLITE_WAL else {}),
+    "mmap_size": 128 * 1024 * 1024,  # 128 МБ файла базы читаются через mmap
+    "cache_size": -20000,  # Отрицательное значение - размер в КиБ (~20 МБ)
+    "busy_timeout": 5000,  # Ожидание блокировки записи, мс
+    "temp_store": "MEMORY",
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Соединение переиспользуется рабочим процессом между запросами
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name} = {value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Транзакции сразу берут блокировку записи, чтобы не получать
+            # "database is locked" при повышении блокировки внутри транзакции
+            "transaction_mode": "IMMEDIATE",
+        },
+    }
+}
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Файловый кеш общий для всех рабочих процессов Passenger, поэтому через него
+# передаются версии закешированных данных (см. main/caching.py).
+
+CACHES = {
+    "default": {
+        # Файловый кеш с учётом попаданий и промахов (main.profiling)
+        "BACKEND": "main.profiling.ProfiledFileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, "cache"),
     }
 }
 
+# Кеш готовых страниц для анонимных посетителей (main.middleware)
+PAGE_CACHE_ENABLED = False
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Буферизация счетчиков просмотров (main.counters): запись в базу не чаще
+# одного раза за интервал или при накоплении заданного числа объектов
+VIEW_COUNTER_FLUSH_INTERVAL = 60
+VIEW_COUNTER_MAX_PENDING = 500
+
+# Нумерованные страницы вместо курсорной пагинации в списках (main.pagination)
+PAGINATION_NUMBERED = False
+
+# Профилирование запросов: заголовок Server-Timing и строка JSON в журнале
+# main.profiling для каждого запроса (main.middleware.RequestProfilingMiddleware).
+# Включено в режиме отладки, на сервере - переменной окружения
+# DJANGO_REQUEST_PROFILING=1
+REQUEST_PROFILING_ENABLED = DEBUG or os.environ.get("DJANGO_REQUEST_PROFILING") == "1"
+
+# Наибольшее число запросов к базе для маршрута при холодном кеше. Списки
+# оставляют запас на COUNT нумерованных страниц, детальные страницы - на запись
+# пачки счетчиков просмотров (main.counters).
+# Превышение пишется в журнал, а в режиме отладки вызывает исключение.
+QUERY_BUDGETS = {
+    "main:index": 4,
+    "main:page_detail": 5,
+    "news:list": 7,
+    "news:category": 8,
+    "news:detail": 9,
+    "portfolio:list": 7,
+    "portfolio:category": 8,
+    "portfolio:detail": 9,
+    "reviews:list": 5,
+    "search:results": 6,
+}
+QUERY_BUDGET_RAISE = DEBUG
+
+# Кеш готового HTML шапки, главного блока и подвала ({% cache_fragment %}),
+# сбрасывается при изменении настроек сайта и меню
+FRAGMENT_CACHE_ENABLED = True
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Срок кеша статистики в профиле пользователя (accounts.stats), секунды
+PROFILE_STATS_TIMEOUT = 60
+
+# Метрики Prometheus (main.metrics). Каждый рабочий процесс Passenger
+# сохраняет свои показатели в общий каталог, /metrics суммирует их.
+# Каталог очищают при развёртывании.
+METRICS_ENABLED = True
+METRICS_DIR = os.path.join(BASE_DIR, "metrics")
+METRICS_WRITE_INTERVAL = 10
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "main.profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+
+# Пользователь загружается вместе с профилем (accounts.backends). Второй
+# бэкенд не подключается: неудачный вход проверял бы пароль дважды. Сессии,
+# созданные стандартным ModelBackend (путь бэкенда хранится в сессии),
+# после развёртывания потребуют повторного входа
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.ProfileModelBackend",
+]
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,7 +274,13 @@ LOGIN_REDIRECT_URL = "/accounts/profile/"
 LOGIN_URL = "/accounts/login/"
 LOGOUT_REDIRECT_URL = "/"
 # Настройки сообщений
-MESSAGE_STORAGE = "django.contrib.messages.storage.session.SessionStorage"
+# Сообщения хранятся в cookie, чтобы анонимные страницы не читали сессию
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+# Cookie-подсказка для JavaScript: посетитель вошёл, меню пользователя в шапке
+# нужно подгрузить отдельным запросом (main.middleware.SessionHintMiddleware)
+SESSION_HINT_COOKIE_NAME = "logged_in"
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
@@ -139,8 +290,26 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "static"),
 ]
 
+# collectstatic добавляет к именам файлов хеш содержимого, сжимает CSS/JS,
+# сохраняет копии .gz/.br и WebP/AVIF (main.storage). Файлы с хешем
+# веб-сервер отдаёт с Cache-Control: max-age=31536000, immutable и выбирает
+# заранее сжатую копию по Accept-Encoding. После обновления статики на
+# сервере нужно запустить collectstatic: без манифеста {% static %} при
+# DEBUG = False вызывает ошибку.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "main.storage.CompressedManifestStaticFilesStorage"},
+}
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Раздача STATIC_ROOT и MEDIA_ROOT приложением (main.fileserving), если
+# веб-сервер хостинга их не отдаёт: sendfile через wsgi.file_wrapper, Range,
+# ETag и сжатые копии .br/.gz из collectstatic
+FILE_SERVING_ENABLED = True
+# Cache-Control для медиафайлов и статики без хеша в имени, секунды
+FILE_SERVING_MAX_AGE = 60 * 60
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
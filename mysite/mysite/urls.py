@@ -14,6 +14,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+
 # mysite/urls.py
 
 from django.contrib import admin
@@ -21,14 +22,26 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from main import views as main_views
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # Карта сайта вне пространства имён main: кеш страниц раздела main
+    # зависит только от версии "pages" (main.caching.PAGE_DEPENDENCIES)
+    path("sitemap.xml", main_views.sitemap_index, name="sitemap"),
+    path(
+        "sitemap-<slug:section>-<int:page>.xml",
+        main_views.sitemap_section,
+        name="sitemap_section",
+    ),
+    path("metrics", main_views.metrics, name="metrics"),
     path("ckeditor5/", include("django_ckeditor_5.urls")),
     path("", include("main.urls")),
     path("news/", include("news.urls")),
     path("portfolio/", include("portfolio.urls")),
     path("reviews/", include("reviews.urls")),
     path("accounts/", include("accounts.urls")),
+    path("search/", include("search.urls")),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,25 @@
+# mysite/urls_async.py
+"""Корневые маршруты для ASGI (настройка ASGI_ROOT_URLCONF).
+
+Разделы с асинхронными представлениями подключаются из ``<app>.urls_async``,
+остальные маршруты берутся из mysite/urls.py без изменений.
+"""
+
+from django.urls import include, path
+
+from . import urls
+
+urlpatterns = [
+    path("", include("main.urls_async")),
+    path("news/", include("news.urls_async")),
+    path("portfolio/", include("portfolio.urls_async")),
+    path("reviews/", include("reviews.urls_async")),
+]
+
+_async_namespaces = {pattern.namespace for pattern in urlpatterns}
+
+urlpatterns += [
+    pattern
+    for pattern in urls.urlpatterns
+    if getattr(pattern, "namespace", None) not in _async_namespaces
+]
@@ -0,0 +1,93 @@
+# news/async_views.py
+"""Асинхронные варианты представлений news.views для ASGI (news/urls_async.py)"""
+
+import asyncio
+
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.cache import cache_control
+
+from main.asgi import alist, arender
+from main.caching import aget_page_versions
+from main.conditional import ConditionalPage, alatest_update
+from main.menu import aget_menu
+from main.pagination import apaginate
+from .models import News, NewsCategory
+
+
+@cache_control(public=True, max_age=60 * 5)
+async def news_list(request):
+    """Список активных новостей (см. news.views.news_list)"""
+    news_list = News.objects.active().for_listing()
+
+    # Время изменения списка и версии раздела читаются одновременно
+    updated_at, versions = await asyncio.gather(
+        alatest_update(news_list, "news"),
+        aget_page_versions(request.resolver_match.namespace),
+    )
+    conditional = ConditionalPage(request, updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    page_obj, menu = await asyncio.gather(
+        apaginate(request, news_list, 20, cache_version="news"), aget_menu()
+    )
+
+    context = {
+        "news_list": page_obj,  # Новости текущей страницы
+        "categories": menu.news_categories,  # Список категорий для меню
+    }
+    return conditional.finish(await arender(request, "news/list.html", context))
+
+
+@cache_control(public=True, max_age=60 * 10)
+async def news_detail(request, slug):
+    """Детальная страница новости (см. news.views.news_detail)"""
+    news = await aget_object_or_404(
+        News.objects.active().select_related("category"), slug=slug
+    )
+
+    # Увеличение счетчика просмотров (в том числе для ответа 304)
+    await news.aincrement_views()
+
+    versions = await aget_page_versions(request.resolver_match.namespace)
+    conditional = ConditionalPage(request, news.updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    # Похожие новости и категории для сайдбара не зависят друг от друга
+    similar_news, menu = await asyncio.gather(
+        alist(News.objects.similar_to(news)), aget_menu()
+    )
+
+    context = {
+        "news": news,  # Текущая новость
+        "similar_news": similar_news,  # Похожие новости для сайдбара
+        "categories": menu.news_categories,  # Категории для сайдбара
+    }
+    return conditional.finish(await arender(request, "news/detail.html", context))
+
+
+@cache_control(public=True, max_age=60 * 5)
+async def news_by_category(request, slug):
+    """Новости категории (см. news.views.news_by_category)"""
+    category = await aget_object_or_404(NewsCategory, slug=slug, is_active=True)
+    news_list = News.objects.active().for_listing().filter(category=category)
+
+    updated_at, versions = await asyncio.gather(
+        alatest_update(news_list, "news"),
+        aget_page_versions(request.resolver_match.namespace),
+    )
+    conditional = ConditionalPage(request, updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    page_obj, menu = await asyncio.gather(
+        apaginate(request, news_list, 20, cache_version="news"), aget_menu()
+    )
+
+    context = {
+        "category": category,  # Текущая категория
+        "news_list": page_obj,  # Новости категории текущей страницы
+        "categories": menu.news_categories,  # Список категорий для меню
+    }
+    return conditional.finish(await arender(request, "news/category.html", context))
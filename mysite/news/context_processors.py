@@ -3,5 +3,5 @@ from .models import News
 
 
 def latest_news(request):
-    latest_news = News.objects.filter(is_active=True).order_by("-created_at")[:3]
+    latest_news = News.objects.active().for_listing().order_by("-created_at")[:3]
     return {"latest_news": latest_news}
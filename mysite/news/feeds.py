@@ -0,0 +1,100 @@
+# news/feeds.py
+
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+
+from main.caching import get_version
+from .models import News, NewsCategory, NewsQuerySet
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class NewsFeed(Feed):
+    """RSS-лента последних активных новостей"""
+
+    title = "Новости"
+    description = "Последние новости сайта"
+    limit = 20  # Количество новостей в ленте
+
+    def __call__(self, request, *args, **kwargs):
+        """Готовая лента хранится в кеше до изменения новостей или категорий"""
+        key = "news:feed:%s:%s" % (
+            hashlib.md5(request.build_absolute_uri(request.path).encode()).hexdigest(),
+            get_version("news"),
+        )
+        response = cache.get(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            cache.set(key, response, FEED_CACHE_TIMEOUT)
+        patch_cache_control(response, public=True, max_age=60 * 60)
+        return response
+
+    def link(self):
+        return reverse("news:list")
+
+    def get_queryset(self, obj=None):
+        """Узкая выборка для ленты: поля карточки и время изменения"""
+        queryset = (
+            News.objects.active()
+            .select_related("category")
+            .only(*NewsQuerySet.LISTING_FIELDS, "updated_at")
+        )
+        if obj is not None:
+            queryset = queryset.filter(category=obj)
+        return queryset
+
+    def items(self, obj=None):
+        return self.get_queryset(obj).order_by("-created_at", "-id")[: self.limit]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return (item.category.name,)
+
+
+class NewsAtomFeed(NewsFeed):
+    """Atom-лента последних активных новостей"""
+
+    feed_type = Atom1Feed
+    subtitle = NewsFeed.description
+
+
+class NewsCategoryFeed(NewsFeed):
+    """RSS-лента новостей категории"""
+
+    def get_object(self, request, slug):
+        return get_object_or_404(NewsCategory, slug=slug, is_active=True)
+
+    def title(self, obj):
+        return "Новости: %s" % obj.name
+
+    def link(self, obj):
+        return obj.get_absolute_url()
+
+    def description(self, obj):
+        return obj.excerpt or "Новости категории «%s»" % obj.name
+
+
+class NewsCategoryAtomFeed(NewsCategoryFeed):
+    """Atom-лента новостей категории"""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0003_alter_news_short_description"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="news",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at", "-id"],
+                name="news_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="news",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["category", "-created_at", "-id"],
+                name="news_cat_active_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0004_news_news_active_idx_news_news_cat_active_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="news",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False, verbose_name="Анонс"),
+        ),
+        migrations.AddField(
+            model_name="newscategory",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False, verbose_name="Анонс"),
+        ),
+    ]
@@ -1,11 +1,17 @@
 # news/models.py
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils.text import slugify
 from django_ckeditor_5.fields import CKEditor5Field
 
+from main.caching import bump_version_on_commit
+from main.counters import arecord_view, record_view
+from main.utils import make_excerpt
+
 
 class NewsCategory(models.Model):
     """Модель категории новостей"""
@@ -24,6 +30,9 @@ class NewsCategory(models.Model):
     )  # Показывать в меню навигации
     order = models.IntegerField(_("Порядок"), default=0)  # Порядок сортировки
     is_active = models.BooleanField(_("Активно"), default=True)  # Активна ли категория
+    excerpt = models.TextField(
+        _("Анонс"), blank=True, editable=False
+    )  # Описание без разметки для карточек, обновляется при сохранении
 
     class Meta:
         verbose_name = _(
@@ -39,16 +48,62 @@ class NewsCategory(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        """Автоматическое создание slug при сохранении"""
+        """Автоматическое создание slug и анонса при сохранении"""
         if not self.slug:
             self.slug = slugify(self.name)  # Генерация slug из названия
+        self.update_excerpt()
         super().save(*args, **kwargs)
 
+    def update_excerpt(self):
+        """Обновление анонса из описания (10 слов без HTML)"""
+        self.excerpt = make_excerpt(self.description, 10)
+
     def get_absolute_url(self):
         """Получение абсолютного URL для категории"""
         return reverse("news:category", kwargs={"slug": self.slug})
 
 
+@receiver([post_save, post_delete], sender=NewsCategory)
+def invalidate_news_category_caches(sender, **kwargs):
+    """Сброс меню навигации и кеша страниц новостей при изменении категорий"""
+    bump_version_on_commit("menu", "news")
+
+
+class NewsQuerySet(models.QuerySet):
+    """Наборы новостей для публичных страниц"""
+
+    # Поля, которые выводятся в карточках списков новостей
+    LISTING_FIELDS = (
+        "id",
+        "title",
+        "slug",
+        "image",
+        "excerpt",
+        "created_at",
+        "category",
+        "category__name",
+        "category__slug",
+    )
+
+    def active(self):
+        """Только активные новости"""
+        return self.filter(is_active=True)
+
+    def for_listing(self):
+        """Узкая выборка для карточек: категория одним JOIN, без полного текста"""
+        return self.select_related("category").only(*self.LISTING_FIELDS)
+
+    def similar_to(self, news, limit=4):
+        """Последние активные новости той же категории, кроме текущей"""
+        return (
+            self.active()
+            .filter(category_id=news.category_id)
+            .exclude(id=news.id)
+            .only("id", "title", "slug", "created_at")
+            .order_by("-created_at")[:limit]
+        )
+
+
 class News(models.Model):
     """Модель новости"""
 
@@ -75,6 +130,9 @@ class News(models.Model):
     content = CKEditor5Field(
         _("Содержание"), blank=True, config_name="extends"
     )  # Полное содержание
+    excerpt = models.TextField(
+        _("Анонс"), blank=True, editable=False
+    )  # Краткое описание без разметки для карточек, обновляется при сохранении
 
     # Системные поля
     views = models.PositiveIntegerField(_("Просмотры"), default=0)  # Счетчик просмотров
@@ -85,30 +143,60 @@ class News(models.Model):
         _("Обновлено"), auto_now=True
     )  # Дата обновления (при каждом сохранении)
 
+    objects = NewsQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Новость")  # Человекочитаемое имя в единственном числе
         verbose_name_plural = _(
             "Новости"
         )  # Человекочитаемое имя во множественном числе
         ordering = ["-created_at"]  # Сортировка по дате создания (новые сначала)
+        indexes = [
+            # Списки активных новостей: news_list, latest_news
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="news_active_idx",
+            ),
+            # Новости категории и похожие новости: news_by_category, news_detail
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="news_cat_active_idx",
+            ),
+        ]
 
     def __str__(self):
         """Строковое представление объекта"""
         return self.title
 
     def save(self, *args, **kwargs):
-        """Автоматическое создание slug при сохранении"""
+        """Автоматическое создание slug и анонса при сохранении"""
         if not self.slug:
             self.slug = slugify(self.title)  # Генерация slug из заголовка
+        self.update_excerpt()
         super().save(*args, **kwargs)
 
+    def update_excerpt(self):
+        """Обновление анонса из краткого описания (30 слов без HTML)"""
+        self.excerpt = make_excerpt(self.short_description, 30)
+
     def get_absolute_url(self):
         """Получение абсолютного URL для новости"""
         return reverse("news:detail", kwargs={"slug": self.slug})
 
     def increment_views(self):
-        """Увеличение счетчика просмотров на 1"""
+        """Учет просмотра: запись в базу выполняется пачками (main.counters)"""
+        record_view(self)
+        self.views += 1  # Значение для отображения на текущей странице
+
+    async def aincrement_views(self):
+        """Асинхронный учет просмотра (для представлений под ASGI)"""
+        await arecord_view(self)
         self.views += 1
-        self.save(
-            update_fields=["views"]
-        )  # Сохранение только поля views для оптимизации
+
+
+@receiver([post_save, post_delete], sender=News)
+def invalidate_news_caches(sender, **kwargs):
+    """Сброс кеша страниц новостей при изменении новости"""
+    bump_version_on_commit("news")
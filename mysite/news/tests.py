@@ -1,3 +1,259 @@
-from django.test import TestCase
+# news/tests.py
 
-# Create your tests here.
+from unittest import skipUnless
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from main.counters import flush_view_counters
+from main.models import SiteSettings
+from main.pagination import KeysetPaginator
+from main.testing import SiteTestCase
+
+from .models import News, NewsCategory
+
+
+@skipUnless(connection.vendor == "sqlite", "Планы запросов проверяются для SQLite")
+class NewsQueryPlanTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        cls.category = NewsCategory.objects.create(name="Category", slug="category")
+        other = NewsCategory.objects.create(name="Other", slug="other")
+        News.objects.bulk_create(
+            News(
+                title=f"News {i}",
+                slug=f"news-{i}",
+                category=cls.category if i % 2 else other,
+                is_active=i % 5 != 0,
+            )
+            for i in range(30)
+        )
+
+    def assertViewUsesIndexes(self, url):
+        with self.capture_sql() as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoFullScanSort(queries)
+
+    def test_news_list(self):
+        self.assertViewUsesIndexes(reverse("news:list"))
+
+    def test_news_by_category(self):
+        self.assertViewUsesIndexes(reverse("news:category", args=["category"]))
+
+    def test_news_detail_similar_news(self):
+        self.assertViewUsesIndexes(reverse("news:detail", args=["news-1"]))
+
+    def test_news_list_without_per_item_queries(self):
+        # Время изменения списка для ETag, настройки, меню (3 запроса) и одна
+        # выборка новостей с категориями
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse("news:list"))
+        self.assertContains(response, "Category")
+        self.assertNotIn("content", response.context["news_list"][0].__dict__)
+
+    def test_news_list_next_page(self):
+        first = self.client.get(reverse("news:list")).context["news_list"]
+        self.assertViewUsesIndexes(reverse("news:list") + "?after=" + first.next_cursor)
+
+
+class KeysetPaginationTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        category = NewsCategory.objects.create(name="Category", slug="category")
+        News.objects.bulk_create(
+            News(title=f"News {i}", slug=f"news-{i}", category=category)
+            for i in range(25)
+        )
+        # Одинаковая дата у части новостей: порядок задает id
+        first_ten = News.objects.order_by("id")[:10]
+        News.objects.filter(id__in=list(first_ten.values_list("id", flat=True))).update(
+            created_at=first_ten[9].created_at
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.expected = list(News.objects.order_by("-created_at", "-id"))
+
+    def test_pages_cover_all_objects_in_order(self):
+        paginator = KeysetPaginator(News.objects.all(), 7)
+        page = paginator.get_page()
+        seen = list(page)
+        while page.has_next:
+            page = paginator.get_page(after=page.next_cursor)
+            self.assertTrue(page.has_previous)
+            seen.extend(page)
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_page_returns_same_objects(self):
+        paginator = KeysetPaginator(News.objects.all(), 7)
+        first = paginator.get_page()
+        second = paginator.get_page(after=first.next_cursor)
+        back = paginator.get_page(before=second.previous_cursor)
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_invalid_cursor_returns_first_page(self):
+        response = self.client.get(reverse("news:list") + "?after=broken")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["news_list"]), self.expected[:20])
+
+    def test_numbered_page_mode(self):
+        response = self.client.get(reverse("news:list") + "?page=2")
+        page = response.context["news_list"]
+        self.assertEqual(page.paginator.count, 25)
+        self.assertEqual(list(page), self.expected[20:])
+
+
+class ConditionalGetTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        category = NewsCategory.objects.create(name="Category", slug="category")
+        cls.news = News.objects.create(title="News", slug="news", category=category)
+
+    def test_detail_not_modified(self):
+        url = reverse("news:detail", args=["news"])
+        response = self.client.get(url)
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_detail_modified_after_save(self):
+        url = reverse("news:detail", args=["news"])
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.news.title = "Updated"
+            self.news.save()
+
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_not_modified_since(self):
+        url = reverse("news:list")
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        # Время изменения списка берётся из кеша: запросов к базе нет
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                url, headers={"if-modified-since": last_modified}
+            )
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(
+    PAGE_CACHE_ENABLED=True,
+    VIEW_COUNTER_FLUSH_INTERVAL=60 * 60,
+    VIEW_COUNTER_MAX_PENDING=10**6,
+)
+class PageCacheTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        category = NewsCategory.objects.create(name="Category", slug="category")
+        cls.news = News.objects.create(title="News", slug="news", category=category)
+
+    def test_list_served_from_cache(self):
+        url = reverse("news:list")
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "HIT")
+
+    def test_cached_detail_still_counts_views(self):
+        url = reverse("news:detail", args=["news"])
+        # Просмотры, накопленные другими тестами, записываются заранее
+        flush_view_counters()
+        self.news.refresh_from_db()
+        views = self.news.views
+
+        for _ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header("X-Page-Cache"))
+
+        flush_view_counters()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views, views + 2)
+
+
+class FeedTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = NewsCategory.objects.create(name="Category", slug="category")
+        other = NewsCategory.objects.create(name="Other", slug="other")
+        News.objects.create(
+            title="In category", slug="in", category=cls.category, image="news/a.png"
+        )
+        News.objects.create(
+            title="Elsewhere", slug="out", category=other, image="news/b.png"
+        )
+
+    def test_category_feeds(self):
+        rss = self.client.get(reverse("news:category_feed_rss", args=["category"]))
+        atom = self.client.get(reverse("news:category_feed_atom", args=["category"]))
+
+        self.assertEqual(rss["Content-Type"], "application/rss+xml; charset=utf-8")
+        self.assertContains(rss, "/news/in/")
+        self.assertNotContains(rss, "/news/out/")
+        self.assertContains(atom, "<updated>")
+        self.assertContains(atom, "/news/in/")
+
+    def test_feed_cached_until_news_change(self):
+        url = reverse("news:feed_rss")
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            News.objects.create(
+                title="Fresh", slug="fresh", category=self.category, image="news/c.png"
+            )
+        self.assertContains(self.client.get(url), "/news/fresh/")
+
+
+@override_settings(ROOT_URLCONF="mysite.urls_async")
+class AsyncViewTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        category = NewsCategory.objects.create(name="Category", slug="category")
+        for i in range(3):
+            News.objects.create(
+                title=f"News {i}",
+                slug=f"news-{i}",
+                category=category,
+            )
+
+    async def test_pages_match_sync_views(self):
+        for url in ("/news/", "/news/category/category/", "/portfolio/", "/"):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(
+                response.resolver_match.func.__module__.endswith("async_views")
+            )
+            with override_settings(ROOT_URLCONF="mysite.urls"):
+                expected = await sync_to_async(self.client.get)(url)
+            self.assertEqual(response.content, expected.content)
+
+    async def test_detail_not_modified(self):
+        response = await self.async_client.get("/news/news-1/")
+        self.assertContains(response, "News 0")  # похожие новости
+
+        response = await self.async_client.get(
+            "/news/news-1/", headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_missing_object(self):
+        response = await self.async_client.get("/news/missing/")
+        self.assertEqual(response.status_code, 404)
@@ -1,12 +1,24 @@
 # news/urls.py
 
 from django.urls import path
-from . import views
+from . import feeds, views
 
 app_name = "news"
 
 urlpatterns = [
     path("", views.news_list, name="list"),
     path("category/<slug:slug>/", views.news_by_category, name="category"),
+    path("feed/rss/", feeds.NewsFeed(), name="feed_rss"),
+    path("feed/atom/", feeds.NewsAtomFeed(), name="feed_atom"),
+    path(
+        "category/<slug:slug>/rss/",
+        feeds.NewsCategoryFeed(),
+        name="category_feed_rss",
+    ),
+    path(
+        "category/<slug:slug>/atom/",
+        feeds.NewsCategoryAtomFeed(),
+        name="category_feed_atom",
+    ),
     path("<slug:slug>/", views.news_detail, name="detail"),
 ]
@@ -1,9 +1,13 @@
 # news/views.py
 from django.shortcuts import render, get_object_or_404
-from django.core.paginator import Paginator
+from django.views.decorators.cache import cache_control
+from main.conditional import ConditionalPage, latest_update
+from main.menu import get_menu
+from main.pagination import paginate
 from .models import News, NewsCategory
 
 
+@cache_control(public=True, max_age=60 * 5)
 def news_list(request):
     """Представление для отображения списка всех активных новостей
     и категорий в меню.
@@ -14,25 +18,29 @@ def news_list(request):
     Returns:
         HttpResponse: Отрендеренный шаблон со списком новостей
     """
-    # Получение всех активных новостей, отсортированных по дате (новые сначала)
-    news_list = News.objects.filter(is_active=True).order_by("-created_at")
+    # Получение всех активных новостей (сортировку по дате задает пагинация)
+    news_list = News.objects.active().for_listing()
+
+    # Ответ 304 без рендеринга, если список не менялся
+    conditional = ConditionalPage(request, latest_update(news_list, "news"))
+    if (response := conditional.not_modified()) is not None:
+        return response
 
     # Получение активных категорий для отображения в меню
-    categories = NewsCategory.objects.filter(is_active=True, show_in_menu=True)
+    categories = get_menu().news_categories
 
-    # Пагинация - 20 новостей на страницу
-    paginator = Paginator(news_list, 20)
-    page_number = request.GET.get("page")  # Получение номера страницы из GET-параметра
-    page_obj = paginator.get_page(page_number)  # Получение объекта страницы
+    # Курсорная пагинация - 20 новостей на страницу (без COUNT и OFFSET)
+    page_obj = paginate(request, news_list, 20, cache_version="news")
 
     # Формирование контекста для шаблона
     context = {
         "news_list": page_obj,  # Новости текущей страницы
         "categories": categories,  # Список категорий для меню
     }
-    return render(request, "news/list.html", context)
+    return conditional.finish(render(request, "news/list.html", context))
 
 
+@cache_control(public=True, max_age=60 * 10)
 def news_detail(request, slug):
     """Представление для отображения детальной страницы новости.
 
@@ -44,20 +52,23 @@ def news_detail(request, slug):
         HttpResponse: Отрендеренный шаблон с детальной информацией о новости
     """
     # Получение новости по slug или 404 ошибка если не найдена
-    news = get_object_or_404(News, slug=slug, is_active=True)
+    news = get_object_or_404(
+        News.objects.active().select_related("category"), slug=slug
+    )
 
-    # Увеличение счетчика просмотров
+    # Увеличение счетчика просмотров (в том числе для ответа 304)
     news.increment_views()
 
+    # Ответ 304 без рендеринга, если новость и сайдбар не менялись
+    conditional = ConditionalPage(request, news.updated_at)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
     # Получение активных категорий для сайдбара
-    categories = NewsCategory.objects.filter(is_active=True, show_in_menu=True)
+    categories = get_menu().news_categories
 
     # Получение похожих новостей (из той же категории, исключая текущую)
-    similar_news = (
-        News.objects.filter(category=news.category, is_active=True)
-        .exclude(id=news.id)  # Исключение текущей новости
-        .order_by("-created_at")[:4]  # 4 последние новости из категории
-    )
+    similar_news = News.objects.similar_to(news)  # 4 последние новости категории
 
     # Формирование контекста для шаблона
     context = {
@@ -65,9 +76,10 @@ def news_detail(request, slug):
         "similar_news": similar_news,  # Похожие новости для сайдбара
         "categories": categories,  # Категории для сайдбара
     }
-    return render(request, "news/detail.html", context)
+    return conditional.finish(render(request, "news/detail.html", context))
 
 
+@cache_control(public=True, max_age=60 * 5)
 def news_by_category(request, slug):
     """
     Представление для отображения новостей определенной категории.
@@ -83,17 +95,18 @@ def news_by_category(request, slug):
     category = get_object_or_404(NewsCategory, slug=slug, is_active=True)
 
     # Получение активных новостей данной категории
-    news_list = News.objects.filter(category=category, is_active=True).order_by(
-        "-created_at"
-    )
+    news_list = News.objects.active().for_listing().filter(category=category)
+
+    # Ответ 304 без рендеринга, если новости категории не менялись
+    conditional = ConditionalPage(request, latest_update(news_list, "news"))
+    if (response := conditional.not_modified()) is not None:
+        return response
 
     # Получение активных категорий для меню
-    categories = NewsCategory.objects.filter(is_active=True, show_in_menu=True)
+    categories = get_menu().news_categories
 
-    # Пагинация - 20 новостей на страницу
-    paginator = Paginator(news_list, 20)
-    page_number = request.GET.get("page")  # Получение номера страницы из GET-параметра
-    page_obj = paginator.get_page(page_number)  # Получение объекта страницы
+    # Курсорная пагинация - 20 новостей на страницу (без COUNT и OFFSET)
+    page_obj = paginate(request, news_list, 20, cache_version="news")
 
     # Формирование контекста для шаблона
     context = {
@@ -101,4 +114,4 @@ def news_by_category(request, slug):
         "news_list": page_obj,  # Новости категории текущей страницы
         "categories": categories,  # Список категорий для меню
     }
-    return render(request, "news/category.html", context)
+    return conditional.finish(render(request, "news/category.html", context))
@@ -0,0 +1,83 @@
+# portfolio/async_views.py
+"""Асинхронные варианты представлений portfolio.views для ASGI."""
+
+import asyncio
+
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.cache import cache_control
+
+from main.asgi import alist, arender
+from main.caching import aget_page_versions
+from main.conditional import ConditionalPage, alatest_update
+from main.menu import aget_menu
+from main.pagination import apaginate
+from .models import Portfolio, PortfolioCategory
+
+
+@cache_control(public=True, max_age=60 * 5)
+async def portfolio_list(request):
+    queryset = Portfolio.objects.active().for_listing()
+    updated_at, versions = await asyncio.gather(
+        alatest_update(queryset, "portfolio"),
+        aget_page_versions(request.resolver_match.namespace),
+    )
+    conditional = ConditionalPage(request, updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    portfolios, menu = await asyncio.gather(
+        apaginate(request, queryset, 12, cache_version="portfolio"), aget_menu()
+    )
+
+    context = {
+        "portfolios": portfolios,
+        "categories": menu.portfolio_categories,
+    }
+    return conditional.finish(await arender(request, "portfolio/list.html", context))
+
+
+@cache_control(public=True, max_age=60 * 10)
+async def portfolio_detail(request, slug):
+    portfolio = await aget_object_or_404(
+        Portfolio.objects.active().select_related("category"), slug=slug
+    )
+    await portfolio.aincrement_views()
+
+    versions = await aget_page_versions(request.resolver_match.namespace)
+    conditional = ConditionalPage(request, portfolio.updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    similar_portfolios = await alist(Portfolio.objects.similar_to(portfolio))
+
+    context = {
+        "portfolio": portfolio,
+        "similar_portfolios": similar_portfolios,
+    }
+    return conditional.finish(await arender(request, "portfolio/detail.html", context))
+
+
+@cache_control(public=True, max_age=60 * 5)
+async def portfolio_by_category(request, slug):
+    category = await aget_object_or_404(PortfolioCategory, slug=slug, is_active=True)
+    queryset = Portfolio.objects.active().for_listing().filter(category=category)
+    updated_at, versions = await asyncio.gather(
+        alatest_update(queryset, "portfolio"),
+        aget_page_versions(request.resolver_match.namespace),
+    )
+    conditional = ConditionalPage(request, updated_at, versions)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    portfolios, menu = await asyncio.gather(
+        apaginate(request, queryset, 12, cache_version="portfolio"), aget_menu()
+    )
+
+    context = {
+        "category": category,
+        "portfolios": portfolios,
+        "categories": menu.portfolio_categories,
+    }
+    return conditional.finish(
+        await arender(request, "portfolio/category.html", context)
+    )
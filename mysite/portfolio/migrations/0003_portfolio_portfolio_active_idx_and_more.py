@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0002_alter_portfolio_content"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at", "-id"],
+                name="portfolio_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["category", "-created_at", "-id"],
+                name="portfolio_cat_active_idx",
+            ),
+        ),
+    ]
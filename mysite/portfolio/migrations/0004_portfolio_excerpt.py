@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0003_portfolio_portfolio_active_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="portfolio",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False, verbose_name="Анонс"),
+        ),
+    ]
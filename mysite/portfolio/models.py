@@ -1,11 +1,17 @@
 # portfolio/models.py
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils.text import slugify
 from django_ckeditor_5.fields import CKEditor5Field
 
+from main.caching import bump_version_on_commit
+from main.counters import arecord_view, record_view
+from main.utils import make_excerpt
+
 
 class PortfolioCategory(models.Model):
     name = models.CharField(_("Название"), max_length=100)
@@ -35,6 +41,38 @@ class PortfolioCategory(models.Model):
         return reverse("portfolio:category", kwargs={"slug": self.slug})
 
 
+@receiver([post_save, post_delete], sender=PortfolioCategory)
+def invalidate_portfolio_category_caches(sender, **kwargs):
+    bump_version_on_commit("menu", "portfolio")
+
+
+class PortfolioQuerySet(models.QuerySet):
+    LISTING_FIELDS = (
+        "id",
+        "title",
+        "slug",
+        "image",
+        "excerpt",
+        "price",
+        "created_at",
+    )
+
+    def active(self):
+        return self.filter(is_active=True)
+
+    def for_listing(self):
+        return self.only(*self.LISTING_FIELDS)
+
+    def similar_to(self, portfolio, limit=4):
+        return (
+            self.active()
+            .filter(category_id=portfolio.category_id)
+            .exclude(id=portfolio.id)
+            .only("id", "title", "slug", "created_at")
+            .order_by("-created_at")[:limit]
+        )
+
+
 class Portfolio(models.Model):
     title = models.CharField(_("Заголовок"), max_length=200)
     slug = models.SlugField(_("URL"), unique=True)
@@ -43,6 +81,7 @@ class Portfolio(models.Model):
     )
     image = models.ImageField(_("Изображение"), upload_to="portfolio/")
     short_description = models.TextField(_("Краткое описание"))
+    excerpt = models.TextField(_("Анонс"), blank=True, editable=False)
     content = CKEditor5Field(_("Содержание"), blank=True, config_name="extends")
     price = models.DecimalField(
         _("Цена"), max_digits=10, decimal_places=2, blank=True, null=True
@@ -56,10 +95,24 @@ class Portfolio(models.Model):
     created_at = models.DateTimeField(_("Создано"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Обновлено"), auto_now=True)
 
+    objects = PortfolioQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Работа портфолио")
         verbose_name_plural = _("Работы портфолио")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="portfolio_active_idx",
+            ),
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="portfolio_cat_active_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -67,11 +120,24 @@ class Portfolio(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        self.update_excerpt()
         super().save(*args, **kwargs)
 
+    def update_excerpt(self):
+        self.excerpt = make_excerpt(self.short_description, 30)
+
     def get_absolute_url(self):
         return reverse("portfolio:detail", kwargs={"slug": self.slug})
 
     def increment_views(self):
+        record_view(self)
         self.views += 1
-        self.save(update_fields=["views"])
+
+    async def aincrement_views(self):
+        await arecord_view(self)
+        self.views += 1
+
+
+@receiver([post_save, post_delete], sender=Portfolio)
+def invalidate_portfolio_caches(sender, **kwargs):
+    bump_version_on_commit("portfolio")
@@ -1,3 +1,45 @@
-from django.test import TestCase
+# portfolio/tests.py
 
-# Create your tests here.
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+
+from main.models import SiteSettings
+from main.testing import SiteTestCase
+
+from .models import Portfolio, PortfolioCategory
+
+
+@skipUnless(connection.vendor == "sqlite", "Планы запросов проверяются для SQLite")
+class PortfolioQueryPlanTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        category = PortfolioCategory.objects.create(name="Category", slug="category")
+        other = PortfolioCategory.objects.create(name="Other", slug="other")
+        Portfolio.objects.bulk_create(
+            Portfolio(
+                title=f"Work {i}",
+                slug=f"work-{i}",
+                category=category if i % 2 else other,
+                short_description="Description",
+                is_active=i % 5 != 0,
+            )
+            for i in range(30)
+        )
+
+    def assertViewUsesIndexes(self, url):
+        with self.capture_sql() as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoFullScanSort(queries)
+
+    def test_portfolio_list(self):
+        self.assertViewUsesIndexes(reverse("portfolio:list"))
+
+    def test_portfolio_by_category(self):
+        self.assertViewUsesIndexes(reverse("portfolio:category", args=["category"]))
+
+    def test_portfolio_detail_similar_works(self):
+        self.assertViewUsesIndexes(reverse("portfolio:detail", args=["work-1"]))
@@ -1,47 +1,64 @@
 # portfolio/views.py
 
 from django.shortcuts import render, get_object_or_404
+from django.views.decorators.cache import cache_control
+from main.conditional import ConditionalPage, latest_update
+from main.menu import get_menu
+from main.pagination import paginate
 from .models import Portfolio, PortfolioCategory
 
 
+@cache_control(public=True, max_age=60 * 5)
 def portfolio_list(request):
-    portfolios = Portfolio.objects.filter(is_active=True).order_by("-created_at")
-    categories = PortfolioCategory.objects.filter(is_active=True, show_in_menu=True)
+    queryset = Portfolio.objects.active().for_listing()
+    conditional = ConditionalPage(request, latest_update(queryset, "portfolio"))
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    portfolios = paginate(request, queryset, 12, cache_version="portfolio")
+    categories = get_menu().portfolio_categories
 
     context = {
         "portfolios": portfolios,
         "categories": categories,
     }
-    return render(request, "portfolio/list.html", context)
+    return conditional.finish(render(request, "portfolio/list.html", context))
 
 
+@cache_control(public=True, max_age=60 * 10)
 def portfolio_detail(request, slug):
-    portfolio = get_object_or_404(Portfolio, slug=slug, is_active=True)
+    portfolio = get_object_or_404(
+        Portfolio.objects.active().select_related("category"), slug=slug
+    )
     portfolio.increment_views()
 
-    similar_portfolios = (
-        Portfolio.objects.filter(category=portfolio.category, is_active=True)
-        .exclude(id=portfolio.id)
-        .order_by("-created_at")[:4]
-    )
+    conditional = ConditionalPage(request, portfolio.updated_at)
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    similar_portfolios = Portfolio.objects.similar_to(portfolio)
 
     context = {
         "portfolio": portfolio,
         "similar_portfolios": similar_portfolios,
     }
-    return render(request, "portfolio/detail.html", context)
+    return conditional.finish(render(request, "portfolio/detail.html", context))
 
 
+@cache_control(public=True, max_age=60 * 5)
 def portfolio_by_category(request, slug):
     category = get_object_or_404(PortfolioCategory, slug=slug, is_active=True)
-    portfolios = Portfolio.objects.filter(category=category, is_active=True).order_by(
-        "-created_at"
-    )
-    categories = PortfolioCategory.objects.filter(is_active=True, show_in_menu=True)
+    queryset = Portfolio.objects.active().for_listing().filter(category=category)
+    conditional = ConditionalPage(request, latest_update(queryset, "portfolio"))
+    if (response := conditional.not_modified()) is not None:
+        return response
+
+    portfolios = paginate(request, queryset, 12, cache_version="portfolio")
+    categories = get_menu().portfolio_categories
 
     context = {
         "category": category,
         "portfolios": portfolios,
         "categories": categories,
     }
-    return render(request, "portfolio/category.html", context)
+    return conditional.finish(render(request, "portfolio/category.html", context))
@@ -0,0 +1,15 @@
+# reviews/async_views.py
+"""Асинхронные варианты представлений reviews.views для ASGI."""
+
+from django.views.decorators.cache import cache_control
+
+from main.asgi import alist, arender
+from .models import Review
+
+
+@cache_control(public=True, max_age=60 * 5)
+async def review_list(request):
+    reviews = await alist(
+        Review.objects.filter(status="approved").order_by("-created_at")
+    )
+    return await arender(request, "reviews/list.html", {"reviews": reviews})
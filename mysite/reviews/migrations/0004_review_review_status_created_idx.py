@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_alter_review_message"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["status", "-created_at"], name="review_status_created_idx"
+            ),
+        ),
+    ]
@@ -1,8 +1,12 @@
 # reviews/models.py
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
+from main.caching import bump_version_on_commit
+
 
 class Review(models.Model):
     STATUS_CHOICES = (
@@ -25,6 +29,16 @@ class Review(models.Model):
         verbose_name = _("Отзыв")
         verbose_name_plural = _("Отзывы")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "-created_at"], name="review_status_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.created_at}"
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review_caches(sender, **kwargs):
+    bump_version_on_commit("reviews")
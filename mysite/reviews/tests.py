@@ -1,3 +1,35 @@
-from django.test import TestCase
+# reviews/tests.py
 
-# Create your tests here.
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+
+from main.models import SiteSettings
+from main.testing import SiteTestCase
+
+from .models import Review
+
+
+@skipUnless(connection.vendor == "sqlite", "Планы запросов проверяются для SQLite")
+class ReviewQueryPlanTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        statuses = ["pending", "approved", "rejected"]
+        Review.objects.bulk_create(
+            Review(
+                full_name=f"Client {i}",
+                phone="+70000000000",
+                email=f"client{i}@example.com",
+                message="Message",
+                status=statuses[i % 3],
+            )
+            for i in range(30)
+        )
+
+    def test_review_list(self):
+        with self.capture_sql() as queries:
+            response = self.client.get(reverse("reviews:list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNoFullScanSort(queries)
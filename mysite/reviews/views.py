@@ -1,11 +1,13 @@
 # reviews/views.py
 
 from django.shortcuts import render, redirect
+from django.views.decorators.cache import cache_control
 from django.contrib import messages
 from .models import Review
 from .forms import ReviewForm
 
 
+@cache_control(public=True, max_age=60 * 5)
 def review_list(request):
     reviews = Review.objects.filter(status="approved").order_by("-created_at")
     return render(request, "reviews/list.html", {"reviews": reviews})
@@ -0,0 +1,198 @@
+# search/backends.py
+
+import re
+from collections import namedtuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# Не больше стольких слов запроса участвуют в поиске
+MAX_TERMS = 8
+
+# Метки начала и конца совпадения в подсветке. Символы из области частного
+# использования Unicode не встречаются в тексте, поэтому текст можно сначала
+# экранировать, а затем заменить метки на <mark>.
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+
+# Найденный документ: заголовок и фрагмент текста с подсветкой совпадений
+SearchResult = namedtuple("SearchResult", ["kind", "title", "snippet", "url", "rank"])
+
+
+def query_terms(query):
+    """Разбивает строку запроса на слова без служебных символов.
+
+    Синтаксис FTS5 и tsquery пользователю не доступен: каждое слово
+    ищется как префикс, все слова должны встретиться в документе.
+    """
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def highlight(text):
+    """Экранирует текст и превращает метки совпадений в <mark>."""
+    text = escape(text or "")
+    return mark_safe(text.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>"))
+
+
+class SQLiteSearchBackend:
+    """Поиск по виртуальной таблице FTS5 ``search_fts``.
+
+    Таблица использует ``search_searchdocument`` как внешнее содержимое и
+    обновляется триггерами (см. миграцию search.0001_initial). Ранжирование
+    bm25, совпадения в заголовке весят в 10 раз больше совпадений в тексте.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def match_expression(self, terms):
+        return " ".join('"%s"*' % term for term in terms)
+
+    def count(self, terms):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM search_fts WHERE search_fts MATCH %s",
+                [self.match_expression(terms)],
+            )
+            return cursor.fetchone()[0]
+
+    def search(self, terms, limit, offset):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT d.kind, highlight(search_fts, 0, %s, %s), "
+                "snippet(search_fts, 1, %s, %s, '…', 32), d.url, "
+                "bm25(search_fts, 10.0, 1.0) AS rank "
+                "FROM search_fts "
+                "JOIN search_searchdocument d ON d.id = search_fts.rowid "
+                "WHERE search_fts MATCH %s "
+                "ORDER BY rank LIMIT %s OFFSET %s",
+                [
+                    MARK_START,
+                    MARK_END,
+                    MARK_START,
+                    MARK_END,
+                    self.match_expression(terms),
+                    limit,
+                    offset,
+                ],
+            )
+            return [SearchResult(*row) for row in cursor.fetchall()]
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("INSERT INTO search_fts(search_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO search_fts(search_fts) VALUES ('optimize')")
+
+
+class PostgresSearchBackend:
+    """Поиск по вычисляемому столбцу ``search_vector`` (tsvector, GIN-индекс).
+
+    Заголовок имеет вес A, текст - вес B, ранжирование ``ts_rank``.
+    """
+
+    config = "russian"
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def tsquery(self, terms):
+        return " & ".join("%s:*" % term for term in terms)
+
+    def count(self, terms):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM search_searchdocument "
+                "WHERE search_vector @@ to_tsquery(%s, %s)",
+                [self.config, self.tsquery(terms)],
+            )
+            return cursor.fetchone()[0]
+
+    def search(self, terms, limit, offset):
+        title_options = "StartSel=%s, StopSel=%s, HighlightAll=true" % (
+            MARK_START,
+            MARK_END,
+        )
+        body_options = "StartSel=%s, StopSel=%s, MaxWords=35, MinWords=15" % (
+            MARK_START,
+            MARK_END,
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT kind, ts_headline(%s, title, q, %s), "
+                "ts_headline(%s, body, q, %s), url, "
+                "ts_rank(search_vector, q) AS rank "
+                "FROM search_searchdocument, to_tsquery(%s, %s) q "
+                "WHERE search_vector @@ q "
+                "ORDER BY rank DESC, id LIMIT %s OFFSET %s",
+                [
+                    self.config,
+                    title_options,
+                    self.config,
+                    body_options,
+                    self.config,
+                    self.tsquery(terms),
+                    limit,
+                    offset,
+                ],
+            )
+            return [SearchResult(*row) for row in cursor.fetchall()]
+
+    def rebuild(self):
+        # Вычисляемый столбец и GIN-индекс обновляются самой базой
+        with self.connection.cursor() as cursor:
+            cursor.execute("REINDEX INDEX search_document_vector_idx")
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend(using="default"):
+    """Возвращает поисковый бэкенд для базы данных ``using``."""
+    connection = connections[using]
+    try:
+        return SEARCH_BACKENDS[connection.vendor](connection)
+    except KeyError:
+        raise ImproperlyConfigured(
+            "Полнотекстовый поиск не поддерживается для базы %s" % connection.vendor
+        )
+
+
+class SearchQuery:
+    """Результаты поиска с ленивым подсчётом и срезами для Paginator.
+
+    Args:
+        query (str): Строка запроса пользователя.
+        using (str): Псевдоним базы данных.
+    """
+
+    def __init__(self, query, using="default"):
+        self.query = query
+        self.terms = query_terms(query)
+        self.backend = get_backend(using)
+
+    def count(self):
+        if not self.terms:
+            return 0
+        return self.backend.count(self.terms)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index : index + 1][0]
+        if not self.terms:
+            return []
+        start = index.start or 0
+        results = self.backend.search(self.terms, index.stop - start, start)
+        return [
+            result._replace(
+                title=highlight(result.title), snippet=highlight(result.snippet)
+            )
+            for result in results
+        ]
@@ -0,0 +1,109 @@
+# search/index.py
+
+from collections import namedtuple
+
+from django.db import transaction
+
+from main.models import Page
+from main.utils import html_to_text
+from news.models import News
+from portfolio.models import Portfolio
+
+from .backends import get_backend
+from .models import SearchDocument
+
+# Источник документов: тип документа, queryset видимых на сайте объектов,
+# проверка видимости отдельного объекта и поля с HTML-текстом
+SearchSource = namedtuple(
+    "SearchSource", ["kind", "queryset", "is_visible", "text_fields"]
+)
+
+SEARCH_SOURCES = {
+    News: SearchSource(
+        kind="news",
+        queryset=lambda: News.objects.active(),
+        is_visible=lambda obj: obj.is_active,
+        text_fields=("short_description", "content"),
+    ),
+    Portfolio: SearchSource(
+        kind="portfolio",
+        queryset=lambda: Portfolio.objects.active(),
+        is_visible=lambda obj: obj.is_active,
+        text_fields=("short_description", "content"),
+    ),
+    Page: SearchSource(
+        kind="page",
+        queryset=lambda: Page.objects.filter(show_on_site=True),
+        is_visible=lambda obj: obj.show_on_site,
+        text_fields=("content",),
+    ),
+}
+
+
+def build_document(instance, source):
+    """Готовит документ поиска для объекта (без сохранения)."""
+    body = " ".join(
+        html_to_text(getattr(instance, field)) for field in source.text_fields
+    )
+    return SearchDocument(
+        kind=source.kind,
+        object_id=instance.pk,
+        title=instance.title,
+        body=body.strip(),
+        url=instance.get_absolute_url(),
+    )
+
+
+def index_instance(instance):
+    """Добавляет, обновляет или удаляет документ объекта в индексе.
+
+    Скрытые на сайте объекты из индекса удаляются.
+    """
+    source = SEARCH_SOURCES[type(instance)]
+    if not source.is_visible(instance):
+        remove_instance(instance)
+        return
+
+    document = build_document(instance, source)
+    SearchDocument.objects.update_or_create(
+        kind=source.kind,
+        object_id=instance.pk,
+        defaults={
+            "title": document.title,
+            "body": document.body,
+            "url": document.url,
+        },
+    )
+
+
+def remove_instance(instance):
+    """Удаляет документ объекта из индекса."""
+    source = SEARCH_SOURCES[type(instance)]
+    SearchDocument.objects.filter(kind=source.kind, object_id=instance.pk).delete()
+
+
+def rebuild_index(batch_size=500):
+    """Заново строит индекс по всем видимым на сайте объектам.
+
+    Args:
+        batch_size (int): Количество документов в одном INSERT.
+
+    Returns:
+        dict: Количество проиндексированных документов по типам.
+    """
+    counts = {}
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for source in SEARCH_SOURCES.values():
+            documents = []
+            counts[source.kind] = 0
+            for instance in source.queryset().iterator(chunk_size=batch_size):
+                documents.append(build_document(instance, source))
+                if len(documents) >= batch_size:
+                    SearchDocument.objects.bulk_create(documents)
+                    counts[source.kind] += len(documents)
+                    documents = []
+            SearchDocument.objects.bulk_create(documents)
+            counts[source.kind] += len(documents)
+        get_backend().rebuild()
+    return counts
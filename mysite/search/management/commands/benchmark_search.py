@@ -0,0 +1,135 @@
+# search/management/commands/benchmark_search.py
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from main.benchmarking import percentile, temporary_database
+from search.backends import SearchQuery, query_terms
+from search.models import SearchDocument
+
+# Частые и редкие слова для синтетических документов
+COMMON_WORDS = (
+    "сайт разработка дизайн проект клиент компания услуги работа новости "
+    "интернет магазин каталог решение задача команда продвижение реклама"
+).split()
+RARE_WORDS = "криптография брандмауэр микросервисы голография".split()
+
+# Запросы замера: частое слово, редкое слово, два слова, префикс
+QUERIES = ("разработка", "голография", "дизайн проект", "продвиж")
+
+
+def random_word(rng):
+    letters = "абвгдежзиклмнопрстуфхцчшэюя"
+    return "".join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Измеряет время поиска (подсчёт и первая страница результатов) на "
+        "временной базе SQLite с заданным числом документов и сравнивает его "
+        "с поиском через icontains."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--documents",
+            type=int,
+            default=100_000,
+            help="Количество документов в индексе (по умолчанию 100000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Количество повторов каждого запроса (по умолчанию 20)",
+        )
+        parser.add_argument(
+            "--skip-icontains",
+            action="store_true",
+            help="Не замерять поиск через icontains",
+        )
+
+    def handle(self, *args, **options):
+        if settings.DATABASES["default"]["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("Замер доступен только для базы SQLite")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with temporary_database(
+                Path(tmpdir) / "search.sqlite3",
+                pragmas=getattr(settings, "SQLITE_PRAGMAS", {}),
+            ):
+                started = time.perf_counter()
+                self.seed(options["documents"])
+                self.stdout.write(
+                    f"Проиндексировано документов: {options['documents']} "
+                    f"за {time.perf_counter() - started:.1f} с"
+                )
+
+                for query in QUERIES:
+                    self.report(
+                        "fts", query, self.measure(self.fts, query, options["repeat"])
+                    )
+                    if not options["skip_icontains"]:
+                        # icontains просматривает всю таблицу, хватит пары повторов
+                        self.report(
+                            "icontains",
+                            query,
+                            self.measure(self.icontains, query, 2),
+                        )
+
+    def seed(self, count, batch_size=2000):
+        """Создаёт синтетические документы (индекс FTS5 заполняют триггеры)."""
+        rng = random.Random(42)
+        vocabulary = [random_word(rng) for _ in range(5000)]
+        for start in range(0, count, batch_size):
+            documents = []
+            for i in range(start, min(start + batch_size, count)):
+                words = rng.choices(vocabulary, k=80) + rng.choices(COMMON_WORDS, k=8)
+                if rng.random() < 0.001:
+                    words.append(rng.choice(RARE_WORDS))
+                rng.shuffle(words)
+                documents.append(
+                    SearchDocument(
+                        kind="news",
+                        object_id=i,
+                        title=" ".join(rng.choices(vocabulary + COMMON_WORDS, k=6)),
+                        body=" ".join(words),
+                        url=f"/news/document-{i}/",
+                    )
+                )
+            SearchDocument.objects.bulk_create(documents)
+
+    def fts(self, query):
+        results = SearchQuery(query)
+        return results.count(), results[:20]
+
+    def icontains(self, query):
+        condition = Q()
+        for term in query_terms(query):
+            condition &= Q(title__icontains=term) | Q(body__icontains=term)
+        queryset = SearchDocument.objects.filter(condition)
+        return queryset.count(), list(queryset[:20])
+
+    def measure(self, search, query, repeat):
+        """Возвращает время выполнения запроса (мс) и число найденных документов."""
+        timings = []
+        found = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found, _ = search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, found
+
+    def report(self, method, query, measurement):
+        timings, found = measurement
+        self.stdout.write(
+            f"{method:<10} «{query}»: найдено {found}, "
+            f"p50 {percentile(timings, 50):.1f} мс, "
+            f"p95 {percentile(timings, 95):.1f} мс"
+        )
@@ -0,0 +1,24 @@
+# search/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from search.index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Заново строит поисковый индекс по новостям, портфолио и страницам"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Количество документов в одной пачке (по умолчанию 500)",
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_index(batch_size=options["batch_size"])
+
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count}")
+        self.stdout.write(self.style.SUCCESS("Поисковый индекс перестроен"))
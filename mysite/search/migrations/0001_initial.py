@@ -0,0 +1,108 @@
+from django.db import migrations, models
+
+# Полнотекстовый индекс создаётся средствами конкретной базы данных.
+# Внимание: пересоздание таблицы search_searchdocument в SQLite (например,
+# при изменении поля) удаляет триггеры - их нужно создать заново.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE search_fts USING fts5("
+    "title, body, content='search_searchdocument', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER search_fts_ai AFTER INSERT ON search_searchdocument BEGIN "
+    "INSERT INTO search_fts(rowid, title, body) "
+    "VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_fts_ad AFTER DELETE ON search_searchdocument BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_fts_au AFTER UPDATE ON search_searchdocument BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_fts(rowid, title, body) "
+    "VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_fts_au",
+    "DROP TRIGGER IF EXISTS search_fts_ad",
+    "DROP TRIGGER IF EXISTS search_fts_ai",
+    "DROP TABLE IF EXISTS search_fts",
+]
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE search_searchdocument ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX search_document_vector_idx ON search_searchdocument "
+    "USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_document_vector_idx",
+    "ALTER TABLE search_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("news", "Новость"),
+                            ("portfolio", "Портфолио"),
+                            ("page", "Страница"),
+                        ],
+                        max_length=20,
+                        verbose_name="Тип",
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField(verbose_name="ID объекта")),
+                ("title", models.CharField(max_length=200, verbose_name="Заголовок")),
+                ("body", models.TextField(blank=True, verbose_name="Текст")),
+                ("url", models.CharField(max_length=255, verbose_name="URL")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Обновлено"),
+                ),
+            ],
+            options={
+                "verbose_name": "Документ поиска",
+                "verbose_name_plural": "Документы поиска",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"), name="search_document_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            run_statements({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            run_statements(
+                {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# search/models.py
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+
+from main.models import Page
+from news.models import News
+from portfolio.models import Portfolio
+
+
+class SearchDocument(models.Model):
+    """Документ поискового индекса: текст объекта сайта без разметки.
+
+    Полнотекстовый индекс строится над этой таблицей средствами базы данных
+    (FTS5 в SQLite, tsvector в PostgreSQL, см. search/backends.py) и
+    обновляется вместе с ней.
+    """
+
+    KIND_CHOICES = [
+        ("news", _("Новость")),
+        ("portfolio", _("Портфолио")),
+        ("page", _("Страница")),
+    ]
+
+    kind = models.CharField(_("Тип"), max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField(_("ID объекта"))
+    title = models.CharField(_("Заголовок"), max_length=200)
+    body = models.TextField(_("Текст"), blank=True)
+    url = models.CharField(_("URL"), max_length=255)
+    updated_at = models.DateTimeField(_("Обновлено"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Документ поиска")
+        verbose_name_plural = _("Документы поиска")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="search_document_unique"
+            )
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+@receiver(post_save, sender=News)
+@receiver(post_save, sender=Portfolio)
+@receiver(post_save, sender=Page)
+def update_search_document(sender, instance, raw=False, **kwargs):
+    """Обновляет документ поиска при сохранении новости, работы или страницы."""
+    from .index import index_instance
+
+    if not raw:
+        index_instance(instance)
+
+
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=Portfolio)
+@receiver(post_delete, sender=Page)
+def delete_search_document(sender, instance, **kwargs):
+    """Удаляет документ поиска вместе с объектом."""
+    from .index import remove_instance
+
+    remove_instance(instance)
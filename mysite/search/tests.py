@@ -0,0 +1,69 @@
+# search/tests.py
+
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from main.models import Page, SiteSettings
+from main.testing import SiteTestCase
+from news.models import News, NewsCategory
+
+from .backends import SearchQuery
+from .models import SearchDocument
+
+
+@skipUnless(connection.vendor == "sqlite", "Индекс FTS5 доступен в SQLite")
+class SearchTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(logo_text="Site")
+        cls.category = NewsCategory.objects.create(name="Category", slug="category")
+        cls.news = News.objects.create(
+            title="Разработка сайтов",
+            slug="razrabotka",
+            category=cls.category,
+            short_description="<p>Создаём <b>сайты</b> &amp; магазины</p>",
+            content="<p>Разработка интернет-магазинов под ключ</p>",
+        )
+        cls.page = Page.objects.create(
+            title="О компании",
+            slug="about",
+            content="<p>Мы занимаемся разработкой с 2010 года &lt;script&gt;</p>",
+        )
+
+    def test_documents_follow_signals(self):
+        self.assertEqual(SearchDocument.objects.count(), 2)
+
+        self.news.is_active = False
+        self.news.save()
+        self.assertEqual(SearchQuery("разработка").count(), 0)
+
+        self.page.delete()
+        self.assertEqual(SearchDocument.objects.count(), 0)
+
+    def test_title_match_ranks_first(self):
+        results = SearchQuery("разработ")[:10]
+
+        self.assertEqual(
+            [r.url for r in results], ["/news/razrabotka/", "/page/about/"]
+        )
+        self.assertEqual(results[0].title, "<mark>Разработка</mark> сайтов")
+
+    def test_view_escapes_document_text(self):
+        response = self.client.get(reverse("search:results"), {"q": "года"})
+
+        self.assertContains(response, "<mark>года</mark>")
+        self.assertContains(response, "&lt;script&gt;")
+
+    def test_syntax_characters_are_ignored(self):
+        self.assertEqual(SearchQuery('"магаз* (').count(), 1)
+        self.assertEqual(SearchQuery("***").count(), 0)
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+
+        call_command("rebuild_search_index", stdout=open("/dev/null", "w"))
+
+        self.assertEqual(SearchQuery("магазинов").count(), 1)
@@ -0,0 +1,33 @@
+# search/views.py
+from django.core.paginator import Paginator
+from django.shortcuts import render
+from django.views.decorators.cache import cache_control
+
+from .backends import SearchQuery
+
+
+@cache_control(public=True, max_age=60 * 5)
+def search(request):
+    """Представление для полнотекстового поиска по новостям, портфолио и
+    страницам сайта.
+
+    Args:
+        request: HTTP-запрос с параметрами ``q`` (строка запроса) и ``page``
+
+    Returns:
+        HttpResponse: Отрендеренный шаблон с найденными документами
+    """
+    query = request.GET.get("q", "").strip()
+
+    # Результаты отсортированы по релевантности, поэтому используется
+    # нумерованная пагинация - 20 результатов на страницу
+    paginator = Paginator(SearchQuery(query), 20)
+    page_obj = paginator.get_page(request.GET.get("page"))
+
+    context = {
+        "query": query,
+        "page_obj": page_obj,
+        # Сокращённый список номеров страниц: 1 2 … 9 10 11 … 49 50
+        "page_range": paginator.get_elided_page_range(page_obj.number),
+    }
+    return render(request, "search/results.html", context)
@@ -144,4 +144,28 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
     });
-});
\ No newline at end of file
+});
+// Меню пользователя в шапке: публичные страницы одинаковы для всех
+// посетителей, поэтому меню вошедшего пользователя подгружается отдельно
+document.addEventListener('DOMContentLoaded', function() {
+    var container = document.getElementById('user-menu');
+    if (!container) {
+        return;
+    }
+    var hint = container.dataset.hintCookie + '=';
+    var loggedIn = document.cookie.split('; ').some(function(cookie) {
+        return cookie.indexOf(hint) === 0;
+    });
+    if (!loggedIn) {
+        return;
+    }
+    fetch(container.dataset.url, {credentials: 'same-origin'})
+        .then(function(response) {
+            return response.ok ? response.text() : null;
+        })
+        .then(function(html) {
+            if (html) {
+                container.innerHTML = html;
+            }
+        });
+});